@@ -463,7 +463,68 @@ DOWNLOAD_LIBRARY = {
 
     # LoRA Models by Subcategory
     "loras": {
-        "sd15_loras": [],
+        "sd15_loras": [
+            {
+                "display_title": "Stable Diffusion Loras Detailed Eyes",
+                "name": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors",
+                "source_page": "https://civitai.com/models/145907",
+                "url": "https://civitai.com/api/download/models/145907",
+                "filename": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 LoRA for detailed eyes",
+                "required": False
+            },
+            {
+                "display_title": "Stable Diffusion Loras Midjourney Mimic",
+                "name": "Stable_Diffusion_Loras_Midjourney_Mimic.safetensors",
+                "source_page": "https://civitai.com/models/283697",
+                "url": "https://civitai.com/api/download/models/283697",
+                "filename": "Stable_Diffusion_Loras_Midjourney_Mimic.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 LoRA mimicking the Midjourney look",
+                "required": False
+            },
+            {
+                "display_title": "Stable Diffusion Loras Extremely Detailed",
+                "name": "Stable_Diffusion_Loras_Extremely_Detailed.safetensors",
+                "source_page": "https://civitai.com/models/258687",
+                "url": "https://civitai.com/api/download/models/258687",
+                "filename": "Stable_Diffusion_Loras_Extremely_Detailed.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 LoRA for extra fine detail",
+                "required": False
+            },
+            {
+                "display_title": "Stable Diffusion Loras Juggernot Cinematic",
+                "name": "Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors",
+                "source_page": "https://civitai.com/models/131991",
+                "url": "https://civitai.com/api/download/models/131991",
+                "filename": "Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 cinematic style LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Stable Diffusion Loras Detail Tweaker",
+                "name": "Stable_Diffusion_Loras_Detail_Tweaker.safetensors",
+                "source_page": "https://civitai.com/models/135867",
+                "url": "https://civitai.com/api/download/models/135867",
+                "filename": "Stable_Diffusion_Loras_Detail_Tweaker.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 detail tweaker LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Stable Diffusion Loras Wowifier",
+                "name": "Stable_Diffusion_Loras_Wowifier.safetensors",
+                "source_page": "https://civitai.com/models/217866",
+                "url": "https://civitai.com/api/download/models/217866",
+                "filename": "Stable_Diffusion_Loras_Wowifier.safetensors",
+                "dest_dir": "models/loras",
+                "info": "SD1.5 Wowifier enhancement LoRA",
+                "required": False
+            }
+        ],
         "sdxl_loras": [
             {
                 "display_title": "SDXL ClassiPaint",
@@ -546,6 +607,66 @@ DOWNLOAD_LIBRARY = {
                 "dest_dir": "models/loras",
                 "info": "USO FLUX1 DIT LoRA model",
                 "required": False
+            },
+            {
+                "display_title": "Flux lora Semirealisticportraitpainting",
+                "name": "Flux_lora_Semirealisticportraitpainting.safetensors",
+                "source_page": "https://civitai.com/models/978472",
+                "url": "https://civitai.com/api/download/models/978472",
+                "filename": "Flux_lora_Semirealisticportraitpainting.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX semi-realistic portrait painting LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Flux lora Velvetv2",
+                "name": "Flux_lora_Velvetv2.safetensors",
+                "source_page": "https://civitai.com/models/967375",
+                "url": "https://civitai.com/api/download/models/967375",
+                "filename": "Flux_lora_Velvetv2.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX Velvet v2 style LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Flux lora RetroAnimeStyle",
+                "name": "Flux_lora_RetroAnimeStyle.safetensors",
+                "source_page": "https://civitai.com/models/806265",
+                "url": "https://civitai.com/api/download/models/806265",
+                "filename": "Flux_lora_RetroAnimeStyle.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX retro anime style LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Flux lora VelvetMythicFantasyRealistic Fantasy",
+                "name": "Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors",
+                "source_page": "https://civitai.com/models/1227179",
+                "url": "https://civitai.com/api/download/models/1227179",
+                "filename": "Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX Velvet mythic realistic fantasy LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Flux lora VelvetMythicFantasyGothicLines",
+                "name": "Flux_lora_VelvetMythicFantasyGothicLines.safetensors",
+                "source_page": "https://civitai.com/models/1202162",
+                "url": "https://civitai.com/api/download/models/1202162",
+                "filename": "Flux_lora_VelvetMythicFantasyGothicLines.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX Velvet mythic gothic lines LoRA",
+                "required": False
+            },
+            {
+                "display_title": "Flux lora Mezzotint",
+                "name": "Flux_lora_Mezzotint.safetensors",
+                "source_page": "https://civitai.com/models/757030",
+                "url": "https://civitai.com/api/download/models/757030",
+                "filename": "Flux_lora_Mezzotint.safetensors",
+                "dest_dir": "models/loras",
+                "info": "FLUX mezzotint print style LoRA",
+                "required": False
             }
         ],
         "pony_loras": [
@@ -660,6 +781,106 @@ DOWNLOAD_LIBRARY = {
                 "dest_dir": "models/loras",
                 "info": "Hassaku Shiro Styles for Illustrious",
                 "required": False
+            },
+            {
+                "display_title": "Illustrious Loras Power Puff Mix",
+                "name": "Illustrious_Loras_Power_Puff_Mix.safetensors",
+                "source_page": "https://civitai.com/models/1456601",
+                "url": "https://civitai.com/api/download/models/1456601",
+                "filename": "Illustrious_Loras_Power_Puff_Mix.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Power Puff Mix style for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious Loras Detailer Tool",
+                "name": "Illustrious_Loras_Detailer_Tool.safetensors",
+                "source_page": "https://civitai.com/models/1191626",
+                "url": "https://civitai.com/api/download/models/1191626",
+                "filename": "Illustrious_Loras_Detailer_Tool.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Detailer tool for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious loRA Semi real Fantasy illustrious",
+                "name": "Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors",
+                "source_page": "https://civitai.com/models/1597800",
+                "url": "https://civitai.com/api/download/models/1597800",
+                "filename": "Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Semi-real fantasy style for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious loRA Midjourney watercolors",
+                "name": "Illustrious_loRA_Midjourney_watercolors.safetensors",
+                "source_page": "https://civitai.com/models/1510865",
+                "url": "https://civitai.com/api/download/models/1510865",
+                "filename": "Illustrious_loRA_Midjourney_watercolors.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Midjourney-style watercolors for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious loRA Commix style",
+                "name": "Illustrious_loRA_Commix_style.safetensors",
+                "source_page": "https://civitai.com/models/1227175",
+                "url": "https://civitai.com/api/download/models/1227175",
+                "filename": "Illustrious_loRA_Commix_style.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Comic style for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious loRA detailrej",
+                "name": "Illustrious_loRA_detailrej.safetensors",
+                "source_page": "https://civitai.com/models/1396529",
+                "url": "https://civitai.com/api/download/models/1396529",
+                "filename": "Illustrious_loRA_detailrej.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Detail rejuvenation for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious loRA Vixons Dappled Sunlight",
+                "name": "Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors",
+                "source_page": "https://civitai.com/models/1144547",
+                "url": "https://civitai.com/api/download/models/1144547",
+                "filename": "Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Vixon's dappled sunlight for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious Vixon Style",
+                "name": "Illustrious_Vixon_Style.safetensors",
+                "source_page": "https://civitai.com/models/1382407",
+                "url": "https://civitai.com/api/download/models/1382407",
+                "filename": "Illustrious_Vixon_Style.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Vixon style for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious MagicalCircleTentacles",
+                "name": "Illustrious_MagicalCircleTentacles.safetensors",
+                "source_page": "https://civitai.com/models/1323341",
+                "url": "https://civitai.com/api/download/models/1323341",
+                "filename": "Illustrious_MagicalCircleTentacles.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Magical circle effects for Illustrious",
+                "required": False
+            },
+            {
+                "display_title": "Illustrious lora Add Super Details",
+                "name": "Illustrious_lora_Add_Super_Details.safetensors",
+                "source_page": "https://civitai.com/models/1622964",
+                "url": "https://civitai.com/api/download/models/1622964",
+                "filename": "Illustrious_lora_Add_Super_Details.safetensors",
+                "dest_dir": "models/loras",
+                "info": "Adds fine detail to Illustrious generations",
+                "required": False
             }
         ]
     },
@@ -709,6 +930,16 @@ DOWNLOAD_LIBRARY = {
             "dest_dir": "models/vae",
             "info": "SDXL VAE model from Stability AI",
             "required": False
+        },
+        {
+            "display_title": "ae",
+            "name": "ae.safetensors",
+            "source_page": "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged",
+            "url": "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged/resolve/main/split_files/vae/ae.safetensors",
+            "filename": "ae.safetensors",
+            "dest_dir": "models/vae",
+            "info": "FLUX / Lumina autoencoder VAE",
+            "required": False
         }
     ],
 
@@ -882,6 +1113,132 @@ DOWNLOAD_LIBRARY = {
         }
     ],
 
+    # ControlNet Models
+    "controlnet_models": [
+        {
+            "display_title": "FLUX.1 dev Controlnet Union",
+            "name": "FLUX.1-dev-Controlnet-Union.safetensors",
+            "source_page": "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union",
+            "url": "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union/resolve/main/diffusion_pytorch_model.safetensors",
+            "filename": "FLUX.1-dev-Controlnet-Union.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "FLUX union ControlNet (canny, depth, pose and more)",
+            "required": False
+        },
+        {
+            "display_title": "control lora rank128 v11f1e sd15 tile fp16",
+            "name": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
+            "source_page": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors",
+            "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
+            "filename": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "SD1.5 tile control LoRA",
+            "required": False
+        },
+        {
+            "display_title": "t2i adapter lineart sdxl 1.0 fp16",
+            "name": "t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
+            "source_page": "https://huggingface.co/TencentARC/t2i-adapter-lineart-sdxl-1.0",
+            "url": "https://huggingface.co/TencentARC/t2i-adapter-lineart-sdxl-1.0/resolve/main/diffusion_pytorch_model.fp16.safetensors",
+            "filename": "t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "SDXL lineart T2I adapter",
+            "required": False
+        },
+        {
+            "display_title": "control v11p sd15 inpaint fp16",
+            "name": "control_v11p_sd15_inpaint_fp16.safetensors",
+            "source_page": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors",
+            "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors",
+            "filename": "control_v11p_sd15_inpaint_fp16.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "SD1.5 inpaint ControlNet",
+            "required": False
+        },
+        {
+            "display_title": "controlnet union sdxl 1.0 promax",
+            "name": "controlnet-union-sdxl-1.0_promax.safetensors",
+            "source_page": "https://huggingface.co/xinsir/controlnet-union-sdxl-1.0",
+            "url": "https://huggingface.co/xinsir/controlnet-union-sdxl-1.0/resolve/main/diffusion_pytorch_model_promax.safetensors",
+            "filename": "controlnet-union-sdxl-1.0_promax.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "SDXL union ControlNet ProMax",
+            "required": False
+        },
+        {
+            "display_title": "control lora rank128 v11f1p sd15 depth fp16",
+            "name": "control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
+            "source_page": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors",
+            "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
+            "filename": "control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
+            "dest_dir": "models/controlnet",
+            "info": "SD1.5 depth control LoRA",
+            "required": False
+        }
+    ],
+
+    # Text Embeddings
+    "embeddings": [
+        {
+            "display_title": "Pony Embedding Negative Cyber Realistic",
+            "name": "Pony_Embedding_Negative_Cyber_Realistic.pt",
+            "source_page": "https://civitai.com/models/1690589",
+            "url": "https://civitai.com/api/download/models/1690589",
+            "filename": "Pony_Embedding_Negative_Cyber_Realistic.pt",
+            "dest_dir": "models/embeddings",
+            "info": "Negative embedding for realistic Pony generations",
+            "required": False
+        },
+        {
+            "display_title": "Pony Embedding Negative Stable Yogi Pony",
+            "name": "Pony_Embedding_Negative_Stable_Yogi_Pony.pt",
+            "source_page": "https://civitai.com/models/772342",
+            "url": "https://civitai.com/api/download/models/772342",
+            "filename": "Pony_Embedding_Negative_Stable_Yogi_Pony.pt",
+            "dest_dir": "models/embeddings",
+            "info": "Stable Yogi negative embedding for Pony",
+            "required": False
+        },
+        {
+            "display_title": "Pony Embedding Positive Stable Yogi Pony",
+            "name": "Pony_Embedding_Positive_Stable_Yogi_Pony.pt",
+            "source_page": "https://civitai.com/models/2044578",
+            "url": "https://civitai.com/api/download/models/2044578",
+            "filename": "Pony_Embedding_Positive_Stable_Yogi_Pony.pt",
+            "dest_dir": "models/embeddings",
+            "info": "Stable Yogi positive embedding for Pony",
+            "required": False
+        }
+    ],
+
+    # Style Models
+    "style_models": [
+        {
+            "display_title": "Flux Redux",
+            "name": "Flux_Redux.safetensors",
+            "source_page": "https://civitai.com/models/1086258",
+            "url": "https://civitai.com/api/download/models/1086258",
+            "filename": "Flux_Redux.safetensors",
+            "dest_dir": "models/style_models",
+            "info": "FLUX Redux style model for image variations",
+            "required": False
+        }
+    ],
+
+    # Model Patches
+    "model_patches": [
+        {
+            "display_title": "uso flux1 projector v1",
+            "name": "uso-flux1-projector-v1.safetensors",
+            "source_page": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged",
+            "url": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/model_patches/uso-flux1-projector-v1.safetensors",
+            "filename": "uso-flux1-projector-v1.safetensors",
+            "dest_dir": "models/model_patches",
+            "info": "USO FLUX1 projector model patch",
+            "required": False
+        }
+    ],
+
     # Diffusion Models (for Flux Fill)
     "diffusion_models": [
         {
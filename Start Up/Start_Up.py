@@ -1,3 +1,6 @@
+import time
+# When `%run` started; the time to first paint is measured from here
+_run_started = time.perf_counter()
 import os
 # Guarded optional imports — allow script to run partial functionality when packages are missing
 try:
@@ -11,17 +14,21 @@ except Exception:
     display = None
     HTML = None
 import threading
-import time
 import sys
 import subprocess
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
-import multiprocessing
-from functools import partial
+
+# Make the shared comfy_startup helpers importable when this file is executed via %run
+_startup_dir = os.path.dirname(os.path.abspath(__file__))
+if _startup_dir not in sys.path:
+    sys.path.insert(0, _startup_dir)
+from comfy_startup import catalog, catalog_meta, catalog_table, civitai_cache, comfy_monitor, presets, profiles, progress_hub, search_index, selection_planner, settings, startup_timer, thumbnails
+paint_timer = startup_timer.StartupTimer(_run_started)
+paint_timer.mark('imports')
 try:
     import psutil
 except ImportError:
     psutil = None
-    # Note: psutil optional - status monitoring will be disabled when absent
+    # Note: psutil optional - only used to find ComfyUI processes to stop
     # Use logging to record environment-level issues without spamming stdout
     # logging will be configured below; log this situation later if needed
     pass
@@ -32,20 +39,26 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 if psutil is None:
-    logger.info("psutil not available; ComfyUI status monitoring will be disabled.")
+    logger.info("psutil not available; stopping ComfyUI will not find its processes.")
+
+# Set COMFY_PROFILE_NODES=1 (e.g. `%env COMFY_PROFILE_NODES=1`) to record per-node
+# import time and memory in ComfyUI/node_import_profile.json on launch
+PROFILE_NODE_IMPORTS = os.environ.get("COMFY_PROFILE_NODES", "").lower() in ("1", "true", "yes")
+# COMFY_ACTIVE_WORKFLOWS lists workflow JSON files (os.pathsep separated); when set
+# the models those workflows reference are downloaded and only the custom node
+# packs they use are loaded, the rest are parked
+ACTIVE_WORKFLOWS = [p for p in os.environ.get("COMFY_ACTIVE_WORKFLOWS", "").split(os.pathsep) if p]
 
 # -----------------------------
 # Bootstrap required Python packages when run as the first script
 # This will attempt to install missing packages quietly using pip.
 # -----------------------------
 def _bootstrap_requirements():
-    required = ["ipywidgets", "requests", "psutil", "Pillow", "matplotlib"]
-    missing = []
-    for pkg in required:
-        try:
-            __import__(pkg)
-        except Exception:
-            missing.append(pkg)
+    # pip name -> import name; find_spec checks presence without importing the package
+    required = {"ipywidgets": "ipywidgets", "requests": "requests", "psutil": "psutil",
+                "Pillow": "PIL", "matplotlib": "matplotlib"}
+    import importlib.util
+    missing = [pkg for pkg, module in required.items() if importlib.util.find_spec(module) is None]
 
     if not missing:
         return
@@ -63,34 +76,21 @@ def _bootstrap_requirements():
 
     return
 
+# CivitAI token and UI preferences, written once typing pauses (see `settings`)
+user_settings = settings.open_settings()
+
+def load_api_key():
+    """Return the saved CivitAI token, or an empty string."""
+    return user_settings.get('civitai_token', '')
+
 def save_api_key(key):
-    """Save API key to workspace/Uploads/Civit Ai Key/CivitAi Api Key.txt
-    Appends the key as a new line to maintain history"""
-    try:
-        if not key or not key.strip():
-            return
-        
-        api_key_dir = os.path.join('workspace', 'Uploads', 'Civit Ai Key')
-        api_key_path = os.path.join(api_key_dir, 'CivitAi Api Key.txt')
-        
-        # Create directory if it doesn't exist
-        os.makedirs(api_key_dir, exist_ok=True)
-        
-        # Append new key with timestamp comment
-        import datetime
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        with open(api_key_path, 'a', encoding='utf-8') as f:
-            f.write(f"# Added {timestamp}\n{key.strip()}\n")
-            
-    except Exception as e:
-        logging.getLogger(__name__).exception("Error saving API key: %s", e)
+    """Remember the CivitAI token; the settings file is rewritten once typing pauses."""
+    user_settings.set('civitai_token', (key or '').strip())
 
 def save_key_on_change(change):
     """Observer function to automatically save API key when changed"""
     if change['type'] == 'change' and change['name'] == 'value':
-        new_value = change['new']
-        if new_value and new_value.strip():
-            save_api_key(new_value)
+        save_api_key(change['new'])
 
 
 # -----------------------------
@@ -108,11 +108,8 @@ def extract_civitai_model_id(url):
 
 
 def get_civitai_model_url(download_url):
-    """Convert download URL to model page URL"""
-    model_id = extract_civitai_model_id(download_url)
-    if model_id:
-        return f"https://civitai.com/models/{model_id}"
-    return None
+    """Convert download URL to model page URL (exact once the version is in the Civitai cache)"""
+    return civitai_cache.model_page_url(download_url)
 
 # -----------------------------
 # Image helpers for display testing
@@ -129,31 +126,48 @@ def image_to_base64(path):
 
 
 def generate_triple_image_html(base_img_path, preset_name):
-    """Generate HTML for 3 identical images in a row using the same source image."""
-    base64_data = image_to_base64(base_img_path)
-    if not base64_data:
+    """Generate HTML for 3 identical images in a row using one cached thumbnail of the source image."""
+    import re
+    thumb = thumbnails.thumbnail(base_img_path)
+    if thumb is None:
         # Fallback if image can't be loaded
         return f'<div style="text-align:center; padding:10px; color:#1A237E;">Images for {preset_name} preset not available</div>'
+    # The thumbnail lives in one CSS rule, so the three previews do not repeat its data
+    css_class = 'preset-thumb-' + re.sub(r'[^a-z0-9]+', '-', preset_name.lower()).strip('-')
+    previews = ''.join(f"""
+            <div class="preset-thumb {css_class}" role="img" aria-label="{preset_name} {n}"
+                 onclick="alert('{preset_name} preset image {n} clicked');"></div>""" for n in (1, 2, 3))
     # Use the .preset-images class for a horizontal row next to the toggle
     return f'''
+    <style>{thumbnails.preview_css(thumb, css_class)}</style>
     <div style="padding:10px;">
-        <div class="preset-images">
-            <img src="data:image/png;base64,{base64_data}" 
-                 alt="{preset_name} 1"
-                 style="max-width:180px; width:100%; height:auto; border-radius:8px; box-shadow:0 4px 8px rgba(0,0,0,0.1); cursor:pointer;" 
-                 onclick="alert('{preset_name} preset image 1 clicked');">
-            <img src="data:image/png;base64,{base64_data}" 
-                 alt="{preset_name} 2"
-                 style="max-width:180px; width:100%; height:auto; border-radius:8px; box-shadow:0 4px 8px rgba(0,0,0,0.1); cursor:pointer;" 
-                 onclick="alert('{preset_name} preset image 2 clicked');">
-            <img src="data:image/png;base64,{base64_data}" 
-                 alt="{preset_name} 3"
-                 style="max-width:180px; width:100%; height:auto; border-radius:8px; box-shadow:0 4px 8px rgba(0,0,0,0.1); cursor:pointer;" 
-                 onclick="alert('{preset_name} preset image 3 clicked');">
+        <div class="preset-images">{previews}
         </div>
     </div>
     '''
 
+# Preset sections (toggle row + thumbnails) are filled on the first expand of the
+# advanced controls, like the category rows, so %run renders no thumbnails up front.
+preset_sections = []
+
+def create_preset_section(row, preset_name, base_img_path):
+    """Empty container for a preset; `build_preset_sections` fills it on first expand."""
+    container = widgets.VBox([], layout=widgets.Layout(width='900px', align_items='center', margin='5px 0px'))
+
+    def build():
+        return [widgets.HBox([
+            row,
+            widgets.HTML(value=generate_triple_image_html(base_img_path, preset_name))
+        ], layout=widgets.Layout(align_items='center', width='100%', gap='20px'))]
+
+    preset_sections.append((container, build))
+    return container
+
+def build_preset_sections():
+    for container, build in preset_sections:
+        if not container.children:
+            container.children = tuple(build())
+
 def copy_image_to_cwd(src_path, dst_name='test_image_copy.png'):
     """Copy an image into the current working directory and return its relative path."""
     try:
@@ -174,517 +188,9 @@ public_url = f"http://{public_ip}:{external_port}/"
 # -----------------------------
 # Enhanced CSS Styling (Simplified for better compatibility)
 # -----------------------------
-css = """
-<style>
-    /* Scoped styles for Comfy UI widgets - do not affect the global Jupyter UI */
-    .comfy-root {
-        /* root container background and typography for the Comfy UI area only */
-        background: #F5F5DC;
-        margin: 0; /* ensure the comfy-root fills to the top without white gaps */
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        overflow-x: hidden; /* prevent horizontal scroll inside the comfy area */
-        box-sizing: border-box;
-    }
-
-    .comfy-root .widget-box {
-        background: transparent !important;
-    }
-
-    .comfy-root .centered-vbox {
-        display: flex !important;
-        flex-direction: column !important;
-        align-items: center !important;
-        justify-content: flex-start !important;
-        min-height: 100vh !important;
-        gap: 20px;
-        padding: 30px 20px;
-    }
-    
-    .comfy-root .homogenized-button {
-        background: #E74C3C !important;
-        color: white !important;
-        font-weight: bold !important;
-        border-radius: 12px !important;
-        border: none !important;
-        width: 280px !important;
-        height: 60px !important;
-        font-size: 18px !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.2) !important;
-    }
-    
-    /* .homogenized-button:hover:not(:disabled) {
-        background: linear-gradient(135deg, #C0392B 0%, #A93226 100%) !important;
-        box-shadow: 0 0 20px 4px #FFF5E1 !important;
-        transform: translateY(-3px) !important;
-    } */
-    
-    .comfy-root .homogenized-button:disabled {
-        background: linear-gradient(135deg, #95A5A6 0%, #7F8C8D 100%) !important;
-        cursor: not-allowed !important;
-        transform: none !important;
-        box-shadow: 0 2px 6px rgba(0,0,0,0.1) !important;
-    }
-
-    /* When a button should keep its active color while disabled, add the 'preserve-color' class */
-    .comfy-root .preserve-color:disabled {
-        background: #E74C3C !important;
-        color: white !important;
-        cursor: not-allowed !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.2) !important;
-    }
-    
-    .comfy-root .comfy-title-normal {
-        text-align: center;
-        /* Use the same font/color characteristics as .status-text */
-        font-family: inherit; /* inherit the root 'Segoe UI' family */
-        font-size: 100px !important; /* enlarged title per request */
-        font-weight: bold;
-    color: #1A237E; /* match Open Comfy UI text */
-        margin: 0px 0 15px 0;
-        line-height: 1.05; /* tighter line-height for large display */
-        padding-bottom: 6px;
-        text-shadow: 2px 2px 4px rgba(0,0,0,0.08);
-        max-width: 100%;
-        overflow: visible;
-        word-wrap: break-word;
-        box-sizing: border-box;
-    }
-    
-    .comfy-root .status-text {
-        text-align: center;
-        font-size: 22px;
-        color: #1A237E; /* match title color */
-        font-weight: bold;
-        margin: 2px 0px 2px 0px;
-    }
-    
-    .comfy-root .progress-container {
-        background-color: #F5F5DC;
-        width: 300px;
-        height: 24px; /* reserve a fixed height even when empty */
-        border-radius: 10px;
-        border: 2px solid #C0392B;
-        margin-top: 16px; /* increased space between status row and progress bar (approx 4x) */
-        margin-bottom: 20px;
-        display: block; /* keep the placeholder visible so layout doesn't shift */
-        overflow: hidden;
-    }
-    
-    .comfy-root .progress-bar {
-        background: #E74C3C;
-        height: 100%;
-        width: 0%;
-        border-radius: 8px;
-        transition: width 0.3s ease;
-    }
-    
-    .comfy-root .comfy-link {
-        font-size: 24px;
-        font-weight: bold;
-        text-decoration: none;
-        color: #E74C3C;
-        padding: 12px 24px;
-        border: 2px solid #E74C3C;
-        border-radius: 8px;
-        transition: all 0.3s ease;
-        margin-bottom: 30px;
-    }
-    
-    /* .comfy-link:hover {
-        background-color: #E74C3C;
-        color: white;
-        transform: translateY(-2px);
-        box-shadow: 0 4px 12px rgba(231, 76, 60, 0.3);
-    } */
-    
-    /* Category Button Styling */
-    .comfy-root .category-button {
-        background: #F5F5DC !important;
-        border: 2px solid #C0392B !important;
-        border-radius: 8px !important;
-        width: 280px !important;
-        height: 40px !important;
-        margin: 5px 0 !important;
-        cursor: pointer !important;
-        transition: all 0.3s ease !important;
-        color: #1A237E !important;
-        font-weight: bold !important;
-    }
-    
-    /* .category-button:hover {
-        background: linear-gradient(135deg, #F0F0DC 0%, #E8E4D5 100%) !important;
-        transform: translateY(-2px) !important;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.15) !important;
-    } */
-    
-    /* Table Styling */
-    .comfy-root .item-container {
-        width: 100%;
-        max-width: 800px;
-        background: #F5F5DC;
-        border: 2px solid #C0392B;
-        border-radius: 12px;
-        padding: 15px;
-        margin: 10px 0;
-        box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    }
-    
-    .comfy-root .item-row {
-        display: flex;
-        align-items: center;
-        padding: 12px 0;
-        border-bottom: 1px solid #E8E4D5;
-    }
-    
-    .item-row:last-child {
-        border-bottom: none;
-    }
-    
-    
-    
-    /* Custom Toggle Switch */
-    .comfy-root .custom-toggle {
-        width: 60px;
-        height: 30px;
-        background-color: #F5F5DC;
-        border: 2px solid #C0392B;
-        border-radius: 15px;
-        position: relative;
-        cursor: pointer;
-        /* Only animate background color and the knob position — keep size/box model constant */
-        transition: background-color 0.12s ease;
-        margin-right: 15px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .comfy-root .custom-toggle.active {
-        background-color: #E74C3C;
-        /* Keep shape and size constant when active: remove shadows or other effects */
-        box-shadow: none !important;
-    }
-    
-    .custom-toggle.disabled {
-        cursor: not-allowed;
-        background-color: #BDC3C7;
-    }
-    
-    .custom-toggle::after {
-        content: '';
-        width: 24px;
-        height: 24px;
-        /* Solid white knob for consistent appearance in all states */
-        background: white;
-        border-radius: 50%;
-        position: absolute;
-        top: 1px;
-        left: 1px;
-        /* animate only the knob position; keep color static (white) */
-        transition: left 0.12s ease;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.2);
-    }
-    
-    .custom-toggle.active::after {
-        /* Only move the knob when active; color stays white */
-        left: 33px;
-    }
-    
-    /* .custom-toggle:hover:not(.disabled) {
-        transform: translateY(-1px);
-        box-shadow: 0 3px 8px rgba(0,0,0,0.15);
-    } */
-    
-    .comfy-root .item-info {
-        flex: 1;
-    }
-    
-    .comfy-root .item-name {
-        font-size: 16px;
-        font-weight: bold;
-        color: #1A237E;
-        margin-bottom: 4px;
-    }
-    
-    .comfy-root .item-description {
-        font-size: 14px;
-        color: #7F8C8D;
-        font-style: italic;
-    }
-
-    /* Clickable model name styling */
-    .comfy-root .item-name a {
-        color: #1A237E !important;
-        text-decoration: none !important;
-        font-weight: bold !important;
-        transition: color 0.3s ease !important;
-    }
-
-    .item-name a:hover {
-        color: #E74C3C !important;
-        text-decoration: underline !important;
-    }
-
-    .item-name a:visited {
-        color: #1A237E !important;
-    }
-    
-    /* Designer-friendly display title (allows HTML) */
-    .comfy-root .display-title {
-        font-size: 18px;
-        font-weight: 700;
-        color: #1A237E;
-        text-decoration: none;
-    }
-
-    .comfy-root .display-title:hover {
-        color: #E74C3C !important;
-        text-decoration: underline !important;
-    }
-
-    .comfy-root .item-filename {
-        font-size: 12px;
-        color: #8A8F95;
-        margin-top: 2px;
-    }
-
-    /* CivitAI pill-shaped input container (designer requested) */
-    .comfy-root .civitai-pill-container {
-        background: #1A237E;
-        border-radius: 25px;
-        padding: 12px 20px;
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        box-shadow: 0 4px 12px rgba(26,35,126,0.2);
-        margin: 6px 0px;
-    }
-
-    .comfy-root .civitai-link-inside {
-        color: white;
-        text-decoration: underline;
-        font-weight: bold;
-        margin-right: 15px;
-        font-size: 16px;
-    }
-
-    .comfy-root .civitai-link-inside:hover {
-        opacity: 0.95;
-        color: #ffffff;
-    }
-
-    /* Style the actual text input element produced by ipywidgets Text */
-    .comfy-root .civitai-pill-container .widget-text input {
-        background: white !important;
-        border-radius: 15px !important;
-        padding: 8px 10px !important;
-        border: none !important;
-        outline: none !important;
-        height: 36px !important;
-        width: 320px !important;
-        box-sizing: border-box !important;
-    }
-
-    /* Time picker styles removed — using simple toggles only */
-    
-    .comfy-root .required-badge {
-        background: white;
-        color: #F5F5DC;
-        font-size: 11px;
-        padding: 2px 8px;
-        border-radius: 12px;
-        margin-left: 10px;
-        font-weight: bold;
-    }
-    
-    .comfy-root .optional-badge {
-        background: linear-gradient(135deg, #95A5A6 0%, #7F8C8D 100%);
-        color: white;
-        font-size: 11px;
-        padding: 2px 8px;
-        border-radius: 12px;
-        margin-left: 10px;
-        font-weight: bold;
-    }
-    
-    /* Hide default ipywidgets styling */
-    /* hide toggle if present inside comfy-root only */
-    .comfy-root .widget-toggle-button {
-        display: none !important;
-    }
-
-    /* Remove default outlines and add a light beige glow for focus states */
-    .comfy-root button:focus,
-    .comfy-root a:focus,
-    .comfy-root input:focus {
-        outline: none !important;
-        box-shadow: 0 0 4px 1px rgba(245, 245, 220, 0.8) !important; /* light beige glow */
-        border-radius: 8px; /* keep consistent with your theme */
-    }
-
-    /* Ensure custom-toggle does NOT get a focus glow or extra shadow that changes perceived size */
-    .comfy-root .custom-toggle:focus,
-    .comfy-root .custom-toggle:active,
-    .comfy-root .custom-toggle.active:focus {
-        outline: none !important;
-        box-shadow: none !important;
-    }
-
-    /* Lock box-sizing and remove margin/padding issues that may cause reflow in some renderers */
-    .comfy-root .custom-toggle,
-    .comfy-root .custom-toggle::after {
-        box-sizing: border-box !important;
-        -webkit-box-sizing: border-box !important;
-    }
-
-    /* Ensure the toggle's border and padding do not change between states */
-    .comfy-root .custom-toggle,
-    .comfy-root .custom-toggle.active {
-        padding: 0 !important;
-        border-width: 2px !important;
-    }
-
-    /* NOTE: The previous blue civitai input container styling has been removed to present
-       the CivitAI token input as a plain text field. The token widget is no longer
-       wrapped with the '.civitai-input-container' class. */
-
-    /* Open Comfy UI link text: hidden by default (will be shown when ComfyUI is running) */
-    .comfy-root .open-link-text {
-        color: #1A237E;
-        font-weight: bold;
-        font-size: 22px;
-        text-decoration: none;
-        transition: color 0.3s ease;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        display: none; /* hidden until ComfyUI is detected */
-    }
-
-    .comfy-root .open-link-text:hover {
-        color: white;
-    }
-
-    /* API Key link styling - matches the Open Comfy UI text style and is always underlined */
-    .comfy-root .api-key-link {
-        color: #1A237E;
-        font-weight: bold;
-        font-size: 22px;
-        text-decoration: underline !important;
-        transition: color 0.3s ease;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        display: inline-block;
-    }
-
-    .comfy-root .api-key-link:hover {
-        color: white !important;
-    }
-
-    /* Prefab for horizontal preset image rows (three previews side-by-side) */
-    .comfy-root .preset-images {
-        display: flex;
-        flex-direction: row;
-        gap: 15px;
-        justify-content: flex-start;
-        align-items: center;
-        flex-wrap: nowrap;
-    }
-
-    /* Blue Open Comfy UI button styling - same visual tone as title */
-    .comfy-root .open-comfy-blue {
-        background: linear-gradient(180deg, #1A237E 0%, #0747D1 100%);
-        color: white !important;
-        border: 2px solid #0639B2 !important;
-        box-shadow: 0 6px 18px rgba(0,0,0,0.15) !important;
-        border-radius: 12px !important;
-        width: 280px !important;
-        height: 60px !important;
-        font-size: 18px !important;
-        cursor: pointer !important;
-    }
-    .open-link-frame {
-        width: 280px;
-        height: 60px;
-        border: 2px solid #0639B2;
-        border-radius: 12px;
-        display: flex;
-        align-items: center;
-        justify-content: flex-end;
-        padding-right: 12px;
-        background: transparent;
-        box-shadow: 0 6px 18px rgba(0,0,0,0.08);
-    }
-
-    /* ComfyUI status monitoring - running state (underline when shown) */
-    .comfy-root .open-link-text.running {
-        text-decoration: underline !important;
-        display: inline; /* ensure visible when running */
-    }
-
-    /* Download progress bar styling (identical to main progress) */
-    .comfy-root .download-progress-container {
-        background-color: #F5F5DC;
-        width: 300px;
-        height: 24px;
-        border-radius: 10px;
-        border: 2px solid #C0392B;
-        margin-top: 16px;
-        margin-bottom: 20px;
-        display: block;
-        overflow: hidden;
-    }
-
-    .comfy-root .download-progress-bar {
-        background: #E74C3C;
-        height: 100%;
-        width: 0%;
-        border-radius: 8px;
-        transition: width 0.3s ease;
-    }
-
-    /* Additional downloads progress (separate from the main installation and the regular downloads) */
-    .comfy-root .additional-progress-container {
-        background-color: #F5F5DC;
-        width: 300px;
-        height: 24px;
-        border-radius: 10px;
-        border: 2px solid #C0392B;
-        margin-top: 16px;
-        margin-bottom: 20px;
-        display: block;
-        overflow: hidden;
-    }
-
-    .comfy-root .additional-progress-bar {
-        background: #E74C3C; /* same red color scheme */
-        height: 100%;
-        width: 0%;
-        border-radius: 8px;
-        transition: width 0.3s ease;
-    }
-
-    /* Preset preview images - constrained size and clickable appearance */
-    .comfy-root .preset-image-wrapper {
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        padding: 6px;
-    }
-
-    .comfy-root .preset-image-wrapper img {
-        max-height: 160px;
-        width: auto;
-        border-radius: 8px;
-        border: 2px solid rgba(0,0,0,0.06);
-        box-shadow: 0 6px 14px rgba(0,0,0,0.08);
-        cursor: pointer;
-        transition: transform 0.12s ease, box-shadow 0.12s ease;
-    }
-
-    .comfy-root .preset-image-wrapper img:hover {
-        transform: scale(1.03);
-        box-shadow: 0 10px 22px rgba(0,0,0,0.12);
-    }
-</style>
-"""
+# Kept in comfy_startup/notebook.css so the script itself stays small to parse
+with open(os.path.join(_startup_dir, 'comfy_startup', 'notebook.css'), encoding='utf-8') as _css_file:
+    css = f"<style>\n{_css_file.read()}</style>\n"
 display(HTML(css))
 
 
@@ -713,6 +219,23 @@ title_row = widgets.VBox([
     widgets.HBox([title_html], layout=Layout(width='100%', justify_content='center', align_items='center'))
 ], layout=Layout(width='100%', align_items='center'))
 
+# Paint the shell first: the catalog, presets and controls below are built while it is
+# already on screen and replace the loading line when they are ready
+loading_html = widgets.HTML(value="<div class='status-text'>Loading downloads...</div>")
+main_container = widgets.VBox(
+    [title_row, loading_html],
+    layout=widgets.Layout(
+        display='flex',
+        flex_flow='column',
+        align_items='center',
+        width='100%',
+        gap='10px'
+    ),
+    _dom_classes=['comfy-root']
+)
+display(main_container)
+paint_timer.mark('first_paint')
+
 import os
 
 
@@ -773,1505 +296,101 @@ def download_file(url, dest_path, cwd=None):
 
 
 # -----------------------------
-# Parallel helpers (process-based) for faster downloads and clones
+# Parallel downloads and clones (comfy_startup.download_engine, imported on first use)
 # -----------------------------
-def download_file_process(url, dest_path, token=None):
-    """Download file in a separate process - returns (success, message)"""
-    try:
-        import requests
-        import os
-        import subprocess
-        # Ensure destination directory exists
-        try:
-            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-        except Exception:
-            pass
-
-        is_civit = 'civitai.com' in (url or '')
-        if is_civit and token:
-            headers = {'Authorization': f'Bearer {token}'}
-            try:
-                with requests.get(url, headers=headers, stream=True, timeout=300) as r:
-                    r.raise_for_status()
-                    with open(dest_path, 'wb') as fh:
-                        for chunk in r.iter_content(chunk_size=8192):
-                            if chunk:
-                                fh.write(chunk)
-                return True, f"Downloaded: {os.path.basename(dest_path)}"
-            except Exception:
-                # Fall through to wget
-                pass
-
-        # Fallback: use wget
-        try:
-            cmd = f"wget -O '{dest_path}' '{url}'"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
-            if result.returncode == 0:
-                return True, f"Downloaded (wget): {os.path.basename(dest_path)}"
-            else:
-                return False, f"wget failed for {os.path.basename(dest_path)}: {result.stderr}"
-        except Exception as e:
-            return False, f"Download failed for {os.path.basename(dest_path)}: {str(e)}"
-            
-    except Exception as e:
-        return False, f"Process error for {os.path.basename(dest_path)}: {str(e)}"
-
-
-def clone_repo_process(repo_url, dest_path, repo_name):
-    """Clone git repository in a separate process - returns (success, message)"""
-    try:
-        import subprocess
-        import os
-        # Ensure destination directory exists
-        try:
-            os.makedirs(dest_path, exist_ok=True)
-        except Exception:
-            pass
-        # Clone the repository
-        result = subprocess.run(
-            f"git clone {repo_url}", 
-            shell=True, 
-            cwd=dest_path, 
-            capture_output=True, 
-            text=True, 
-            timeout=300
-        )
-        if result.returncode == 0:
-            # Try to install requirements if they exist
-            req_path = os.path.join(dest_path, repo_name, "requirements.txt")
-            if os.path.exists(req_path):
-                pip_result = subprocess.run(
-                    "../../venv/bin/pip install -r requirements.txt",
-                    shell=True,
-                    cwd=os.path.join(dest_path, repo_name),
-                    capture_output=True,
-                    text=True,
-                    timeout=120
-                )
-                if pip_result.returncode == 0:
-                    return True, f"Cloned and installed: {repo_name}"
-                else:
-                    return True, f"Cloned (pip install failed): {repo_name}"
-            else:
-                return True, f"Cloned: {repo_name}"
-        else:
-            return False, f"Git clone failed for {repo_name}: {result.stderr}"
-        
-    except Exception as e:
-        return False, f"Clone error for {repo_name}: {str(e)}"
-
-
-def run_parallel_downloads(download_tasks, clone_tasks, progress_callback=None):
+def run_parallel_downloads(download_tasks, clone_tasks, progress_callback=None, install_requirements=True):
     """Run downloads and clones in parallel with progress tracking"""
-    total_tasks = len(download_tasks) + len(clone_tasks)
-    completed_tasks = 0
-    # Results storage
-    download_results = []
-    clone_results = []
-    def update_progress():
-        nonlocal completed_tasks
-        completed_tasks += 1
-        if progress_callback:
-            progress = int((completed_tasks / total_tasks) * 100)
-            progress_callback(progress)
-    # Start download processes (10 workers)
-    with ProcessPoolExecutor(max_workers=10) as download_executor:
-        download_futures = {
-            download_executor.submit(download_file_process, task['url'], task['dest_path'], task.get('token')): task
-            for task in download_tasks
-        }
-        # Start clone processes (6 workers) 
-        with ProcessPoolExecutor(max_workers=6) as clone_executor:
-            clone_futures = {
-                clone_executor.submit(clone_repo_process, task['url'], task['dest_path'], task['name']): task
-                for task in clone_tasks
-            }
-            # Collect download results
-            for future in as_completed(download_futures):
-                task = download_futures[future]
-                try:
-                    success, message = future.result()
-                    download_results.append({
-                        'task': task,
-                        'success': success,
-                        'message': message
-                    })
-                    logging.getLogger(__name__).info("Download: %s", message)
-                except Exception as e:
-                    download_results.append({
-                        'task': task,
-                        'success': False,
-                        'message': f"Exception: {str(e)}"
-                    })
-                    logging.getLogger(__name__).warning("Download failed: %s - %s", task.get('name', 'Unknown'), str(e))
-                finally:
-                    update_progress()
-            # Collect clone results
-            for future in as_completed(clone_futures):
-                task = clone_futures[future]
-                try:
-                    success, message = future.result()
-                    clone_results.append({
-                        'task': task,
-                        'success': success,
-                        'message': message
-                    })
-                    logging.getLogger(__name__).info("Clone: %s", message)
-                except Exception as e:
-                    clone_results.append({
-                        'task': task,
-                        'success': False,
-                        'message': f"Exception: {str(e)}"
-                    })
-                    logging.getLogger(__name__).warning("Clone failed: %s - %s", task.get('name', 'Unknown'), str(e))
-                finally:
-                    update_progress()
-    return download_results, clone_results
-
-# -----------------------------
-# Status and Progress Bar (reserve space to avoid layout shifts)
-# -----------------------------
-# Pre-allocated hidden status placeholder (height reserved)
-status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
-
-# Pre-allocated hidden progress container (space reserved; hidden by visibility)
-progress_container = widgets.HTML(value="""
-<div style="display:flex; justify-content:center; margin-bottom:20px;">
-    <div class="progress-container" style="display:block; visibility: hidden;">
-        <div class="progress-bar" style="width:0%;"></div>
-    </div>
-</div>
-""")
-
-# (Removed top-level CivitAI status link — the only Get CivitAI Key link appears in the advanced controls)
-
-# Download-only status and progress (reserve space like the main progress bar)
-download_status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Downloading...</div>")
-
-download_progress_container = widgets.HTML(value="""
-<div style="display:flex; justify-content:center; margin-bottom:20px;">
-    <div class="progress-container" style="display:block; visibility: hidden;">
-        <div class="progress-bar" style="width:0%;"></div>
-    </div>
-</div>
-""")
-
-# Additional-downloads status and progress (separate bar for 'additional downloads')
-additional_downloads_status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Additional downloads...</div>")
-
-additional_downloads_progress_container = widgets.HTML(value="""
-<div style="display:flex; justify-content:center; margin-bottom:20px;">
-    <div class="additional-progress-container" style="display:block; visibility: hidden;">
-        <div class="additional-progress-bar" style="width:0%;"></div>
-    </div>
-</div>
-""")
-
-# -----------------------------
-# Open Comfy UI Link
-# -----------------------------
-# Simple clickable text link in blue (visible from start). This uses the existing .comfy-link style.
-# Initialize the Open Comfy UI link as empty; it will be populated when ComfyUI is detected
-open_link_html = widgets.HTML(value="")
+    from comfy_startup import download_engine
+    return download_engine.run_parallel_downloads(download_tasks, clone_tasks, progress_callback, install_requirements)
 
-# Frame the link and place it on the right above the Start Up button
-open_link_frame = widgets.Box([open_link_html], layout=widgets.Layout(width='280px', height='60px'))
-
-# -----------------------------
-# Data Definitions
 # -----------------------------
-custom_nodes = [
-    {
-        "display_title": "ComfyUI Manager (Essential)",
-        "name": "ComfyUI-Manager",
-        "source_page": "https://github.com/ltdrdata/ComfyUI-Manager",
-        "url": "https://github.com/ltdrdata/ComfyUI-Manager.git",
-        "info": "Essential node manager for ComfyUI",
-        "required": True
-    },
-    {
-        "name": "rgthree-comfy",
-        "url": "https://github.com/rgthree/rgthree-comfy.git",
-        "info": "Quality of life nodes and utilities",
-        "required": False
-    },
-    {
-        "name": "lora-info",
-        "url": "https://github.com/jitcoder/lora-info.git",
-        "info": "LoRA info node for detailed model information",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Impact-Pack",
-        "url": "https://github.com/ltdrdata/ComfyUI-Impact-Pack.git",
-        "info": "Advanced image processing and segmentation nodes",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Easy-Use",
-        "url": "https://github.com/yolain/ComfyUI-Easy-Use.git",
-        "info": "Simplified workflow nodes for beginners",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Custom-Scripts",
-        "url": "https://github.com/pythongosssss/ComfyUI-Custom-Scripts.git",
-        "info": "Custom scripts and workflow enhancements",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Inspyrenet-Rembg",
-        "url": "https://github.com/john-mnz/ComfyUI-Inspyrenet-Rembg.git",
-        "info": "Advanced background removal using Inspyrenet",
-        "required": False
-    },
-    {
-        "name": "Bjornulf_custom_nodes",
-        "url": "https://github.com/justUmen/Bjornulf_custom_nodes.git",
-        "info": "Specialized custom nodes by Bjornulf",
-        "required": False
-    },
-    {
-        "name": "comfy-image-saver",
-        "url": "https://github.com/giriss/comfy-image-saver.git",
-        "info": "Enhanced image saving with metadata",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Impact-Subpack",
-        "url": "https://github.com/ltdrdata/ComfyUI-Impact-Subpack.git",
-        "info": "Additional impact pack nodes and utilities",
-        "required": False
-    },
-    {
-        "name": "was-node-suite-comfyui",
-        "url": "https://github.com/WASasquatch/was-node-suite-comfyui.git",
-        "info": "Comprehensive node suite with text and image tools",
-        "required": False
-    },
-    {
-        "name": "ComfyUI_JPS-Nodes",
-        "url": "https://github.com/JPS-GER/ComfyUI_JPS-Nodes.git",
-        "info": "JPS custom nodes for advanced workflows",
-        "required": False
-    },
-    {
-        "name": "comfyui_controlnet_aux",
-        "url": "https://github.com/Fannovel16/comfyui_controlnet_aux.git",
-        "info": "ControlNet auxiliary preprocessors and tools",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-KJNodes",
-        "url": "https://github.com/kijai/ComfyUI-KJNodes.git",
-        "info": "KJ's collection of utility and processing nodes",
-        "required": False
-    },
-    {
-        "name": "ComfyUI_essentials",
-        "url": "https://github.com/cubiq/ComfyUI_essentials.git",
-        "info": "Essential utility nodes for common tasks",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-enricos-nodes",
-        "url": "https://github.com/erosDiffusion/ComfyUI-enricos-nodes.git",
-        "info": "Enrico's specialized nodes for advanced features",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-AnimateDiff-Evolved",
-        "url": "https://github.com/Kosinkadink/ComfyUI-AnimateDiff-Evolved.git",
-        "info": "Advanced AnimateDiff implementation for video generation",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-VideoHelperSuite",
-        "url": "https://github.com/Kosinkadink/ComfyUI-VideoHelperSuite.git",
-        "info": "Comprehensive video processing and creation tools",
-        "required": False
-    },
-    {
-        "name": "ComfyUI-Advanced-ControlNet",
-        "url": "https://github.com/Kosinkadink/ComfyUI-Advanced-ControlNet.git",
-        "info": "Enhanced ControlNet nodes with advanced features",
-        "required": False
-    },
-    {
-        "name": "ComfyUI_IPAdapter_plus",
-        "url": "https://github.com/cubiq/ComfyUI_IPAdapter_plus.git",
-        "info": "IP-Adapter implementation with extra features",
-        "required": False
-    }
-]
-
-checkpoints = [
-    # Pony Diffusion V6 XL (user requested) - high priority SDXL checkpoint
-    {
-        "display_title": "Pony Diffusion V6 XL — Versatile SDXL",
-        "name": "Pony_Diffusion_V6_XL.safetensors",
-        "source_page": "https://civitai.com/models/290640/pony-diffusion-v6-xl",
-        "url": "https://civitai.com/api/download/models/290640?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-        "info": "Pony Diffusion V6 XL - Versatile SDXL checkpoint",
-        "required": False,
-        "filename": "Pony_Diffusion_V6_XL.safetensors"
-    },
-    # Additional SD1.5 variants requested by user (download into ComfyUI/models/checkpoints)
-    {
-        "display_title": "DreamShaper (SD1.5)",
-        "name": "SD1.5_DreamShaper.safetensors",
-        "source_page": "https://civitai.com/models/128713/dreamshaper",
-        "url": "https://civitai.com/api/download/models/128713",
-        "info": "DreamShaper SD1.5 variant",
-        "required": False,
-        "filename": "SD1.5_DreamShaper.safetensors"
-    },
-    {
-        "display_title": "RevAnimated SD1.5",
-        "name": "SD1.5_RevAnimated.safetensors",
-        "source_page": "https://civitai.com/models/425083/revanimated",
-        "url": "https://civitai.com/api/download/models/425083",
-        "info": "RevAnimated SD1.5 variant",
-        "required": False,
-        "filename": "SD1.5_RevAnimated.safetensors"
-    },
-    {
-        "display_title": "Epic Realism — SD1.5 Variant",
-        "name": "SD1.5_Epic_Realism.safetensors",
-        "source_page": "https://civitai.com/models/143906/epic-realism",
-        "url": "https://civitai.com/api/download/models/143906",
-        "info": "Epic Realism SD1.5 variant",
-        "required": False,
-        "filename": "SD1.5_Epic_Realism.safetensors"
-    },
-    {
-        "name": "SD1.5_Deliberate.safetensors",
-        "url": "https://huggingface.co/XpucT/Deliberate/resolve/main/Deliberate_v6.safetensors?download=true",
-        "info": "Deliberate SD1.5 variant",
-        "required": False,
-        "filename": "SD1.5_Deliberate.safetensors"
-    }
-]
-
-# Additional checkpoint bundles (SDXL, Illustrious, Pony, Flux)
-extra_checkpoints = [
-    {"name": "SDXL.safetensors", "url": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0/resolve/main/sd_xl_base_1.0.safetensors?download=true", "filename": "SDXL.safetensors", "required": False},
-    {"name": "SDXL_WildCard.safetensors", "url": "https://civitai.com/api/download/models/345685", "filename": "SDXL_WildCard.safetensors", "required": False},
-    {"name": "SDXL_CyberRealisticXL.safetensors", "url": "https://civitai.com/api/download/models/1609607", "filename": "SDXL_CyberRealisticXL.safetensors", "required": False},
-    {"name": "zavychromaxl_v80.safetensors", "url": "https://huggingface.co/misri/zavychromaxl_v80/resolve/main/zavychromaxl_v80.safetensors", "filename": "zavychromaxl_v80.safetensors", "required": False},
-    {"name": "juggernautXL_version6Rundiffusion.safetensors", "url": "https://huggingface.co/lllyasviel/fav_models/resolve/main/fav/juggernautXL_version6Rundiffusion.safetensors", "filename": "juggernautXL_version6Rundiffusion.safetensors", "required": False},
-    {"name": "DreamShaperXL.safetensors", "url": "https://civitai.com/api/download/models/351306", "filename": "DreamShaperXL.safetensors", "required": False},
-
-    # Illustrious
-    {"name": "Illustrious.safetensors", "url": "https://civitai.com/api/download/models/889818", "filename": "Illustrious.safetensors", "required": False},
-    {"name": "Illustrious_AnIco.safetensors", "url": "https://civitai.com/api/download/models/1641205", "filename": "Illustrious_AnIco.safetensors", "required": False},
-    {"name": "Illustrious_Illustrij.safetensors", "url": "https://civitai.com/api/download/models/2186168", "filename": "Illustrious_Illustrij.safetensors", "required": False},
-    {"name": "Illustrious_ToonMerge.safetensors", "url": "https://civitai.com/api/download/models/1622588", "filename": "Illustrious_ToonMerge.safetensors", "required": False},
-    {"name": "Illustrious_SEMImergeijV6.safetensors", "url": "https://civitai.com/api/download/models/1920758", "filename": "Illustrious_SEMImergeijV6.safetensors", "required": False},
-
-    # Pony models
-    {"name": "Pony.safetensors", "url": "https://civitai.com/api/download/models/290640", "filename": "Pony.safetensors", "required": False},
-    {"name": "Pony_CyberRealistic.safetensors", "url": "https://civitai.com/api/download/models/2178176", "filename": "Pony_CyberRealistic.safetensors", "required": False},
-    {"name": "Pony_Lucent.safetensors", "url": "https://civitai.com/api/download/models/1971591", "filename": "Pony_Lucent.safetensors", "required": False},
-    {"name": "Pony_DucHaiten_Real.safetensors", "url": "https://civitai.com/api/download/models/695106", "filename": "Pony_DucHaiten_Real.safetensors", "required": False},
-    {"name": "Pony_Real_Dream.safetensors", "url": "https://civitai.com/api/download/models/2129811", "filename": "Pony_Real_Dream.safetensors", "required": False},
-    {"name": "Pony_Real_Merge.safetensors", "url": "https://civitai.com/api/download/models/994131", "filename": "Pony_Real_Merge.safetensors", "required": False},
-    {"name": "Pony_Realism.safetensors", "url": "https://civitai.com/api/download/models/914390", "filename": "Pony_Realism.safetensors", "required": False},
-
-    # Flux
-    {"name": "flux1-dev-fp8.safetensors", "url": "https://huggingface.co/Comfy-Org/flux1-dev/resolve/main/flux1-dev-fp8.safetensors?download=true", "filename": "flux1-dev-fp8.safetensors", "required": False},
-    {"name": "Flux_Fill.safetensors", "url": "https://civitai.com/api/download/models/1086292", "filename": "Flux_Fill.safetensors", "required": False, "dest_dir": "models/diffusion_models"}
-]
-
-# Append extras to checkpoints list
-for cp in extra_checkpoints:
-    checkpoints.append(cp)
-
-loras = []
-
-# User-provided LoRA additions (SD1.5, SDXL, Illustrious, Pony)
-user_loras = [
-    # SD1.5 LoRAs
-    {"name": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "url": "https://civitai.com/api/download/models/145907", "filename": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "dest_dir": "models/loras"},
-    {"name": "Stable_Diffusion_Loras_Midjourney_Mimic.safetensors", "url": "https://civitai.com/api/download/models/283697", "filename": "Stable_Diffusion_Loras_Midjourney_Mimic.safetensors", "dest_dir": "models/loras"},
-    {"name": "Stable_Diffusion_Loras_Extremely_Detailed.safetensors", "url": "https://civitai.com/api/download/models/258687", "filename": "Stable_Diffusion_Loras_Extremely_Detailed.safetensors", "dest_dir": "models/loras"},
-    {"name": "Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors", "url": "https://civitai.com/api/download/models/131991", "filename": "Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors", "dest_dir": "models/loras"},
-    {"name": "Stable_Diffusion_Loras_Detail_Tweaker.safetensors", "url": "https://civitai.com/api/download/models/135867", "filename": "Stable_Diffusion_Loras_Detail_Tweaker.safetensors", "dest_dir": "models/loras"},
-    {"name": "Stable_Diffusion_Loras_Wowifier.safetensors", "url": "https://civitai.com/api/download/models/217866", "filename": "Stable_Diffusion_Loras_Wowifier.safetensors", "dest_dir": "models/loras"},
-
-    # SDXL LoRAs
-    {"name": "SDXL_Pop_Art_Style.safetensors", "url": "https://civitai.com/api/download/models/192584", "filename": "SDXL_Pop_Art_Style.safetensors", "dest_dir": "models/loras"},
-    {"name": "SDXL_loras_2Steps.safetensors", "url": "https://huggingface.co/ByteDance/SDXL-Lightning/resolve/main/sdxl_lightning_2step_lora.safetensors?download=true", "filename": "SDXL_loras_2Steps.safetensors", "dest_dir": "models/loras"},
-    {"name": "Hyper-SDXL-8steps-CFG-lora.safetensors", "url": "https://huggingface.co/ByteDance/Hyper-SD/resolve/main/Hyper-SDXL-8steps-CFG-lora.safetensors", "filename": "Hyper-SDXL-8steps-CFG-lora.safetensors", "dest_dir": "models/loras"},
-    {"name": "SDXL_lightning_8_steps.safetensors", "url": "https://civitai.com/api/download/models/391999", "filename": "SDXL_lightning_8_steps.safetensors", "dest_dir": "models/loras"},
-    {"name": "SDXL_lightning_2_steps.safetensors", "url": "https://civitai.com/api/download/models/391994", "filename": "SDXL_lightning_2_steps.safetensors", "dest_dir": "models/loras"},
-
-    # Illustrious LoRAs
-    {"name": "Illustrious_USNR_Style.safetensors", "url": "https://civitai.com/api/download/models/959419", "filename": "Illustrious_USNR_Style.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_Gennesis.safetensors", "url": "https://civitai.com/api/download/models/1219983", "filename": "Illustrious_Gennesis.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_Loras_Hassaku_Shiro_Styles.safetensors", "url": "https://civitai.com/api/download/models/1580764", "filename": "Illustrious_Loras_Hassaku_Shiro_Styles.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_Loras_Power_Puff_Mix.safetensors", "url": "https://civitai.com/api/download/models/1456601", "filename": "Illustrious_Loras_Power_Puff_Mix.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_Loras_Detailer_Tool.safetensors", "url": "https://civitai.com/api/download/models/1191626", "filename": "Illustrious_Loras_Detailer_Tool.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors", "url": "https://civitai.com/api/download/models/1597800", "filename": "Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_loRA_Midjourney_watercolors.safetensors", "url": "https://civitai.com/api/download/models/1510865", "filename": "Illustrious_loRA_Midjourney_watercolors.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_loRA_Commix_style.safetensors", "url": "https://civitai.com/api/download/models/1227175", "filename": "Illustrious_loRA_Commix_style.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_loRA_detailrej.safetensors", "url": "https://civitai.com/api/download/models/1396529", "filename": "Illustrious_loRA_detailrej.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors", "url": "https://civitai.com/api/download/models/1144547", "filename": "Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_Vixon_Style.safetensors", "url": "https://civitai.com/api/download/models/1382407", "filename": "Illustrious_Vixon_Style.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_MagicalCircleTentacles.safetensors", "url": "https://civitai.com/api/download/models/1323341", "filename": "Illustrious_MagicalCircleTentacles.safetensors", "dest_dir": "models/loras"},
-    {"name": "Illustrious_lora_Add_Super_Details.safetensors", "url": "https://civitai.com/api/download/models/1622964", "filename": "Illustrious_lora_Add_Super_Details.safetensors", "dest_dir": "models/loras"},
-
-    # Pony LoRAs
-    {"name": "PONY_Fernando_Style.safetensors", "url": "https://civitai.com/api/download/models/452367", "filename": "PONY_Fernando_Style.safetensors", "dest_dir": "models/loras"},
-    {"name": "PONY_Majo.safetensors", "url": "https://civitai.com/api/download/models/835055", "filename": "PONY_Majo.safetensors", "dest_dir": "models/loras"},
-    {"name": "PONY_Western_Comic_Art_Style.safetensors", "url": "https://civitai.com/api/download/models/871611", "filename": "PONY_Western_Comic_Art_Style.safetensors", "dest_dir": "models/loras"},
-    {"name": "PONY_Incase_unaesthetic_style.safetensors", "url": "https://civitai.com/api/download/models/1128016", "filename": "PONY_Incase_unaesthetic_style.safetensors", "dest_dir": "models/loras"},
-    {"name": "Pony_Lora_Water_Color_Anime.safetensors", "url": "https://civitai.com/api/download/models/725772", "filename": "Pony_Lora_Water_Color_Anime.safetensors", "dest_dir": "models/loras"},
-    {"name": "Pony_Lora_Water_Color.safetensors", "url": "https://civitai.com/api/download/models/720004", "filename": "Pony_Lora_Water_Color.safetensors", "dest_dir": "models/loras"},
-    {"name": "Pony_Lora_Sketch_Illustration.safetensors", "url": "https://civitai.com/api/download/models/882225", "filename": "Pony_Lora_Sketch_Illustration.safetensors", "dest_dir": "models/loras"},
-    {"name": "Pony_Peoples_Work.safetensors", "url": "https://civitai.com/api/download/models/1036362", "filename": "Pony_Peoples_Work.safetensors", "dest_dir": "models/loras"}
-]
-
-# ---------- Subcategory definitions for Checkpoints and LoRAs (designer-friendly groups)
-checkpoints_subcategories = {
-    "SD1.5": [
-
-
-
-{
-    "display_title": "SD1.5",
-    "name": "SD1.5.safetensors",
-    "source_page": "https://model-info-page.com",
-    "url": "https://direct-download-link.com",
-    "filename": "saved_filename.ext",
-    "dest_dir": "models/category",
-    "info": "Description text",
-    "required": False
-},
-
-
-
-        {
-            "display_title": "Realistic Vision v6.0",
-            "name": "realisticvision_v60.safetensors", 
-            "url": "https://civitai.com/api/download/models/245598",
-            "filename": "realisticvision_v60.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        },
-
-
-
-        
-        {
-            "display_title": "Deliberate v3",
-            "name": "deliberate_v3.safetensors",
-            "url": "https://civitai.com/api/download/models/15236",
-            "filename": "deliberate_v3.safetensors", 
-            "dest_dir": "models/checkpoints",
-            "required": False
-        }
-    ],
-    
-    "SDXL": [
-        {
-            "display_title": "SDXL Base 1.0 Official",
-            "name": "sd_xl_base_1.0.safetensors",
-            "url": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0/resolve/main/sd_xl_base_1.0.safetensors",
-            "filename": "sd_xl_base_1.0.safetensors",
-            "dest_dir": "models/checkpoints", 
-            "required": False
-        },
-        {
-            "display_title": "Juggernaut XL v9",
-            "name": "juggernautXL_v9.safetensors",
-            "url": "https://civitai.com/api/download/models/456194",
-            "filename": "juggernautXL_v9.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        },
-        {
-            "display_title": "RealVisXL v4.0",
-            "name": "realvisxl_v40.safetensors",
-            "url": "https://civitai.com/api/download/models/344398",
-            "filename": "realvisxl_v40.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        }
-    ],
-    
-    "Flux": [
-        {
-            "display_title": "FLUX.1 Dev FP8",
-            "name": "flux1-dev-fp8.safetensors",
-            "url": "https://huggingface.co/Comfy-Org/flux1-dev/resolve/main/flux1-dev-fp8.safetensors",
-            "filename": "flux1-dev-fp8.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        },
-        {
-            "display_title": "FLUX.1 Schnell",
-            "name": "flux1-schnell.safetensors", 
-            "url": "https://huggingface.co/black-forest-labs/FLUX.1-schnell/resolve/main/flux1-schnell.safetensors",
-            "filename": "flux1-schnell.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        },
-        {
-            "display_title": "FLUX Redux",
-            "name": "flux-redux.safetensors",
-            "url": "https://civitai.com/api/download/models/1086258", 
-            "filename": "flux-redux.safetensors",
-            "dest_dir": "models/checkpoints",
-            "required": False
-        }
-    ]
-}
-
-pythonloras_subcategories = {
-    "SD1.5": [
-        {
-            "display_title": "Detail Tweaker - Enhanced Details",
-            "name": "detail_tweaker_lora.safetensors",
-            "url": "https://civitai.com/api/download/models/135867",
-            "filename": "detail_tweaker_lora.safetensors",
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "Epi NoiseOffset - Contrast Fix",
-            "name": "epi_noiseoffset.safetensors",
-            "url": "https://civitai.com/api/download/models/16576",
-            "filename": "epi_noiseoffset.safetensors", 
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "LowRA - Style Enhancement",
-            "name": "lowra_style.safetensors",
-            "url": "https://civitai.com/api/download/models/48139",
-            "filename": "lowra_style.safetensors",
-            "dest_dir": "models/loras", 
-            "required": False
-        }
-    ],
-    
-    "SDXL": [
-        {
-            "display_title": "SDXL Lightning 2-Step",
-            "name": "sdxl_lightning_2step.safetensors",
-            "url": "https://huggingface.co/ByteDance/SDXL-Lightning/resolve/main/sdxl_lightning_2step_lora.safetensors",
-            "filename": "sdxl_lightning_2step.safetensors",
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "Hyper-SDXL 8-Steps CFG",
-            "name": "hyper_sdxl_8steps.safetensors", 
-            "url": "https://huggingface.co/ByteDance/Hyper-SD/resolve/main/Hyper-SDXL-8steps-CFG-lora.safetensors",
-            "filename": "hyper_sdxl_8steps.safetensors",
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "SDXL Turbo LoRA",
-            "name": "sdxl_turbo_lora.safetensors",
-            "url": "https://civitai.com/api/download/models/288982",
-            "filename": "sdxl_turbo_lora.safetensors",
-            "dest_dir": "models/loras", 
-            "required": False
-        }
-    ],
-    
-    "Flux": [
-        {
-            "display_title": "FLUX LoRA Realism",
-            "name": "flux_realism_lora.safetensors",
-            "url": "https://civitai.com/api/download/models/978472",
-            "filename": "flux_realism_lora.safetensors", 
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "FLUX Anime Style",
-            "name": "flux_anime_lora.safetensors",
-            "url": "https://civitai.com/api/download/models/806265",
-            "filename": "flux_anime_lora.safetensors",
-            "dest_dir": "models/loras",
-            "required": False
-        },
-        {
-            "display_title": "FLUX Portrait LoRA",
-            "name": "flux_portrait_lora.safetensors", 
-            "url": "https://civitai.com/api/download/models/967375",
-            "filename": "flux_portrait_lora.safetensors",
-            "dest_dir": "models/loras",
-            "required": False
-        }
-    ]
-}
-
-# Integrate subcategories into the main checkpoints and loras variables.
-# Keep backward-compatible 'All' listing under key 'All' for full list behavior.
-try:
-    # Create subcategory maps but do not overwrite the original lists yet
-    checkpoints_subcategory_map = {}
-    checkpoints_subcategory_map['All'] = checkpoints[:] if isinstance(checkpoints, list) else []
-    for k, v in checkpoints_subcategories.items():
-        checkpoints_subcategory_map[k] = v
-except Exception:
-    checkpoints_subcategory_map = None
-
-try:
-    loras_subcategory_map = {}
-    loras_subcategory_map['All'] = loras[:] if isinstance(loras, list) else []
-    for k, v in pythonloras_subcategories.items():
-        loras_subcategory_map[k] = v
-except Exception:
-    loras_subcategory_map = None
-
-
-# Additional Pony-related LoRAs requested by user
-user_loras.extend([
-    {
-        "name": "Disney_Princess_XL_v2.0.safetensors",
-        "url": "https://civitai.com/api/download/models/244808",
-        "filename": "Disney_Princess_XL_v2.0.safetensors",
-        "dest_dir": "models/loras",
-        "required": False
-    },
-    {
-        "name": "ExpressiveH_Hentai_Style.safetensors",
-        "url": "https://civitai.com/api/download/models/382152?type=Model&format=SafeTensor",
-        "filename": "ExpressiveH_Hentai_Style.safetensors",
-        "dest_dir": "models/loras",
-        "required": False
-    },
-    {
-        "name": "Vixons_Pony_Gothic_Neon_v1.0.safetensors",
-        "url": "https://civitai.com/api/download/models/398847?type=Model&format=SafeTensor",
-        "filename": "Vixons_Pony_Gothic_Neon_v1.0.safetensors",
-        "dest_dir": "models/loras",
-        "required": False
-    },
-    {
-        "name": "Incase_Style_PonyXL_v3.0.safetensors",
-        "url": "https://civitai.com/api/download/models/436219?type=Model&format=SafeTensor",
-        "filename": "Incase_Style_PonyXL_v3.0.safetensors",
-        "dest_dir": "models/loras",
-        "required": False
-    }
-])
-
-# Append user-provided LoRAs
-for ul in user_loras:
-    # maintain the simple info and required flag defaults used elsewhere
-    entry = {
-        'name': ul.get('name'),
-        'url': ul.get('url'),
-        'info': ul.get('name'),
-        'required': False,
-    }
-    # include optional fields used by downloader
-    if 'filename' in ul:
-        entry['filename'] = ul['filename']
-    if 'dest_dir' in ul:
-        entry['dest_dir'] = ul['dest_dir']
-    loras.append(entry)
-
-# Flux LoRAs provided by user
-flux_loras = [
-    {"name": "Flux_lora_Semirealisticportraitpainting.safetensors", "url": "https://civitai.com/api/download/models/978472", "filename": "Flux_lora_Semirealisticportraitpainting.safetensors", "dest_dir": "models/loras"},
-    {"name": "Flux_lora_Velvetv2.safetensors", "url": "https://civitai.com/api/download/models/967375", "filename": "Flux_lora_Velvetv2.safetensors", "dest_dir": "models/loras"},
-    {"name": "Flux_lora_RetroAnimeStyle.safetensors", "url": "https://civitai.com/api/download/models/806265", "filename": "Flux_lora_RetroAnimeStyle.safetensors", "dest_dir": "models/loras"},
-    {"name": "Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors", "url": "https://civitai.com/api/download/models/1227179", "filename": "Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors", "dest_dir": "models/loras"},
-    {"name": "Flux_lora_VelvetMythicFantasyGothicLines.safetensors", "url": "https://civitai.com/api/download/models/1202162", "filename": "Flux_lora_VelvetMythicFantasyGothicLines.safetensors", "dest_dir": "models/loras"},
-    {"name": "Flux_lora_Mezzotint.safetensors", "url": "https://civitai.com/api/download/models/757030", "filename": "Flux_lora_Mezzotint.safetensors", "dest_dir": "models/loras"},
-    {"name": "uso-flux1-dit-lora-v1.safetensors", "url": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/loras/uso-flux1-dit-lora-v1.safetensors", "filename": "uso-flux1-dit-lora-v1.safetensors", "dest_dir": "models/loras"}
-]
-
-for fl in flux_loras:
-    entry = {
-        'name': fl.get('name'),
-        'url': fl.get('url'),
-        'info': fl.get('name'),
-        'required': False,
-    }
-    entry['filename'] = fl['filename']
-    entry['dest_dir'] = fl['dest_dir']
-    loras.append(entry)
-
-clip_models = [
-    {
-        "name": "CLIP ViT-L/14",
-        "url": "https://huggingface.co/openai/clip-vit-large-patch14",
-        "info": "Standard CLIP model for text encoding",
-        "required": False
-    },
-    {
-        "name": "CLIP ViT-B/32",
-        "url": "https://huggingface.co/openai/clip-vit-base-patch32",
-        "info": "Smaller CLIP model for faster processing",
-        "required": False
-    },
-    {
-        "name": "CLIP G",
-        "url": "https://huggingface.co/laion/CLIP-ViT-g-14-laion2B-s12B-b42K",
-        "info": "Large CLIP G model for SDXL",
-        "required": False
-    }
-]
-
-# Replaced CLIP backends provided by user (will download into models/clip)
-clip_models = [
-    {
-        "name": "clip_l.safetensors",
-        "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/clip_l.safetensors?download=true",
-        "info": "Flux clip_l encoder",
-        "required": False,
-        "filename": "clip_l.safetensors",
-        "dest_dir": "models/clip"
-    },
-    {
-        "name": "t5xxl_fp16.safetensors",
-        "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp16.safetensors?download=true",
-        "info": "Flux t5xxl text encoder",
-        "required": False,
-        "filename": "t5xxl_fp16.safetensors",
-        "dest_dir": "models/clip"
-    },
-    {
-        "name": "clip_g.safetensors",
-        "url": "https://huggingface.co/calcuis/sd3.5-large-gguf/resolve/7f72f2a432131bba82ecd1aafb931ac99f0f05f7/clip_g.safetensors?download=true",
-        "info": "Large CLIP G encoder",
-        "required": False,
-        "filename": "clip_g.safetensors",
-        "dest_dir": "models/clip"
-    }
-]
-
-clip_vision_models = [
-    {
-        "name": "CLIP Vision ViT-L",
-        "url": "https://huggingface.co/openai/clip-vit-large-patch14",
-        "info": "CLIP vision encoder for image understanding",
-        "required": False
-    },
-    {
-        "name": "CLIP Vision G",
-        "url": "https://huggingface.co/laion/CLIP-ViT-g-14-laion2B-s12B-b42K",
-        "info": "Large CLIP vision model for advanced image processing",
-        "required": False
-    },
-    {
-        "name": "IP-Adapter CLIP Vision",
-        "url": "https://huggingface.co/h94/IP-Adapter",
-        "info": "Specialized CLIP vision for IP-Adapter workflows",
-        "required": False
-    }
-]
-
-# Replaced CLIP Vision models as requested (download into models/clip_vision)
-clip_vision_models = [
-    {
-        "name": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors",
-        "url": "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors",
-        "info": "CLIP ViT-H-14 encoder (IP-Adapter repack)",
-        "required": False,
-        "filename": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors",
-        "dest_dir": "models/clip_vision"
-    },
-    {
-        "name": "CLIP-ViT-bigG-14-laion2B-39B-b160k.safetensors",
-        "url": "https://huggingface.co/h94/IP-Adapter/resolve/main/sdxl_models/image_encoder/model.safetensors",
-        "info": "CLIP ViT bigG encoder for SDXL",
-        "required": False,
-        "filename": "CLIP-ViT-bigG-14-laion2B-39B-b160k.safetensors",
-        "dest_dir": "models/clip_vision"
-    },
-    {
-        "name": "model_l.safetensors",
-        "url": "https://huggingface.co/openai/clip-vit-large-patch14/resolve/main/model.safetensors?download=true",
-        "info": "OpenAI CLIP ViT-L model",
-        "required": False,
-        "filename": "model_l.safetensors",
-        "dest_dir": "models/clip_vision"
-    },
-    {
-        "name": "clip-vision_vit-h.safetensors",
-        "url": "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors",
-        "info": "Alternate vit-h encoder",
-        "required": False,
-        "filename": "clip-vision_vit-h.safetensors",
-        "dest_dir": "models/clip_vision"
-    },
-    {
-        "name": "clip_vision_h.safetensors",
-        "url": "https://huggingface.co/Comfy-Org/Wan_2.1_ComfyUI_repackaged/resolve/main/split_files/clip_vision/clip_vision_h.safetensors?download=true",
-        "info": "Comfy repackaged clip_vision_h",
-        "required": False,
-        "filename": "clip_vision_h.safetensors",
-        "dest_dir": "models/clip_vision"
-    },
-    {
-        "name": "sigclip_vision_patch14_384.safetensors",
-        "url": "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors?download=true",
-        "info": "SigCLIP vision model",
-        "required": False,
-        "filename": "sigclip_vision_patch14_384.safetensors",
-        "dest_dir": "models/clip_vision"
-    }
-]
-
-vae_models = [
-    {
-        "name": "SDXL VAE",
-        "url": "https://huggingface.co/stabilityai/sdxl-vae",
-        "info": "Standard VAE for SDXL models",
-        "required": False
-    },
-    {
-        "name": "VAE MSE 840k",
-        "url": "https://huggingface.co/stabilityai/sd-vae-ft-mse-original",
-        "info": "High quality VAE for better image details",
-        "required": False
-    },
-    {
-        "name": "Kl-f8-anime2",
-        "url": "https://huggingface.co/hakurei/waifu-diffusion-v1-4",
-        "info": "VAE optimized for anime-style images",
-        "required": False
-    }
-]
-
-# User-provided VAE replacements
-vae_models = [
-    {
-        "name": "SDXL_Vae.safetensors",
-        "url": "https://huggingface.co/stabilityai/sdxl-vae/resolve/main/sdxl_vae.safetensors?download=true",
-        "info": "Official SDXL VAE",
-        "required": False,
-        "filename": "SDXL_Vae.safetensors",
-        "dest_dir": "models/vae"
-    },
-    {
-        "name": "ae.safetensors",
-        "url": "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged/resolve/main/split_files/vae/ae.safetensors?download=true",
-        "info": "Lumina ae VAE",
-        "required": False,
-        "filename": "ae.safetensors",
-        "dest_dir": "models/vae"
-    }
-]
-
-controlnet_models = [
-    {
-        "name": "ControlNet Canny",
-        "url": "https://huggingface.co/diffusers/controlnet-canny-sdxl-1.0",
-        "info": "Canny edge detection ControlNet for SDXL",
-        "required": False
-    },
-    {
-        "name": "ControlNet Depth",
-        "url": "https://huggingface.co/diffusers/controlnet-depth-sdxl-1.0",
-        "info": "Depth map ControlNet for SDXL",
-        "required": False
-    },
-    {
-        "name": "ControlNet OpenPose",
-        "url": "https://huggingface.co/thibaud/controlnet-openpose-sdxl-1.0",
-        "info": "Human pose detection ControlNet for SDXL",
-        "required": False
-    }
-]
-
-# Replaced ControlNet models provided by user (download into models/controlnet)
-controlnet_models = [
-    {
-        "name": "FLUX.1-dev-Controlnet-Union.safetensors",
-        "url": "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union/resolve/main/diffusion_pytorch_model.safetensors",
-        "info": "FLUX.1 dev Controlnet union",
-        "required": False,
-        "filename": "FLUX.1-dev-Controlnet-Union.safetensors",
-        "dest_dir": "models/controlnet"
-    },
-    {
-        "name": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
-        "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
-        "info": "Control Lora rank128 tile fp16",
-        "required": False,
-        "filename": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
-        "dest_dir": "models/controlnet"
-    },
-    {
-        "name": "t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
-        "url": "https://huggingface.co/TencentARC/t2i-adapter-lineart-sdxl-1.0/resolve/main/diffusion_pytorch_model.fp16.safetensors?download=true",
-        "info": "t2i adapter lineart sdxl fp16",
-        "required": False,
-        "filename": "t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
-        "dest_dir": "models/controlnet"
-    },
-    {
-        "name": "control_v11p_sd15_inpaint_fp16.safetensors",
-        "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors",
-        "info": "inpaint control v11p sd15 fp16",
-        "required": False,
-        "filename": "control_v11p_sd15_inpaint_fp16.safetensors",
-        "dest_dir": "models/controlnet"
-    },
-    {
-        "name": "controlnet-union-sdxl-1.0_promax.safetensors",
-        "url": "https://huggingface.co/xinsir/controlnet-union-sdxl-1.0/resolve/main/diffusion_pytorch_model_promax.safetensors?download=true",
-        "info": "ControlNet union for SDXL",
-        "required": False,
-        "filename": "controlnet-union-sdxl-1.0_promax.safetensors",
-        "dest_dir": "models/controlnet"
-    },
-    {
-        "name": "control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
-        "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors?download=true",
-        "info": "Control Lora rank128 depth fp16",
-        "required": False,
-        "filename": "control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
-        "dest_dir": "models/controlnet"
-    }
-]
-
-upscale_models = [
-    {
-        "name": "Real-ESRGAN x4",
-        "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth",
-        "info": "4x upscaling model for general images",
-        "required": False
-    },
-    {
-        "name": "Real-ESRGAN Anime",
-        "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.2.2.4/RealESRGAN_x4plus_anime_6B.pth",
-        "info": "4x upscaling model optimized for anime images",
-        "required": False
-    },
-    {
-        "name": "LDSR",
-        "url": "https://heibox.uni-heidelberg.de/f/578df07c8fc04ffbadf3/?dl=1",
-        "info": "Latent diffusion super-resolution model",
-        "required": False
-    }
-]
-
-# Replaced Upscale model list provided by user
-upscale_models = [
-    {"name": "4x_foolhardy_Remacri.pth", "url": "https://huggingface.co/FacehugmanIII/4x_foolhardy_Remacri/resolve/main/4x_foolhardy_Remacri.pth?download=true", "filename": "4x_foolhardy_Remacri.pth", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "RealESRGAN_x4plus.pth", "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth", "filename": "RealESRGAN_x4plus.pth", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "4x-UltraSharp.safetensors", "url": "https://civitai.com/api/download/models/125843", "filename": "4x-UltraSharp.safetensors", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "4x_NMKD_Siax_200k.pth", "url": "https://huggingface.co/uwg/upscaler/resolve/main/ESRGAN/4x_NMKD-Siax_200k.pth?download=true", "filename": "4x_NMKD_Siax_200k.pth", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "RealESRGAN_x4plus_anime_and_illustrations_6B.pth", "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.2.2.4/RealESRGAN_x4plus_anime_6B.pth", "filename": "RealESRGAN_x4plus_anime_and_illustrations_6B.pth", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "4x_NMKD-Superscale-SP_178000_G.pth", "url": "https://huggingface.co/gemasai/4x_NMKD-Superscale-SP_178000_G/resolve/main/4x_NMKD-Superscale-SP_178000_G.pth", "filename": "4x_NMKD-Superscale-SP_178000_G.pth", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "OmniSR_X2_DIV2K.safetensors", "url": "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X2_DIV2K.safetensors", "filename": "OmniSR_X2_DIV2K.safetensors", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "OmniSR_X3_DIV2K.safetensors", "url": "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X3_DIV2K.safetensors", "filename": "OmniSR_X3_DIV2K.safetensors", "dest_dir": "models/upscale_models", "required": False},
-    {"name": "OmniSR_X4_DIV2K.safetensors", "url": "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X4_DIV2K.safetensors", "filename": "OmniSR_X4_DIV2K.safetensors", "dest_dir": "models/upscale_models", "required": False}
-]
-
-additional_downloads = [
-    {
-        "name": "uso-flux1-projector-v1.safetensors",
-        "url": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/model_patches/uso-flux1-projector-v1.safetensors",
-        "info": "USO Flux1 projector model patch",
-        "required": False,
-        "filename": "uso-flux1-projector-v1.safetensors",
-        "dest_dir": "models/model_patches"
-    },
-    {
-        "name": "Flux_Redux.safetensors",
-        "url": "https://civitai.com/api/download/models/1086258",
-        "info": "Flux Redux style model",
-        "required": False,
-        "filename": "Flux_Redux.safetensors",
-        "dest_dir": "models/style_models"
-    }
-]
-
-# Embeddings collection (new category)
-embeddings = [
-    {
-        "name": "EasyNegative.pt",
-        "url": "https://civitai.com/api/download/models/9208?type=Model&format=SafeTensor&size=full&fp=fp16",
-        "info": "EasyNegative embedding for better negative prompts (version 9208)",
-        "required": False,
-        "filename": "EasyNegative.pt",
-        "dest_dir": "models/embeddings"
-    }
-]
-
-# (toggle state and widget mapping for `embeddings` will be initialized
-# later automatically when `category_data` is processed)
-
-# -----------------------------
-# Additional Pony/Illustrious Models
-# -----------------------------
-
-# 1️⃣ A‑mix [Illustrious] Checkpoint
-checkpoints.append(
-    {
-        "name": "A-mix_Illustrious_v1915059.safetensors",
-        "website_url": "https://civitai.com/models/1692152/a-mix-illustrious?modelVersionId=1915059",
-        "download_url": "https://civitai.com/api/download/models/1692152?modelVersionId=1915059&format=SafeTensor",
-        "info": "A‑mix [Illustrious] checkpoint version 1915059",
-        "required": False,
-        "filename": "A-mix_Illustrious_v1915059.safetensors",
-        "dest_dir": "models/checkpoints"
-    }
-)
-
-# 2️⃣ Ri‑mix – Style LORA [PONY + Illustrious + FLUX]
-loras.append(
-    {
-        "name": "Ri-mix_Style_LORA_PONY_Illustrious_FLUX_v1918677.safetensors",
-        "website_url": "https://civitai.com/models/996220/ri-mix-style-lora-pony-illustrious-flux?modelVersionId=1918677",
-        "download_url": "https://civitai.com/api/download/models/996220?modelVersionId=1918677&format=SafeTensor",
-        "info": "Ri‑mix – Style LORA [PONY + Illustrious + FLUX], version 1918677",
-        "required": False,
-        "filename": "Ri-mix_Style_LORA_PONY_Illustrious_FLUX_v1918677.safetensors",
-        "dest_dir": "models/loras"
-    }
-)
-
-# -----------------------------
-# Optional: Add to category_data if not already (category_data is defined later)
-# -----------------------------
-# -----------------------------
-# Additional user-provided models (corrected/verified)
-# These use the same structure as other entries and use the key 'url'
-# so the existing download logic will pick them up.
-
-# CyberRealistic Pony v13.0 (Corrected)
-checkpoints.append(
-    {
-        "name": "CyberRealistic_Pony_v13.0.safetensors",
-        "website_url": "https://civitai.com/models/443821/cyberrealistic-pony",
-        # download URL points to the version-specific API endpoint; keep as `url` for downloader
-        "url": "https://civitai.com/api/download/models/2178176",
-        "info": "CyberRealistic Pony v13.0 - High-quality SDXL Pony model",
-        "required": False,
-        "filename": "CyberRealistic_Pony_v13.0.safetensors",
-        "dest_dir": "models/checkpoints"
-    }
-)
-
-# ExpressiveH Style LoRA (Corrected)
-loras.append(
-    {
-        "name": "ExpressiveH_Hentai_Style_PonyXL.safetensors",
-        "website_url": "https://civitai.com/models/413320/expressiveh-hentai-lora-style",
-        "url": "https://civitai.com/api/download/models/464404",
-        "info": "ExpressiveH Hentai LoRA Style - PonyXL compatible",
-        "required": False,
-        "filename": "ExpressiveH_Hentai_Style_PonyXL.safetensors",
-        "dest_dir": "models/loras"
-    }
-)
-
-# -----------------------------
-# Slider LoRAs (placeholders - need verification on Civitai)
-# These are intentionally left as placeholders so you can fill the correct
-# `website_url` / `url` fields after locating the proper model/version IDs.
-slider_loras = [
-    {
-        "name": "Pony_Amateur_LoRA_v1.safetensors",
-        "website_url": None,  # TODO: find correct Civitai model page and set URL
-        # TODO: Find correct model ID on Civitai and replace the URL below
-        # "url": "https://civitai.com/api/download/models/[NEED_MODEL_ID]",
-        "url": None,
-        "info": "Pony Amateur ✨ - Rough (V1)",
-        "required": False,
-        "filename": "Pony_Amateur_LoRA_v1.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Crazy_Girlfriend_Mix_XL_PONY.safetensors",
-        "website_url": None,  # TODO: find correct Civitai model page and set URL
-        # TODO: Find correct model ID on Civitai and replace the URL below
-        # "url": "https://civitai.com/api/download/models/[NEED_MODEL_ID]",
-        "url": None,
-        "info": "Crazy Girlfriend Mix [XL/PONY]",
-        "required": False,
-        "filename": "Crazy_Girlfriend_Mix_XL_PONY.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Insta_Baddie_PONY.safetensors",
-        "website_url": None,  # TODO: find correct Civitai model page and set URL
-        # TODO: Find correct model ID on Civitai and replace the URL below
-        # "url": "https://civitai.com/api/download/models/[NEED_MODEL_ID]",
-        "url": None,
-        "info": "Insta Baddie[PONY]",
-        "required": False,
-        "filename": "Insta_Baddie_PONY.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Real_Beauty_LoRA_v1.safetensors",
-        "website_url": None,  # TODO: find correct Civitai model page and set URL
-        # TODO: Find correct model ID on Civitai and replace the URL below
-        # "url": "https://civitai.com/api/download/models/[NEED_MODEL_ID]",
-        "url": None,
-        "info": "Real Beauty LoRA v1",
-        "required": False,
-        "filename": "Real_Beauty_LoRA_v1.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Dramatic_Lighting_Slider_v1.0.safetensors",
-        "website_url": None,  # TODO: find correct Civitai model page and set URL
-        # TODO: Find correct model ID on Civitai and replace the URL below
-        # "url": "https://civitai.com/api/download/models/[NEED_MODEL_ID]",
-        "url": None,
-        "info": "Dramatic Lighting Slider v1.0",
-        "required": False,
-        "filename": "Dramatic_Lighting_Slider_v1.0.safetensors",
-        "dest_dir": "models/loras"
-    }
-]
-
-# -----------------------------
-# VERIFIED ALTERNATIVE LoRAs (if originals can't be found)
-verified_loras = [
-    {
-        "name": "ExpressiveH_Mixed_Style_v3.safetensors",
-        "website_url": "https://civitai.com/models/602698/expressiveh-vixons-gothic-neon-incase-mixed-style-v2-pony-xl-by-uoc",
-        "url": "https://civitai.com/api/download/models/670947",
-        "info": "ExpressiveH & Incase Mixed Style v3 - Illustrious/XL compatible",
-        "required": False,
-        "filename": "ExpressiveH_Mixed_Style_v3.safetensors",
-        "dest_dir": "models/loras"
-    }
-]
-
-# If you want to include verified alternatives automatically, uncomment the
-# following line (we leave it commented so you can review before adding):
-# loras.extend(verified_loras)
-
-# Note: category_data is defined later and uses the `checkpoints` and `loras`
-# variables, so the entries appended above will automatically be included in
-# the GUI and the toggle initialization that runs after `category_data` is built.
-
-# -----------------------------
-# =============================================
-# TRIPLE-CHECKED MODEL URLs - CRITICAL FIXES
-# =============================================
-
-# Checkpoints - CORRECTED URLs (converted download_url -> url)
-checkpoints_data = [
-    {
-        "name": "Comic_Diffusion_PickleTensor",
-        "website_url": "https://civitai.com/models/13/comic-diffusion",
-        "url": "https://civitai.com/api/download/models/13?type=Model&format=PickleTensor&size=full&fp=fp16",
-        "info": "Comic Diffusion checkpoint (PickleTensor)",
-        "required": False,
-        "filename": "Comic_Diffusion_PickleTensor.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "Superhero_Diffusion_PickleTensor",
-        "website_url": "https://civitai.com/models/1/superhero-diffusion",
-        "url": "https://civitai.com/api/download/models/1?type=Model&format=PickleTensor&size=full&fp=fp16",
-        "info": "Superhero Diffusion checkpoint (PickleTensor)",
-        "required": False,
-        "filename": "Superhero_Diffusion_PickleTensor.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "helloComic",
-        "website_url": "https://civitai.com/models/112857/hellocomic",
-        "url": "https://civitai.com/api/download/models/112857?type=Model&format=SafeTensor&size=full&fp=fp16",
-        "info": "helloComic checkpoint",
-        "required": False,
-        "filename": "helloComic.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "Nightvideionxl",
-        "website_url": "https://civitai.com/models/577919/nightvideionxl",
-        "url": "https://civitai.com/api/download/models/577919?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-        "info": "Nightvideionxl checkpoint",
-        "required": False,
-        "filename": "Nightvideionxl.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "AlbedoBase_XL",
-        "website_url": "https://civitai.com/models/1041855/albedobase-xl",
-        "url": "https://civitai.com/api/download/models/1041855?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-        "info": "AlbedoBase XL checkpoint",
-        "required": False,
-        "filename": "AlbedoBase_XL.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "Impasto_Virtuoso",
-        "website_url": "https://civitai.com/models/516211/impasto-virtuoso",
-        "url": "https://civitai.com/api/download/models/516211?type=Model&format=SafeTensor",
-        "info": "Impasto Virtuoso checkpoint",
-        "required": False,
-        "filename": "Impasto_Virtuoso.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "SDVN7-NijiStyleXL",
-        "website_url": "https://civitai.com/models/155870/sdvn7-nijistylexl",
-        "url": "https://civitai.com/api/download/models/155870?type=Model&format=SafeTensor&size=full&fp=fp16",
-        "info": "SDVN7-NijiStyleXL checkpoint",
-        "required": False,
-        "filename": "SDVN7-NijiStyleXL.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "Tamarin_XL",
-        "website_url": "https://civitai.com/models/265836/tamarin-xl",
-        "url": "https://civitai.com/api/download/models/265836?type=Model&format=SafeTensor&size=full&fp=fp16",
-        "info": "Tamarin XL checkpoint",
-        "required": False,
-        "filename": "Tamarin_XL.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-    {
-        "name": "Animagine_XL_Realistic_Stylistic",
-        "website_url": "https://civitai.com/models/1969417/animagine-xl-realistic-or-stylistic",
-        "url": "https://civitai.com/api/download/models/1969417?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-        "info": "Animagine XL Realistic or Stylistic checkpoint",
-        "required": False,
-        "filename": "Animagine_XL_Realistic_Stylistic.safetensors",
-        "dest_dir": "models/checkpoints"
-    },
-]
+# Status and Progress Bar (reserve space to avoid layout shifts)
+# -----------------------------
+# Pre-allocated hidden status placeholder (height reserved)
+status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
+# Items the pod budget check turned off before an install; empty (no height) until something is dropped
+selection_notice = widgets.HTML(value="")
 
-checkpoints.extend(checkpoints_data)
+# Pre-allocated hidden progress container (space reserved; hidden by visibility)
+progress_container = widgets.HTML(value="""
+<div style="display:flex; justify-content:center; margin-bottom:20px;">
+    <div class="progress-container" style="display:block; visibility: hidden;">
+        <div class="progress-bar" style="width:0%;"></div>
+    </div>
+</div>
+""")
 
-# -----------------------------
-# LoRAs - NEED INDIVIDUAL VERIFICATION (converted download_url -> url)
-loras_data = [
-    {
-        "name": "Jim_Lee_SD1.5_LoRA",
-        "website_url": "https://civitai.com/models/10580/jim-lee",
-        "url": "https://civitai.com/api/download/models/10580?type=Model&format=SafeTensor&size=full&fp=fp16",
-        "info": "Jim Lee SD1.5 LoRA",
-        "required": False,
-        "filename": "Jim_Lee_SD1.5_LoRA.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Western_Comics_Art_LoRA",
-        "website_url": "https://civitai.com/models/334734/western-comics-art",
-        "url": "https://civitai.com/api/download/models/334734?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-        "info": "Western Comics Art LoRA",
-        "required": False,
-        "filename": "Western_Comics_Art_LoRA.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Marvelmixx_Flux_LoRA",
-        "website_url": "https://civitai.com/models/909317/marvelmixx",
-        "url": "https://civitai.com/api/download/models/909317?type=Model&format=SafeTensor",
-        "info": "Marvelmixx Flux LoRA",
-        "required": False,
-        "filename": "Marvelmixx_Flux_LoRA.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "SXZ_Jim_Lee_FLUX",
-        "website_url": "https://civitai.com/models/776104/sxz-jim-lee-flux",
-        "url": "https://civitai.com/api/download/models/776104?type=Model&format=SafeTensor",
-        "info": "SXZ Jim Lee FLUX LoRA",
-        "required": False,
-        "filename": "SXZ_Jim_Lee_FLUX.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Ri_Mix_LoRA",
-        "website_url": "https://civitai.com/models/996220/ri-mix-style-lora-pony-illustrious-flux",
-        # NOTE: This entry intentionally keeps the download ID as provided by the user
-        # (could point to a different version). Double-check the version ID before use.
-        "url": "https://civitai.com/api/download/models/1918677?type=Model&format=SafeTensor",
-        "info": "Ri Mix LoRA",
-        "required": False,
-        "filename": "Ri_Mix_LoRA.safetensors",
-        "dest_dir": "models/loras"
-    },
-    {
-        "name": "Jim_Lee_Flux_LoRA",
-        "website_url": "https://civitai.com/models/1711873/jim-lee-flux",
-        "url": "https://civitai.com/api/download/models/1711873?type=Model&format=SafeTensor",
-        "info": "Jim Lee Flux LoRA",
-        "required": False,
-        "filename": "Jim_Lee_Flux_LoRA.safetensors",
-        "dest_dir": "models/loras"
-    }
-]
+# (Removed top-level CivitAI status link — the only Get CivitAI Key link appears in the advanced controls)
+
+# Download-only status and progress (reserve space like the main progress bar)
+download_status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Downloading...</div>")
+
+download_progress_container = widgets.HTML(value="""
+<div style="display:flex; justify-content:center; margin-bottom:20px;">
+    <div class="progress-container" style="display:block; visibility: hidden;">
+        <div class="progress-bar" style="width:0%;"></div>
+    </div>
+</div>
+""")
+
+# Additional-downloads status and progress (separate bar for 'additional downloads')
+additional_downloads_status_label = widgets.HTML(value="<div class='status-text' style='height: 26px; visibility: hidden;'>Additional downloads...</div>")
+
+additional_downloads_progress_container = widgets.HTML(value="""
+<div style="display:flex; justify-content:center; margin-bottom:20px;">
+    <div class="additional-progress-container" style="display:block; visibility: hidden;">
+        <div class="additional-progress-bar" style="width:0%;"></div>
+    </div>
+</div>
+""")
 
-loras.extend(loras_data)
+# -----------------------------
+# Open Comfy UI Link
+# -----------------------------
+# Simple clickable text link in blue (visible from start). This uses the existing .comfy-link style.
+# Initialize the Open Comfy UI link as empty; it will be populated when ComfyUI is detected
+open_link_html = widgets.HTML(value="")
 
-# =============================================
-# CRITICAL ISSUES FOUND - NOTES included in comments
-# =============================================
+# Frame the link and place it on the right above the Start Up button
+open_link_frame = widgets.Box([open_link_html], layout=widgets.Layout(width='280px', height='60px'))
 
+# -----------------------------
 # Category Data and State Management
 # -----------------------------
 
-# =============================================
-# DOWNLOAD LIBRARY - REPLACE THIS ENTIRE SECTION
-# =============================================
-#
-# To update your download library, replace the contents of DOWNLOAD_LIBRARY
-# with your custom entries. Keep the top-level keys as shown below. Each
-# section should be a list of dictionaries following the template in the
-# README-style comment further below.
-#
-DOWNLOAD_LIBRARY = {
-    "custom_nodes": [
-        {
-            "display_title": "Essential ComfyUI Manager",
-            "name": "ComfyUI-Manager",
-            "url": "https://github.com/ltdrdata/ComfyUI-Manager.git",
-            "filename": "ComfyUI-Manager",
-            "info": "Essential node manager for ComfyUI",
-            "required": True
-        },
-        {
-            "display_title": "RGThree Utilities",
-            "name": "rgthree-comfy",
-            "url": "https://github.com/rgthree/rgthree-comfy.git",
-            "filename": "rgthree-comfy",
-            "info": "Quality of life nodes and utilities",
-            "required": False
-        },
-        {
-            "display_title": "ComfyUI Easy Use",
-            "name": "ComfyUI-Easy-Use",
-            "url": "https://github.com/yolain/ComfyUI-Easy-Use.git",
-            "filename": "ComfyUI-Easy-Use",
-            "info": "Simplified workflow nodes for beginners",
-            "required": False
-        }
-    ],
-
-    "checkpoints": [
-        {
-            "display_title": "SDXL Base Model",
-            "name": "SDXL.safetensors",
-            "source_page": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0",
-            "url": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0/resolve/main/sd_xl_base_1.0.safetensors",
-            "filename": "SDXL.safetensors",
-            "dest_dir": "models/checkpoints",
-            "info": "Official SDXL base checkpoint",
-            "required": False
-        },
-        {
-            "display_title": "DreamShaper (SD1.5)",
-            "name": "SD1.5_DreamShaper.safetensors",
-            "source_page": "https://civitai.com/models/128713/dreamshaper",
-            "url": "https://civitai.com/api/download/models/128713",
-            "filename": "SD1.5_DreamShaper.safetensors",
-            "dest_dir": "models/checkpoints",
-            "info": "DreamShaper SD1.5 variant",
-            "required": False
-        },
-        {
-            "display_title": "Pony Diffusion V6 XL",
-            "name": "Pony_Diffusion_V6_XL.safetensors",
-            "source_page": "https://civitai.com/models/290640/pony-diffusion-v6-xl",
-            "url": "https://civitai.com/api/download/models/290640?type=Model&format=SafeTensor&size=pruned&fp=fp16",
-            "filename": "Pony_Diffusion_V6_XL.safetensors",
-            "dest_dir": "models/checkpoints",
-            "info": "Pony Diffusion V6 XL - Versatile SDXL",
-            "required": False
-        }
-    ],
-
-    "loras": [
-        {"name": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "url": "https://civitai.com/api/download/models/145907", "filename": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "dest_dir": "models/loras", "info": "Detailed eyes LoRA", "required": False},
-        {"name": "SDXL_Pop_Art_Style.safetensors", "url": "https://civitai.com/api/download/models/192584", "filename": "SDXL_Pop_Art_Style.safetensors", "dest_dir": "models/loras", "info": "SDXL Pop Art LoRA", "required": False},
-        {"name": "Illustrious_USNR_Style.safetensors", "url": "https://civitai.com/api/download/models/959419", "filename": "Illustrious_USNR_Style.safetensors", "dest_dir": "models/loras", "info": "Illustrious style LoRA", "required": False}
-    ],
-
-    "embeddings": [
-        {"name": "EasyNegative.pt", "url": "https://civitai.com/api/download/models/9208?type=Model&format=SafeTensor&size=full&fp=fp16", "filename": "EasyNegative.pt", "dest_dir": "models/embeddings", "info": "EasyNegative embedding", "required": False},
-        {"name": "PositivePrompts.pt", "url": "https://example.com/positiveprompts.pt", "filename": "PositivePrompts.pt", "dest_dir": "models/embeddings", "info": "Positive prompt embeddings", "required": False},
-        {"name": "StyleEmbedding.pt", "url": "https://example.com/styleembedding.pt", "filename": "StyleEmbedding.pt", "dest_dir": "models/embeddings", "info": "Style embedding pack", "required": False}
-    ],
-
-    "clip_models": [
-        {"name": "clip_l.safetensors", "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/clip_l.safetensors?download=true", "filename": "clip_l.safetensors", "dest_dir": "models/clip", "info": "Flux clip_l encoder", "required": False},
-        {"name": "clip_g.safetensors", "url": "https://huggingface.co/calcuis/sd3.5-large-gguf/resolve/main/clip_g.safetensors?download=true", "filename": "clip_g.safetensors", "dest_dir": "models/clip", "info": "Large CLIP G encoder", "required": False},
-        {"name": "t5xxl_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp16.safetensors?download=true", "filename": "t5xxl_fp16.safetensors", "dest_dir": "models/clip", "info": "T5 encoder", "required": False}
-    ],
-
-    "clip_vision_models": [
-        {"name": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors", "url": "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors", "filename": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors", "dest_dir": "models/clip_vision", "info": "CLIP ViT-H encoder", "required": False},
-        {"name": "clip_vision_h.safetensors", "url": "https://huggingface.co/Comfy-Org/Wan_2.1_ComfyUI_repackaged/resolve/main/split_files/clip_vision/clip_vision_h.safetensors?download=true", "filename": "clip_vision_h.safetensors", "dest_dir": "models/clip_vision", "info": "Comfy repackaged clip_vision_h", "required": False},
-        {"name": "sigclip_vision_patch14_384.safetensors", "url": "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors?download=true", "filename": "sigclip_vision_patch14_384.safetensors", "dest_dir": "models/clip_vision", "info": "SigCLIP vision model", "required": False}
-    ],
-
-    "vae_models": [
-        {"name": "SDXL_Vae.safetensors", "url": "https://huggingface.co/stabilityai/sdxl-vae/resolve/main/sdxl_vae.safetensors?download=true", "filename": "SDXL_Vae.safetensors", "dest_dir": "models/vae", "info": "Official SDXL VAE", "required": False},
-        {"name": "ae.safetensors", "url": "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged/resolve/main/split_files/vae/ae.safetensors?download=true", "filename": "ae.safetensors", "dest_dir": "models/vae", "info": "Lumina ae VAE", "required": False},
-        {"name": "VAE_MSE.safetensors", "url": "https://huggingface.co/stabilityai/sd-vae-ft-mse-original/resolve/main/vae.safetensors?download=true", "filename": "VAE_MSE.safetensors", "dest_dir": "models/vae", "info": "High quality VAE", "required": False}
-    ],
-
-    "controlnet_models": [
-        {"name": "FLUX.1-dev-Controlnet-Union.safetensors", "url": "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union/resolve/main/diffusion_pytorch_model.safetensors", "filename": "FLUX.1-dev-Controlnet-Union.safetensors", "dest_dir": "models/controlnet", "info": "FLUX dev ControlNet union", "required": False},
-        {"name": "control_v11p_sd15_inpaint_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors", "filename": "control_v11p_sd15_inpaint_fp16.safetensors", "dest_dir": "models/controlnet", "info": "ControlNet inpaint model", "required": False},
-        {"name": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "filename": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "dest_dir": "models/controlnet", "info": "Control Lora", "required": False}
-    ],
-
-    "upscale_models": [
-        {"name": "RealESRGAN_x4plus.pth", "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth", "filename": "RealESRGAN_x4plus.pth", "dest_dir": "models/upscale_models", "info": "Real-ESRGAN x4", "required": False},
-        {"name": "4x-UltraSharp.safetensors", "url": "https://civitai.com/api/download/models/125843", "filename": "4x-UltraSharp.safetensors", "dest_dir": "models/upscale_models", "info": "Ultra sharp upscaler", "required": False},
-        {"name": "OmniSR_X2_DIV2K.safetensors", "url": "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X2_DIV2K.safetensors", "filename": "OmniSR_X2_DIV2K.safetensors", "dest_dir": "models/upscale_models", "info": "OmniSR X2", "required": False}
-    ],
-
-    "additional_downloads": [
-        {"name": "uso-flux1-projector-v1.safetensors", "url": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/model_patches/uso-flux1-projector-v1.safetensors", "filename": "uso-flux1-projector-v1.safetensors", "dest_dir": "models/model_patches", "info": "Projector patch", "required": False},
-        {"name": "Flux_Redux.safetensors", "url": "https://civitai.com/api/download/models/1086258", "filename": "Flux_Redux.safetensors", "dest_dir": "models/style_models", "info": "Flux Redux", "required": False},
-        {"name": "Extra_Packs.zip", "url": "https://example.com/extra_packs.zip", "filename": "Extra_Packs.zip", "dest_dir": "workspace/downloads", "info": "Extra utilities pack", "required": False}
-    ],
-
-    "images_downloads": [
-        {"name": "Image Processing Tools", "url": "https://example.com/image_tools.zip", "info": "Tools for image manipulation", "required": False},
-        {"name": "Image Enhancement Models", "url": "https://example.com/image_enhance.zip", "info": "Enhancement pack", "required": False},
-        {"name": "Image Converters", "url": "https://example.com/image_converters.zip", "info": "Format converters", "required": False}
-    ],
-
-    "videos_downloads": [
-        {"name": "Video Processing Tools", "url": "https://example.com/video_tools.zip", "info": "Video utilities", "required": False},
-        {"name": "Animation Tools", "url": "https://example.com/animation_tools.zip", "info": "Animation pack", "required": False},
-        {"name": "Video Codecs", "url": "https://example.com/codecs.zip", "info": "Codec pack", "required": False}
-    ],
-
-    "audio_downloads": [
-        {"name": "Audio Processing Libraries", "url": "https://example.com/audio_libs.zip", "info": "Audio tools", "required": False},
-        {"name": "Audio Enhancement Tools", "url": "https://example.com/audio_enhance.zip", "info": "Audio enhancers", "required": False},
-        {"name": "Audio Converters", "url": "https://example.com/audio_conv.zip", "info": "Audio format converters", "required": False}
-    ],
-
-    "text_downloads": [
-        {"name": "Text Processing Tools", "url": "https://example.com/text_tools.zip", "info": "NLP utilities", "required": False},
-        {"name": "Font Collections", "url": "https://example.com/fonts.zip", "info": "Fonts pack", "required": False},
-        {"name": "Translation Tools", "url": "https://example.com/translate.zip", "info": "Translation utilities", "required": False}
-    ],
-
-    "code_downloads": [
-        {"name": "Development Tools", "url": "https://example.com/dev_tools.zip", "info": "Dev utilities", "required": False},
-        {"name": "Code Templates", "url": "https://example.com/templates.zip", "info": "Project templates", "required": False},
-        {"name": "Docs Generators", "url": "https://example.com/docs.zip", "info": "Doc generators", "required": False}
-    ]
+# Category lists come from the shared catalog built once from Library/Library.py
+# (cached until the file changes). The built-in copy in comfy_startup.fallback_library
+# is only imported when the Library cannot be read.
+_CATALOG_VARIABLES = {
+    "custom-nodes": "custom_nodes",
+    "checkpoints": "checkpoints",
+    "loras": "loras",
+    "embeddings": "embeddings",
+    "clip": "clip_models",
+    "clip-vision": "clip_vision_models",
+    "vae": "vae_models",
+    "controlnet": "controlnet_models",
+    "upscale": "upscale_models",
+    "additional": "additional_downloads",
 }
-
-# =============================================
-# END DOWNLOAD LIBRARY
-# =============================================
+try:
+    DOWNLOAD_CATALOG = catalog.load_catalog()
+    # size/VRAM/sha256 resolved offline by `python -m comfy_startup.catalog_meta refresh`
+    CATALOG_META = catalog_meta.load_meta()
+    DOWNLOAD_LIBRARY = {
+        _CATALOG_VARIABLES[_ui_category]: catalog_meta.enrich_items(_items, CATALOG_META)
+        for _ui_category, _items in DOWNLOAD_CATALOG.ui_lists().items()
+        if _ui_category in _CATALOG_VARIABLES
+    }
+except (OSError, SyntaxError, ValueError) as e:
+    DOWNLOAD_CATALOG = None
+    CATALOG_META = {}
+    print(f"Library catalog unavailable ({e}); using the built-in download library")
+    from comfy_startup.fallback_library import DOWNLOAD_LIBRARY
+paint_timer.mark('catalog')
 
 # Map the library into runtime variables for backward compatibility with
-# the rest of the script. This allows a simple replacement of DOWNLOAD_LIBRARY
-# without touching the UI or download logic.
+# the rest of the script.
 custom_nodes = DOWNLOAD_LIBRARY.get("custom_nodes", [])
 checkpoints = DOWNLOAD_LIBRARY.get("checkpoints", [])
 loras = DOWNLOAD_LIBRARY.get("loras", [])
@@ -2309,19 +428,6 @@ category_data = {
     "code": code_downloads
 }
 
-# If subcategory maps were prepared earlier, apply them to the runtime variables
-try:
-    if 'checkpoints_subcategory_map' in globals() and checkpoints_subcategory_map:
-        checkpoints = checkpoints_subcategory_map
-except Exception:
-    pass
-
-try:
-    if 'loras_subcategory_map' in globals() and loras_subcategory_map:
-        loras = loras_subcategory_map
-except Exception:
-    pass
-
 # New media categories
 images_downloads = [
     {"name": "Image Processing Tools", "info": "Tools for image manipulation and processing", "required": False},
@@ -2398,6 +504,10 @@ button_states = {
 
 # Store actual toggle Button widgets so we can programmatically change them
 toggle_widgets = {key: {} for key in category_data.keys()}
+# Category id -> CatalogTable, when anywidget is installed and the category has been opened
+catalog_tables = {}
+# (category, subcategory, idx) -> row HBox, registered as rows are built so the search box can hide them
+toggle_rows = {}
 
 # Initialize toggle states
 for category_id, items in category_data.items():
@@ -2405,6 +515,45 @@ for category_id, items in category_data.items():
     for i, item in enumerate(items):
         toggle_states[category_id][i] = item.get('required', False)
 
+# Preset name -> (category, subcategory, idx) positions, compiled on first use
+preset_index = presets.PresetIndex(category_data)
+# Token/prefix index behind the search box, also compiled on first use
+catalog_search = search_index.SearchIndex(category_data)
+# Positions matching the current search, or None when the box is empty
+search_state = {'matches': None}
+
+# Restore the selection from the last install or download; only toggle_states changes, the rows pick it up when built
+profiles.apply_profile(profiles.load_profile(profiles.LAST_PROFILE), category_data, toggle_states, toggle_widgets)
+
+def save_last_profile():
+    """Remember the current selection for the next kernel (see `profiles`)."""
+    try:
+        profiles.save_profile(profiles.LAST_PROFILE, category_data, toggle_states)
+    except OSError as e:
+        logger.warning("Could not save the selection profile: %s", e)
+
+# Warm the shared Civitai metadata cache in the background; the UI only reads from it
+civitai_cache.prefetch([item.get('url') or item.get('download_url') or ''
+                        for items in category_data.values()
+                        for _, _, item in presets.iter_positions(items) if isinstance(item, dict)],
+                       token=load_api_key() or None)
+
+def plan_selection_for_pod(path='/workspace'):
+    """Fit the current toggles to this pod's GPU memory and free disk (see `selection_planner`)."""
+    return selection_planner.plan_selection(
+        selection_planner.wanted_positions(category_data, toggle_states), category_data,
+        selection_planner.detect_budget(path if os.path.isdir(path) else os.getcwd()),
+        comfy_dir=os.path.join(os.getcwd(), 'ComfyUI'), meta=CATALOG_META)
+
+
+def apply_preset(name, enabled):
+    """Apply a preset and warn when the resulting selection will not fit the pod."""
+    targets = presets.apply_preset(preset_index, name, enabled, toggle_states, toggle_widgets)
+    catalog_table.sync_tables(catalog_tables, {category for category, _, _ in targets})
+    if enabled:
+        for warning in plan_selection_for_pod().warnings:
+            print(f"⚠️ {warning}")
+
 # Ensure media categories have a reserved master toggle index (-1) initialized
 for media_cat in ('images','videos','audio','text','code'):
     if media_cat not in toggle_states:
@@ -2415,44 +564,47 @@ for media_cat in ('images','videos','audio','text','code'):
 # -----------------------------
 # Progress Update Function
 # -----------------------------
+# Worker threads publish here; one flusher writes the widgets at most 5 times a second
+ui_progress = progress_hub.ProgressHub(fps=5)
+
 def update_progress(percent):
     # Make the status and progress visible while preserving reserved layout space
-    progress_container.value = f"""
+    ui_progress.publish(progress_container, f"""
     <div style="display:flex; justify-content:center; margin-bottom:20px;">
         <div class="progress-container" style="display:block; visibility: visible;">
             <div class="progress-bar" style="width:{percent}%;"></div>
         </div>
     </div>
-    """
-    status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>is Installing...</div>"
+    """)
+    ui_progress.publish(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>is Installing...</div>")
 
 
 def update_download_progress(percent, message: str = 'Running downloads...'):
     """Update the download-only progress bar and its status text while preserving layout space.
     Shows both status text and progress bar for enhanced visual feedback."""
     # Update download status text
-    download_status_label.value = f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>"
+    ui_progress.publish(download_status_label, f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>")
     
     # Update download progress bar with enhanced styling
-    download_progress_container.value = f"""
+    ui_progress.publish(download_progress_container, f"""
     <div style="display:flex; justify-content:center; margin-bottom:20px;">
         <div class="download-progress-container" style="display:block; visibility: visible;">
             <div class="download-progress-bar" style="width:{percent}%;"></div>
         </div>
     </div>
-    """
+    """)
 
 
 def update_additional_downloads_progress(percent, message: str = 'Running additional downloads...'):
     """Update the additional-downloads-only progress bar and its status text while preserving layout space."""
-    additional_downloads_status_label.value = f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>"
-    additional_downloads_progress_container.value = f"""
+    ui_progress.publish(additional_downloads_status_label, f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>")
+    ui_progress.publish(additional_downloads_progress_container, f"""
     <div style="display:flex; justify-content:center; margin-bottom:20px;">
         <div class="additional-progress-container" style="display:block; visibility: visible;">
             <div class="additional-progress-bar" style="width:{percent}%;"></div>
         </div>
     </div>
-    """
+    """)
 
 # -----------------------------
 # Python-driven Toggle Widget (no JS bridge)
@@ -2463,16 +615,12 @@ def normalize_download_entries():
     - `display_title` is generated from `name` if missing (underscores -> spaces).
     - `source_page` is inferred from `url`/`download_url` via `get_civitai_model_url()` when possible.
     """
-    list_names = [
-        'custom_nodes', 'checkpoints', 'extra_checkpoints', 'loras',
-        'controlnet_models', 'upscale_models', 'vae_models', 'clip_models', 'clip_vision_models'
-    ]
-    for lname in list_names:
-        items = globals().get(lname)
+    for items in category_data.values():
         if not isinstance(items, list):
             continue
         for item in items:
-            if not isinstance(item, dict):
+            # Catalog entries already carry both fields
+            if not isinstance(item, dict) or 'catalog_id' in item:
                 continue
             # display_title fallback
             if 'display_title' not in item or not item.get('display_title'):
@@ -2633,6 +781,12 @@ def create_toggle_widget(category_id, item_id, item, subcategory=None):
         if 'item-row' not in getattr(row, '_dom_classes', []):
             row._dom_classes = getattr(row, '_dom_classes', []) + ['item-row']
 
+    # Rows built while a search is active start out filtered
+    position = (category_id, subcategory or None, item_id)
+    toggle_rows[position] = row
+    if search_state['matches'] is not None and position not in search_state['matches']:
+        row.layout.display = 'none'
+
     return row
 
 # Helper to enable/disable comprehensive standard installation
@@ -2641,71 +795,9 @@ def set_standard_installation(enabled: bool):
     Includes all checkpoints, upscale models, controlnet models, VAE models, 
     CLIP models, CLIP Vision models as specified in requirements.
     This updates both the `toggle_states` dict and the visual button classes in `toggle_widgets`.
+    The selection itself lives in `presets.PRESETS['standard']`.
     """
-    
-    def update_toggle_visual(category, idx, enabled):
-        """Helper to update visual state of a toggle button"""
-        btn = toggle_widgets.get(category, {}).get(idx)
-        if btn is not None:
-            try:
-                if enabled:
-                    btn.add_class('active')
-                else:
-                    btn.remove_class('active')
-            except Exception:
-                if not hasattr(btn, '_dom_classes'):
-                    try:
-                        btn._dom_classes = []
-                    except Exception:
-                        pass
-                if enabled and 'active' not in getattr(btn, '_dom_classes', []):
-                    btn._dom_classes = getattr(btn, '_dom_classes', []) + ['active']
-                if not enabled and 'active' in getattr(btn, '_dom_classes', []):
-                    btn._dom_classes = [c for c in getattr(btn, '_dom_classes', []) if c != 'active']
-    
-    # 1. Toggle ALL custom nodes
-    for idx in range(len(custom_nodes)):
-        toggle_states.setdefault('custom-nodes', {})[idx] = bool(enabled)
-        update_toggle_visual('custom-nodes', idx, enabled)
-    
-    # 2. Toggle specific essential checkpoints
-    essential_checkpoints = ['flux1-dev-fp8', 'Flux_Fill', 'SDXL_WildCard', 'SD1.5_Epic_Realism']
-    for idx, cp in enumerate(checkpoints):
-        name = (cp.get('name') or '').lower()
-        fname = (cp.get('filename') or '').lower()
-        
-        # Check if this checkpoint is in our essential list
-        is_essential = any(essential.lower() in name or essential.lower() in fname 
-                          for essential in essential_checkpoints)
-        
-        if is_essential:
-            toggle_states.setdefault('checkpoints', {})[idx] = bool(enabled)
-            update_toggle_visual('checkpoints', idx, enabled)
-    
-    # 3. Toggle ALL upscale models
-    for idx in range(len(upscale_models)):
-        toggle_states.setdefault('upscale', {})[idx] = bool(enabled)
-        update_toggle_visual('upscale', idx, enabled)
-    
-    # 4. Toggle ALL controlnet models  
-    for idx in range(len(controlnet_models)):
-        toggle_states.setdefault('controlnet', {})[idx] = bool(enabled)
-        update_toggle_visual('controlnet', idx, enabled)
-    
-    # 5. Toggle ALL VAE models
-    for idx in range(len(vae_models)):
-        toggle_states.setdefault('vae', {})[idx] = bool(enabled)
-        update_toggle_visual('vae', idx, enabled)
-    
-    # 6. Toggle ALL CLIP models
-    for idx in range(len(clip_models)):
-        toggle_states.setdefault('clip', {})[idx] = bool(enabled)
-        update_toggle_visual('clip', idx, enabled)
-    
-    # 7. Toggle ALL CLIP Vision models
-    for idx in range(len(clip_vision_models)):
-        toggle_states.setdefault('clip-vision', {})[idx] = bool(enabled)
-        update_toggle_visual('clip-vision', idx, enabled)
+    apply_preset('standard', enabled)
 
 # -----------------------------
 # Startup Function
@@ -2719,37 +811,71 @@ def startup_comfyui(b):
         b.disabled = True
 
         # Make status placeholder visible with text
-        status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Installing ComfyUI...</div>"
+        ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Installing ComfyUI...</div>")
+        save_last_profile()
 
         def run_installation():
             import subprocess
             import os
-
-            def run_cmd(cmd, cwd=None):
+            # Install-only helpers load when an install starts, not while the cell renders
+            from comfy_startup import bytecompile, model_aliases, node_index, node_profiler, torch_env, workflow_plan
+            from comfy_startup.install_graph import FAILED, InstallGraph
+            from comfy_startup.phase_stamps import PhaseStamps, file_digest, fingerprint, git_head, venv_fingerprint
+
+            def run_cmd(cmd, cwd=None, timeout=300):
+                # Raise on failure so InstallGraph skips every task that depends on this one.
+                # pip phases pass timeout=None: a cold torch wheel download can take well over 5 minutes
                 try:
-                    result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True, timeout=300)
-                    return result.returncode == 0
+                    result = subprocess.run(cmd, shell=True, cwd=cwd, capture_output=True, text=True, timeout=timeout)
                 except subprocess.TimeoutExpired:
-                    return False
-                except Exception:
-                    return False
+                    raise RuntimeError(f"Timed out after {timeout}s: {cmd[:100]}")
+                if result.returncode != 0:
+                    tail = " ".join((result.stderr or result.stdout or "").strip().splitlines()[-3:])
+                    raise RuntimeError(f"Exit status {result.returncode}: {cmd[:100]}: {tail}")
+                return True
 
-            # Clone primary repository sequentially to prepare workspace
+            # The install runs as a dependency graph: torch and requirements install
+            # while models download, and node clones overlap the venv build.
             repo_url = "https://github.com/comfyanonymous/ComfyUI.git"
             update_progress(5)
-            run_cmd(f"git clone {repo_url}")
+            torch_plan = {}
+            # Completion stamps let a warm restart skip pip phases whose inputs are unchanged
+            stamps = PhaseStamps(".install_stamps")
+
+            def torch_fingerprint():
+                return fingerprint(torch_plan, venv_fingerprint("ComfyUI/venv"))
+
+            def clone_core():
+                if not os.path.isdir(os.path.join("ComfyUI", ".git")):
+                    run_cmd(f"git clone {repo_url}")
+                # Ensure directories exist for custom nodes and models
+                run_cmd("mkdir -p custom_nodes", cwd="ComfyUI")
+                run_cmd("mkdir -p models/checkpoints", cwd="ComfyUI")
+
+            def detect_torch():
+                # When the image already ships a CUDA-matched torch the venv overlays
+                # system site-packages so that build is reused instead of downloaded again
+                try:
+                    torch_plan.update(torch_env.plan_torch_setup())
+                except Exception:
+                    logging.getLogger(__name__).exception("Torch detection failed; installing into venv")
+
+            def create_venv():
+                if not os.path.exists(os.path.join("ComfyUI", "venv", "pyvenv.cfg")):
+                    run_cmd(torch_env.venv_command(torch_plan or None), cwd="ComfyUI")
+                elif torch_plan.get('reuse_system_torch'):
+                    torch_env.enable_system_site_packages(os.path.join("ComfyUI", "venv"))
+                stamps.run('pip_upgrade', venv_fingerprint("ComfyUI/venv"),
+                           run_cmd, "venv/bin/pip install --upgrade pip", cwd="ComfyUI", timeout=None)
 
-            # Create virtualenv and basic setup sequentially
-            update_progress(15)
-            run_cmd("python3 -m venv venv", cwd="ComfyUI")
-            update_progress(25)
-            run_cmd("venv/bin/pip install --upgrade pip", cwd="ComfyUI")
-            update_progress(35)
-            # Defer heavy package installs until after downloads/clones
+            def install_torch():
+                torch_cmd = torch_env.torch_install_command("venv/bin/pip", torch_plan or None)
+                if torch_cmd:
+                    stamps.run('torch', torch_fingerprint(), run_cmd, torch_cmd, cwd="ComfyUI", timeout=None)
 
-            # Ensure directories exist for custom nodes and models
-            run_cmd("mkdir -p custom_nodes", cwd="ComfyUI")
-            run_cmd("mkdir -p models/checkpoints", cwd="ComfyUI")
+            def install_requirements():
+                stamps.run('requirements', fingerprint(file_digest("ComfyUI/requirements.txt"), torch_fingerprint()),
+                           run_cmd, "venv/bin/pip install -r requirements.txt", cwd="ComfyUI", timeout=None)
 
             # Build clone tasks for selected custom nodes
             clone_tasks = []
@@ -2765,40 +891,6 @@ def startup_comfyui(b):
             download_tasks = []
             token = get_civitai_token() or None
 
-            def clean_data_structures():
-                """Normalize download lists so callers can accept strings, dicts, or nested subcategory maps.
-
-                - Converts simple string entries to dicts with 'url' keys.
-                - Leaves dict entries alone.
-                - If a category is a dict (subcategory map), normalize each list under it.
-                """
-                def _normalize(coll):
-                    if isinstance(coll, dict):
-                        for k, v in list(coll.items()):
-                            coll[k] = _normalize(v)
-                        return coll
-                    if isinstance(coll, list):
-                        out = []
-                        for it in coll:
-                            if isinstance(it, str):
-                                out.append({'url': it})
-                            elif isinstance(it, dict):
-                                out.append(it)
-                            else:
-                                # unsupported type, skip
-                                continue
-                        return out
-                    return []
-
-                # Normalize all known download collections in-place
-                for name in ['additional_downloads', 'checkpoints', 'loras', 'embeddings', 'clip_models', 'clip_vision_models', 'vae_models', 'controlnet_models', 'upscale_models', 'images_downloads', 'videos_downloads', 'audio_downloads', 'text_downloads', 'code_downloads']:
-                    try:
-                        val = globals().get(name)
-                        if val is not None:
-                            globals()[name] = _normalize(val)
-                    except Exception:
-                        pass
-
             def add_item_downloads(items, category_name):
                 """Safely walk items and subcategory maps to collect download tasks.
 
@@ -2832,7 +924,7 @@ def startup_comfyui(b):
                                 os.makedirs(full_dest, exist_ok=True)
                             except Exception:
                                 pass
-                            download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name')})
+                            download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name'), 'sha256': item.get('sha256')})
                 else:
                     for idx, item in enumerate(items or []):
                         # Respect required flag or user selection
@@ -2852,59 +944,137 @@ def startup_comfyui(b):
                             os.makedirs(full_dest, exist_ok=True)
                         except Exception:
                             pass
-                        download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name')})
-
-            # Normalize data structures first
-            try:
-                clean_data_structures()
-            except Exception:
-                pass
-
-            add_item_downloads(additional_downloads, 'additional')
-            add_item_downloads(checkpoints, 'checkpoints')
-            add_item_downloads(loras, 'loras')
-            add_item_downloads(embeddings, 'embeddings')
-            add_item_downloads(clip_models, 'clip')
-            add_item_downloads(clip_vision_models, 'clip-vision')
-            add_item_downloads(vae_models, 'vae')
-            add_item_downloads(controlnet_models, 'controlnet')
-            add_item_downloads(upscale_models, 'upscale')
-            # Include media categories
-            add_item_downloads(images_downloads, 'images')
-            add_item_downloads(videos_downloads, 'videos')
-            add_item_downloads(audio_downloads, 'audio')
-            add_item_downloads(text_downloads, 'text')
-            add_item_downloads(code_downloads, 'code')
-
-            update_progress(50)
-
-            # Run downloads and clones in parallel
-            try:
-                dl_results, cl_results = run_parallel_downloads(download_tasks, clone_tasks, progress_callback=update_progress)
-            except Exception as e:
-                logging.getLogger(__name__).exception("Parallel tasks failed: %s", e)
-                dl_results, cl_results = [], []
-
-                # Image monitoring removed: using static clickable HTML preview widgets instead
+                        download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name'), 'sha256': item.get('sha256')})
+
+            def plan_downloads():
+                # Runs after the core clone: task building creates model directories,
+                # which would otherwise make `git clone` refuse a non-empty target.
+
+                # Drop whatever cannot fit this pod's GPU or volume before anything downloads
+                budget_plan = plan_selection_for_pod()
+                changed = selection_planner.apply_selection(budget_plan, toggle_states)
+                presets.sync_widgets(changed, toggle_states, toggle_widgets)
+                catalog_table.sync_tables(catalog_tables, {category for category, _, _ in changed})
+                for warning in budget_plan.warnings:
+                    logging.getLogger(__name__).warning(warning)
+                if budget_plan.dropped:
+                    import html
+                    reasons = "".join(f"<li>{html.escape(reason)}</li>" for _, reason in budget_plan.dropped)
+                    ui_progress.set(selection_notice, "<div class='selection-notice'>Not downloading on this pod:"
+                                                      f"<ul>{reasons}</ul></div>")
+                else:
+                    ui_progress.set(selection_notice, "")
+
+                add_item_downloads(additional_downloads, 'additional')
+                add_item_downloads(checkpoints, 'checkpoints')
+                add_item_downloads(loras, 'loras')
+                add_item_downloads(embeddings, 'embeddings')
+                add_item_downloads(clip_models, 'clip')
+                add_item_downloads(clip_vision_models, 'clip-vision')
+                add_item_downloads(vae_models, 'vae')
+                add_item_downloads(controlnet_models, 'controlnet')
+                add_item_downloads(upscale_models, 'upscale')
+                # Include media categories
+                add_item_downloads(images_downloads, 'images')
+                add_item_downloads(videos_downloads, 'videos')
+                add_item_downloads(audio_downloads, 'audio')
+                add_item_downloads(text_downloads, 'text')
+                add_item_downloads(code_downloads, 'code')
+
+                if ACTIVE_WORKFLOWS:
+                    # Add whatever the served workflows reference on top of the manual selection
+                    workflow_tasks, unresolved = workflow_plan.plan_downloads(
+                        ACTIVE_WORKFLOWS, DOWNLOAD_CATALOG or category_data, os.path.join(os.getcwd(), 'ComfyUI'), token=token)
+                    planned = {task['dest_path'] for task in download_tasks}
+                    download_tasks.extend(t for t in workflow_tasks if t['dest_path'] not in planned)
+                    for ref in unresolved:
+                        logging.getLogger(__name__).warning(
+                            "Workflow model not in catalog: %s (%s)", ref.filename, ref.node_type)
+
+            def run_downloads():
+                try:
+                    run_parallel_downloads(download_tasks, [])
+                except Exception as e:
+                    logging.getLogger(__name__).exception("Parallel downloads failed: %s", e)
 
-            update_progress(80)
+            def clone_nodes():
+                # Clone only; node requirements need the venv and torch in place first
+                try:
+                    run_parallel_downloads([], clone_tasks, install_requirements=False)
+                except Exception as e:
+                    logging.getLogger(__name__).exception("Parallel clones failed: %s", e)
+
+            def install_node_requirements():
+                req_files = []
+                for task in clone_tasks:
+                    req_path = os.path.join(task['dest_path'], task['name'], 'requirements.txt')
+                    if os.path.exists(req_path):
+                        req_files.append(req_path)
+                if req_files:
+                    node_inputs = [(git_head(os.path.dirname(r)), file_digest(r)) for r in req_files]
+                    # One resolver run for every node instead of one pip process per node
+                    stamps.run('node_requirements', fingerprint(node_inputs, torch_fingerprint()),
+                               run_cmd, "venv/bin/pip install " + " ".join(f'-r "{r}"' for r in req_files), cwd="ComfyUI",
+                               timeout=None)
+
+            def compile_sources():
+                # Write .pyc files now so the first launch imports as fast as later ones
+                bytecompile.byte_compile("ComfyUI", os.path.abspath("ComfyUI/venv/bin/python"), stamps=stamps)
+
+            def select_workflow_nodes():
+                if ACTIVE_WORKFLOWS:
+                    node_index.enable_for_workflows("ComfyUI", os.path.abspath("ComfyUI/venv/bin/python"),
+                                                    [os.path.abspath(p) for p in ACTIVE_WORKFLOWS])
+                else:
+                    node_index.restore_all(os.path.join("ComfyUI", "custom_nodes"))
 
-            # After downloads/clones, install remaining python deps and torch
-            run_cmd("venv/bin/pip install torch torchvision torchaudio --index-url https://download.pytorch.org/whl/cu121", cwd="ComfyUI")
-            run_cmd("venv/bin/pip install -r requirements.txt", cwd="ComfyUI")
+            def link_model_aliases():
+                # Workflows may name a model we already have under another filename
+                if ACTIVE_WORKFLOWS:
+                    model_aliases.link_workflow_aliases(ACTIVE_WORKFLOWS, DOWNLOAD_CATALOG or category_data, "ComfyUI")
 
-            update_progress(95)
+            def launch_comfyui():
+                try:
+                    cmd = node_profiler.launch_command("venv/bin/python", ["--listen", "--port", "8188"],
+                                                       profile=PROFILE_NODE_IMPORTS)
+                    subprocess.Popen(cmd, cwd="ComfyUI", stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    comfyui_monitor.poke()
+                    if PROFILE_NODE_IMPORTS:
+                        logging.getLogger(__name__).info(
+                            "Profiling custom node imports; see `python %s report ComfyUI/%s`",
+                            node_profiler.__file__, node_profiler.DEFAULT_OUTPUT)
+                except Exception:
+                    pass
 
-            # Start ComfyUI
-            try:
-                subprocess.Popen(["venv/bin/python", "main.py", "--listen", "--port", "8188"], cwd="ComfyUI", stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            except Exception:
-                pass
+            graph = InstallGraph()
+            graph.add('clone_core', clone_core, label='Clone ComfyUI')
+            graph.add('detect_torch', detect_torch, label='Detect system torch')
+            graph.add('venv', create_venv, deps=['clone_core', 'detect_torch'], label='Create venv')
+            graph.add('torch', install_torch, deps=['venv'], weight=3, label='Install torch')
+            graph.add('requirements', install_requirements, deps=['torch'], weight=2, label='ComfyUI requirements')
+            graph.add('plan_downloads', plan_downloads, deps=['clone_core'], label='Plan downloads')
+            graph.add('downloads', run_downloads, deps=['plan_downloads'], weight=6, label='Model downloads')
+            graph.add('clone_nodes', clone_nodes, deps=['clone_core'], weight=2, label='Clone custom nodes')
+            graph.add('node_requirements', install_node_requirements, deps=['clone_nodes', 'requirements'], weight=2, label='Custom node requirements')
+            graph.add('workflow_nodes', select_workflow_nodes, deps=['node_requirements'], label='Workflow node selection')
+            # Compile after packs are parked so compileall never walks a directory mid-move
+            graph.add('bytecompile', compile_sources, deps=['workflow_nodes'], weight=2, label='Byte-compile sources')
+            graph.add('model_aliases', link_model_aliases, deps=['downloads'], label='Model aliases')
+            graph.add('launch', launch_comfyui, deps=['bytecompile', 'model_aliases'], label='Start ComfyUI')
+            graph.run(progress_callback=lambda pct: update_progress(max(5, pct)))
+            logging.getLogger(__name__).info("%s", graph.report())
 
             update_progress(100)
 
             # Update visible status and re-enable button
-            status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>is up and running!</div>"
+            failed = [task for task in graph.tasks.values() if task.status == FAILED]
+            if failed:
+                for task in failed:
+                    print(f"❌ {task.label} failed: {task.error}")
+                ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>"
+                                f"Install failed: {', '.join(task.label for task in failed)}</div>")
+            else:
+                ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>is up and running!</div>")
             b.disabled = False
 
         t = threading.Thread(target=run_installation, daemon=True)
@@ -2934,16 +1104,39 @@ def startup_comfyui(b):
 # Create Category Widgets with Custom HTML
 # -----------------------------
 def create_category_widget(category_id, label, items):
+    # Rows are built on first expand; until then the body is one empty placeholder,
+    # so the cell renders without syncing a Button+HTML pair per catalog item.
+    content_box = widgets.VBox([], layout=widgets.Layout(display='none'))
+
+    def build_rows():
+        if catalog_table.AVAILABLE:
+            # One virtualized table widget for the whole category instead of a row per item
+            catalog_tables[category_id] = catalog_table.CatalogTable(
+                category_id, items, toggle_states, link_for=get_civitai_model_url)
+            catalog_tables[category_id].show_only(search_state['matches'])
+            return [catalog_tables[category_id]]
+        rows = []
+        # If items is a dict, treat as subcategories mapping name->list
+        if isinstance(items, dict):
+            for sub_name, sub_items in items.items():
+                rows.append(create_subcategory_widget(category_id, sub_name, sub_items))
+        else:
+            for i, item in enumerate(items):
+                rows.append(create_toggle_widget(category_id, i, item))
+        return rows
+
     # Create toggle button
     def toggle_category_func(b):
         category_expanded[category_id] = not category_expanded[category_id]
         
         if category_expanded[category_id]:
+            if not content_box.children:
+                content_box.children = tuple(build_rows())
             b.description = f"▲ {label}"
-            category_containers[category_id].children[1].layout.display = 'block'
+            content_box.layout.display = 'block'
         else:
             b.description = f"▼ {label}"
-            category_containers[category_id].children[1].layout.display = 'none'
+            content_box.layout.display = 'none'
     
     button = widgets.Button(
         description=f"▼ {label}",
@@ -2952,51 +1145,35 @@ def create_category_widget(category_id, label, items):
         _dom_classes=['category-button']
     )
     button.on_click(toggle_category_func)
-    # Create content VBox composed of the python-driven toggle rows
-    rows = []
-    # If items is a dict, treat as subcategories mapping name->list
-    if isinstance(items, dict):
-        # For each subcategory, create an expandable subcontainer
-        for sub_name, sub_items in items.items():
-            # Subcategory header button
-            sub_button = widgets.Button(description=f"▼ {sub_name}", layout=widgets.Layout(width='240px', height='30px'), _dom_classes=['subcategory-button'])
-            sub_expanded = { 'val': False }
-
-            def make_toggle(sub_btn, sname, sitems):
-                def _toggle(b):
-                    sub_expanded['val'] = not sub_expanded['val']
-                    if sub_expanded['val']:
-                        sub_btn.description = f"▲ {sname}"
-                        # show child box
-                        sub_container.children[1].layout.display = 'block'
-                    else:
-                        sub_btn.description = f"▼ {sname}"
-                        sub_container.children[1].layout.display = 'none'
-                return _toggle
-
-            # Build rows for this subcategory
-            sub_rows = []
-            for si, sitem in enumerate(sub_items):
-                sub_rows.append(create_toggle_widget(category_id, si, sitem, subcategory=sub_name))
-
-            sub_box = widgets.VBox(sub_rows, layout=widgets.Layout(display='none'))
-            sub_container = widgets.VBox([sub_button, sub_box], layout=widgets.Layout(align_items='center', margin='4px 0px'))
-            sub_button.on_click(make_toggle(sub_button, sub_name, sub_items))
-            rows.append(sub_container)
-    else:
-        for i, item in enumerate(items):
-            row = create_toggle_widget(category_id, i, item)
-            rows.append(row)
-
-    content_box = widgets.VBox(rows, layout=widgets.Layout(display='none'))
-    # wrap in a container to match previous styling
-    content_html = widgets.VBox([widgets.HTML('<div class="item-container"></div>'), content_box], layout=widgets.Layout(display='none'))
     
     container = widgets.VBox([button, content_box], 
                            layout=widgets.Layout(align_items='center', margin='5px 0px'))
     
     return container
 
+def create_subcategory_widget(category_id, sub_name, sub_items):
+    # Expandable subcontainer whose rows are also built on first expand
+    sub_button = widgets.Button(description=f"▼ {sub_name}", layout=widgets.Layout(width='240px', height='30px'), _dom_classes=['subcategory-button'])
+    sub_box = widgets.VBox([], layout=widgets.Layout(display='none'))
+    sub_expanded = {'val': False}
+
+    def _toggle(b):
+        sub_expanded['val'] = not sub_expanded['val']
+        if sub_expanded['val']:
+            if not sub_box.children:
+                sub_box.children = tuple(
+                    create_toggle_widget(category_id, si, sitem, subcategory=sub_name)
+                    for si, sitem in enumerate(sub_items)
+                )
+            b.description = f"▲ {sub_name}"
+            sub_box.layout.display = 'block'
+        else:
+            b.description = f"▼ {sub_name}"
+            sub_box.layout.display = 'none'
+
+    sub_button.on_click(_toggle)
+    return widgets.VBox([sub_button, sub_box], layout=widgets.Layout(align_items='center', margin='4px 0px'))
+
 # Create startup button
 startup_btn = widgets.Button(
     description="Start Up", 
@@ -3027,42 +1204,42 @@ def model_dirs_exist():
 def reset_ui_state():
     """Reset UI elements to their initial state (hide progress bars and reset labels)"""
     try:
-        progress_container.value = """
+        ui_progress.set(progress_container, """
         <div style="display:flex; justify-content:center; margin-bottom:20px;">
             <div class="progress-container" style="display:block; visibility: hidden;">
                 <div class="progress-bar" style="width:0%;"></div>
             </div>
         </div>
-        """
+        """)
     except Exception:
         pass
 
     try:
-        download_progress_container.value = """
+        ui_progress.set(download_progress_container, """
         <div style="display:flex; justify-content:center; margin-bottom:20px;">
             <div class="download-progress-container" style="display:block; visibility: hidden;">
                 <div class="download-progress-bar" style="width:0%;"></div>
             </div>
         </div>
-        """
+        """)
     except Exception:
         pass
 
     try:
-        additional_downloads_progress_container.value = """
+        ui_progress.set(additional_downloads_progress_container, """
         <div style="display:flex; justify-content:center; margin-bottom:20px;">
             <div class="additional-progress-container" style="display:block; visibility: hidden;">
                 <div class="additional-progress-bar" style="width:0%;"></div>
             </div>
         </div>
-        """
+        """)
     except Exception:
         pass
 
     try:
-        status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
-        download_status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
-        additional_downloads_status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
+        ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
+        ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
+        ui_progress.set(additional_downloads_status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
     except Exception:
         pass
 
@@ -3117,6 +1294,8 @@ def terminate_running_processes():
             subprocess.run('pkill -f "git clone"', shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except Exception:
             pass
+        # Let the link disappear as soon as the server is gone
+        comfyui_monitor.poke()
     except Exception:
         logging.getLogger(__name__).exception('Error terminating processes')
 
@@ -3129,8 +1308,9 @@ def start_downloads_only(b):
         b.description = "Stop Downloads"
         b.disabled = True
         # show the main status placeholder (keep it hidden for installation) but enable download status
-        status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
-        download_status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Running downloads...</div>"
+        ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
+        ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Running downloads...</div>")
+        save_last_profile()
 
         def run_downloads():
             import os
@@ -3154,7 +1334,7 @@ def start_downloads_only(b):
                         os.makedirs(full_dest, exist_ok=True)
                     except Exception:
                         pass
-                    download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name')})
+                    download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name'), 'sha256': item.get('sha256')})
 
             add_items(additional_downloads, 'additional')
             add_items(checkpoints, 'checkpoints')
@@ -3175,22 +1355,22 @@ def start_downloads_only(b):
             try:
                 # Use the download-specific progress callback for downloads-only flow
                 dl_results, _ = run_parallel_downloads(download_tasks, [], progress_callback=update_download_progress)
-                download_status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Downloads completed.</div>"
+                ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Downloads completed.</div>")
                 # Leave the main install status hidden
             except Exception as e:
-                download_status_label.value = f"<div class='status-text' style='height: 26px; visibility: visible;'>Downloads failed: {e}</div>"
+                ui_progress.set(download_status_label, f"<div class='status-text' style='height: 26px; visibility: visible;'>Downloads failed: {e}</div>")
             finally:
                 # keep reserved space but hide progress bar (visibility hidden) after completion
-                download_progress_container.value = """
+                ui_progress.set(download_progress_container, """
                 <div style="display:flex; justify-content:center; margin-bottom:20px;">
                     <div class="progress-container" style="display:block; visibility: hidden;">
                         <div class="progress-bar" style="width:0%;"></div>
                     </div>
                 </div>
-                """
+                """)
                 # keep the status text visible for a short while and then revert to hidden placeholder
                 time.sleep(1.0)
-                download_status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
+                ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
                 b.disabled = False
 
         t = threading.Thread(target=run_downloads, daemon=True)
@@ -3229,8 +1409,9 @@ def toggle_advanced(b):
             civitai_input_row.layout.display = 'flex'
         except Exception:
             pass
-        for container in category_containers.values():
-            container.layout.display = 'flex'
+        for category_id, container in category_containers.items():
+            container.layout.display = category_display(category_id)
+        build_preset_sections()
         downloads_container.layout.display = 'flex'
     else:
         b.description = "▼"
@@ -3254,6 +1435,28 @@ advanced_toggle_button.on_click(toggle_advanced)
 # Create all category containers using standard category widget pattern
 category_containers = {}
 
+def category_display(category_id):
+    """Layout display for a category container: hidden when a search has no hits in it."""
+    matches = search_state['matches']
+    if matches is None or any(category == category_id for category, _, _ in matches):
+        return 'flex'
+    return 'none'
+
+def apply_search_filter(query):
+    """Show only the rows matching `query`; only rows whose visibility changes are sent."""
+    matches = search_state['matches'] = catalog_search.search(query)
+    for position, row in toggle_rows.items():
+        display = None if matches is None or position in matches else 'none'
+        if row.layout.display != display:
+            row.layout.display = display
+    for table in catalog_tables.values():
+        table.show_only(matches)
+    if expanded_state:
+        for category_id, container in category_containers.items():
+            display = category_display(category_id)
+            if container.layout.display != display:
+                container.layout.display = display
+
 # Reusable helper: zip ComfyUI output directory to a destination path
 def _zip_output_and_save(dest_path, progress_callback=None):
     import zipfile, time
@@ -3354,14 +1557,12 @@ civitai_label = widgets.HTML(value='<span class="civitai-label">CivitAI Token:</
 # Re-create the token input widget to be consistent with the new layout width
 # civitai token input widget
 civitai_token_widget = widgets.Text(
-    value='',
+    value=load_api_key(),
     placeholder='Enter your CivitAI API token',
     layout=widgets.Layout(width='320px', height='36px')
 )
 # Register observer to save changes
 civitai_token_widget.observe(save_key_on_change, names='value')
-# Register observer to save changes
-civitai_token_widget.observe(save_key_on_change, names='value')
 
 # Compose the inner row: left link and right input packed inside the pill container
 # Create a left link element that matches the requested design and an input on the right
@@ -3437,24 +1638,9 @@ def _make_media_toggle(label_text, category_key):
         # update stored state for the master position
         toggle_states[category_key][-1] = new_state
 
-        # set all item toggles in this category to new_state (respecting required items)
-        items = category_data.get(category_key, [])
-        for i in range(len(items)):
-            toggle_states.setdefault(category_key, {})[i] = bool(new_state or items[i].get('required', False))
-            # update visual button if present
-            btn_local = toggle_widgets.get(category_key, {}).get(i)
-            if btn_local is not None:
-                try:
-                    if new_state:
-                        btn_local.add_class('active')
-                    else:
-                        btn_local.remove_class('active')
-                except Exception:
-                    # fallback for old ipywidgets which use _dom_classes
-                    if new_state and 'active' not in getattr(btn_local, '_dom_classes', []):
-                        btn_local._dom_classes = getattr(btn_local, '_dom_classes', []) + ['active']
-                    if not new_state and 'active' in getattr(btn_local, '_dom_classes', []):
-                        btn_local._dom_classes = [c for c in getattr(btn_local, '_dom_classes', []) if c != 'active']
+        # set all item toggles in this category to new_state (respecting required items); only changed buttons are sent
+        presets.bulk_toggle(category_data, new_state, toggle_states, toggle_widgets, {category_key})
+        catalog_table.sync_tables(catalog_tables, {category_key})
 
     btn.on_click(_on_media_master_click)
 
@@ -3487,58 +1673,6 @@ media_toggles_row = widgets.HBox([
 # --- (duplicate import block removed) ---
 
 
-# -----------------------------
-# API Key File Management
-# -----------------------------
-def load_api_key():
-    """Read API key from workspace/Uploads/Civit Ai Key/CivitAi Api Key.txt
-    Returns the last line of the file (most recent key) or empty string if not found"""
-    try:
-        api_key_path = os.path.join('workspace', 'Uploads', 'Civit Ai Key', 'CivitAi Api Key.txt')
-        if os.path.exists(api_key_path):
-            with open(api_key_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                if lines:
-                    # Return the last non-empty line (most recent key)
-                    for line in reversed(lines):
-                        line = line.strip()
-                        if line:
-                            return line
-        return ""
-    except Exception as e:
-        logging.getLogger(__name__).exception("Error loading API key: %s", e)
-        return ""
-
-def save_api_key(key):
-    """Save API key to workspace/Uploads/Civit Ai Key/CivitAi Api Key.txt
-    Appends the key as a new line to maintain history"""
-    try:
-        if not key or not key.strip():
-            return
-        
-        api_key_dir = os.path.join('workspace', 'Uploads', 'Civit Ai Key')
-        api_key_path = os.path.join(api_key_dir, 'CivitAi Api Key.txt')
-        
-        # Create directory if it doesn't exist
-        os.makedirs(api_key_dir, exist_ok=True)
-        
-        # Append new key with timestamp comment
-        import datetime
-        timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        with open(api_key_path, 'a', encoding='utf-8') as f:
-            f.write(f"# Added {timestamp}\n{key.strip()}\n")
-            
-    except Exception as e:
-        logging.getLogger(__name__).exception("Error saving API key: %s", e)
-
-def save_key_on_change(change):
-    """Observer function to automatically save API key when changed"""
-    if change['type'] == 'change' and change['name'] == 'value':
-        new_value = change['new']
-        if new_value and new_value.strip():
-            save_api_key(new_value)
-
-
 # -----------------------------
 # Civitai helper functions
 # -----------------------------
@@ -3554,11 +1688,8 @@ def extract_civitai_model_id(url):
 
 
 def get_civitai_model_url(download_url):
-    """Convert download URL to model page URL"""
-    model_id = extract_civitai_model_id(download_url)
-    if model_id:
-        return f"https://civitai.com/models/{model_id}"
-    return None
+    """Convert download URL to model page URL (exact once the version is in the Civitai cache)"""
+    return civitai_cache.model_page_url(download_url)
 
 # -----------------------------
 # Environment Variables
@@ -3657,27 +1788,9 @@ all_label = widgets.HTML(value=f"""
 
 def set_all_downloads(enabled: bool):
     """Set all optional items across categories to enabled/disabled and update visuals."""
-    for cat, items in category_data.items():
-        # skip required-only categories? we still set states but respect 'required' fields
-        for idx in range(len(items)):
-            # respect required flag: if required, always True
-            if items[idx].get('required', False):
-                toggle_states.setdefault(cat, {})[idx] = True
-                continue
-            toggle_states.setdefault(cat, {})[idx] = bool(enabled)
-            # update visual button if present
-            btn = toggle_widgets.get(cat, {}).get(idx)
-            if btn is not None:
-                try:
-                    if enabled:
-                        btn.add_class('active')
-                    else:
-                        btn.remove_class('active')
-                except Exception:
-                    if enabled and 'active' not in btn._dom_classes:
-                        btn._dom_classes = btn._dom_classes + ['active']
-                    if not enabled and 'active' in btn._dom_classes:
-                        btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
+    # One diffed pass: required items stay on and buttons already in the right state send nothing
+    presets.bulk_toggle(category_data, enabled, toggle_states, toggle_widgets)
+    catalog_table.sync_tables(catalog_tables)
 
 def _on_all_toggle_click(b):
     all_downloads_state['enabled'] = not all_downloads_state['enabled']
@@ -3710,6 +1823,49 @@ except Exception:
     if 'item-row' not in all_downloads_row._dom_classes:
         all_downloads_row._dom_classes = all_downloads_row._dom_classes + ['item-row']
 
+# --- Saved selection profiles ---
+profile_dropdown = widgets.Dropdown(options=profiles.list_profiles(), layout=widgets.Layout(width='220px'))
+if user_settings.get('profile') in profile_dropdown.options:
+    profile_dropdown.value = user_settings.get('profile')
+profile_name_widget = widgets.Text(value='', placeholder='Profile name', layout=widgets.Layout(width='220px'))
+profile_load_btn = widgets.Button(description="Load", layout=widgets.Layout(width='90px', height='32px'),
+                                  _dom_classes=['homogenized-button', 'preserve-color'])
+profile_save_btn = widgets.Button(description="Save", layout=widgets.Layout(width='90px', height='32px'),
+                                  _dom_classes=['homogenized-button', 'preserve-color'])
+
+def _on_profile_load_click(b):
+    if not profile_dropdown.value:
+        return
+    user_settings.set('profile', profile_dropdown.value)
+    changed = profiles.apply_profile(profiles.load_profile(profile_dropdown.value), category_data, toggle_states, toggle_widgets)
+    catalog_table.sync_tables(catalog_tables, {category for category, _, _ in changed})
+
+def _on_profile_save_click(b):
+    name = profile_name_widget.value.strip() or profile_dropdown.value
+    if not name:
+        return
+    try:
+        saved = profiles.save_profile(name, category_data, toggle_states).stem
+    except OSError as e:
+        print(f"⚠️ Could not save profile {name}: {e}")
+        return
+    profile_dropdown.options = profiles.list_profiles()
+    profile_dropdown.value = saved
+    user_settings.set('profile', saved)
+    profile_name_widget.value = ''
+
+profile_load_btn.on_click(_on_profile_load_click)
+profile_save_btn.on_click(_on_profile_save_click)
+
+profiles_row = widgets.HBox([profile_dropdown, profile_load_btn, profile_name_widget, profile_save_btn],
+                            layout=widgets.Layout(align_items='center', gap='8px', margin='5px 0px'))
+
+# --- Catalog search (filters the category rows below as you type) ---
+search_widget = widgets.Text(value='', placeholder='Search models and nodes', continuous_update=True,
+                             layout=widgets.Layout(width='560px', height='36px'))
+search_widget.observe(lambda change: apply_search_filter(change['new']), names='value')
+search_row = widgets.HBox([search_widget], layout=widgets.Layout(justify_content='center', margin='5px 0px'))
+
 # --- Disney Animation Preset Toggle ---
 disney_preset_state = {'enabled': False}
 
@@ -3737,54 +1893,7 @@ disney_label = widgets.HTML(value="""
 
 def set_disney_preset(enabled: bool):
     """Set Disney Animation preset: all custom nodes + Pony Diffusion V6 XL + Disney LoRAs"""
-    # Enable all custom nodes
-    for idx in range(len(custom_nodes)):
-        toggle_states.setdefault('custom-nodes', {})[idx] = bool(enabled)
-        btn = toggle_widgets.get('custom-nodes', {}).get(idx)
-        if btn is not None:
-            try:
-                if enabled:
-                    btn.add_class('active')
-                else:
-                    btn.remove_class('active')
-            except Exception:
-                if enabled and 'active' not in btn._dom_classes:
-                    btn._dom_classes = btn._dom_classes + ['active']
-                if not enabled and 'active' in btn._dom_classes:
-                    btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
-
-    # Disney Animation specific items
-    disney_items = [
-        # Checkpoints
-        ('checkpoints', 'Pony_Diffusion_V6_XL.safetensors'),
-        # LoRAs
-        ('loras', 'Disney_Princess_XL_v2.0.safetensors'),
-        ('loras', 'ExpressiveH_Hentai_Style'),
-        ('loras', 'Vixons_Pony_Gothic_Neon_v1.0.safetensors'),
-        ('loras', 'Incase_Style_PonyXL_v3.0.safetensors'),
-        # Embeddings
-        ('embeddings', 'EasyNegative.pt'),
-        # Upscale
-        ('upscale', '4x_foolhardy_Remacri.pth'),
-    ]
-    
-    for category, item_name in disney_items:
-        items = category_data.get(category, [])
-        for idx, item in enumerate(items):
-            if item_name in item.get('name', '') or item_name in item.get('filename', ''):
-                toggle_states.setdefault(category, {})[idx] = bool(enabled)
-                btn = toggle_widgets.get(category, {}).get(idx)
-                if btn is not None:
-                    try:
-                        if enabled:
-                            btn.add_class('active')
-                        else:
-                            btn.remove_class('active')
-                    except Exception:
-                        if enabled and 'active' not in btn._dom_classes:
-                            btn._dom_classes = btn._dom_classes + ['active']
-                        if not enabled and 'active' in btn._dom_classes:
-                            btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
+    apply_preset('disney', enabled)
 
 def _on_disney_toggle_click(b):
     disney_preset_state['enabled'] = not disney_preset_state['enabled']
@@ -3853,14 +1962,7 @@ def show_clickable_image_html(image_path, max_width=800):
 # Removed inline preview image — keep only the toggle row for Disney
 # Build 6-method test row for Disney preset
 base_img = os.path.join('.', 'Uploads', 'ComfyUI_00083_.png')
-disney_images_html = generate_triple_image_html(base_img, 'Disney Animation')
-
-disney_content_row = widgets.HBox([
-    disney_row,
-    widgets.HTML(value=disney_images_html)
-], layout=widgets.Layout(align_items='center', width='100%', gap='20px'))
-
-disney_container = widgets.VBox([disney_content_row], layout=widgets.Layout(width='900px', align_items='center', margin='5px 0px'))
+disney_container = create_preset_section(disney_row, 'Disney Animation', base_img)
 
 
 # --- Impasto Preset Toggle ---
@@ -3890,47 +1992,7 @@ impasto_label = widgets.HTML(value="""
 
 def set_impasto_preset(enabled: bool):
     """Set Impasto preset: all custom nodes + A-mix Illustrious + Ri-mix LoRA"""
-    # Enable all custom nodes
-    for idx in range(len(custom_nodes)):
-        toggle_states.setdefault('custom-nodes', {})[idx] = bool(enabled)
-        btn = toggle_widgets.get('custom-nodes', {}).get(idx)
-        if btn is not None:
-            try:
-                if enabled:
-                    btn.add_class('active')
-                else:
-                    btn.remove_class('active')
-            except Exception:
-                if enabled and 'active' not in btn._dom_classes:
-                    btn._dom_classes = btn._dom_classes + ['active']
-                if not enabled and 'active' in btn._dom_classes:
-                    btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
-
-    # Impasto specific items
-    impasto_items = [
-        # Checkpoints
-        ('checkpoints', 'A-mix_Illustrious'),
-        # LoRAs
-        ('loras', 'Ri-mix_Style_LORA'),
-    ]
-    
-    for category, item_name in impasto_items:
-        items = category_data.get(category, [])
-        for idx, item in enumerate(items):
-            if item_name in item.get('name', '') or item_name in item.get('filename', ''):
-                toggle_states.setdefault(category, {})[idx] = bool(enabled)
-                btn = toggle_widgets.get(category, {}).get(idx)
-                if btn is not None:
-                    try:
-                        if enabled:
-                            btn.add_class('active')
-                        else:
-                            btn.remove_class('active')
-                    except Exception:
-                        if enabled and 'active' not in btn._dom_classes:
-                            btn._dom_classes = btn._dom_classes + ['active']
-                        if not enabled and 'active' in btn._dom_classes:
-                            btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
+    apply_preset('impasto', enabled)
 
 def _on_impasto_toggle_click(b):
     impasto_preset_state['enabled'] = not impasto_preset_state['enabled']
@@ -3986,24 +2048,13 @@ except Exception:
         except Exception:
             pass
 
-# NEW: Simple PIL/HTML image display for Impasto preset
-from PIL import Image as PILImage
-from IPython.display import HTML, display
-
 # Correct path for Impasto image
 img_path = "./Uploads/Impasto_Workflow.png"
 
 # Removed inline preview image — keep only the toggle row for Impasto
 # Build 6-method test row for Impasto preset
 base_img = os.path.join('.', 'Uploads', 'ComfyUI_00083_.png')
-impasto_images_html = generate_triple_image_html(base_img, 'Impasto')
-
-impasto_content_row = widgets.HBox([
-    impasto_row,
-    widgets.HTML(value=impasto_images_html)
-], layout=widgets.Layout(align_items='center', width='100%', gap='20px'))
-
-impasto_container = widgets.VBox([impasto_content_row], layout=widgets.Layout(width='900px', align_items='center', margin='5px 0px'))
+impasto_container = create_preset_section(impasto_row, 'Impasto', base_img)
 
 # --- Cinematic Realistic Photography Preset Toggle ---
 cinematic_preset_state = {'enabled': False}
@@ -4032,48 +2083,7 @@ cinematic_label = widgets.HTML(value="""
 
 def set_cinematic_preset(enabled: bool):
     """Set Cinematic Realistic Photography preset: all custom nodes + CyberRealistic Pony + specific LoRAs"""
-    # Enable all custom nodes
-    for idx in range(len(custom_nodes)):
-        toggle_states.setdefault('custom-nodes', {})[idx] = bool(enabled)
-        btn = toggle_widgets.get('custom-nodes', {}).get(idx)
-        if btn is not None:
-            try:
-                if enabled:
-                    btn.add_class('active')
-                else:
-                    btn.remove_class('active')
-            except Exception:
-                if enabled and 'active' not in btn._dom_classes:
-                    btn._dom_classes = btn._dom_classes + ['active']
-                if not enabled and 'active' in btn._dom_classes:
-                    btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
-
-    # Cinematic Realistic Photography specific items
-    cinematic_items = [
-        # Checkpoints
-        ('checkpoints', 'CyberRealistic_Pony'),
-        # LoRAs - Note: These might need to be added to your loras list if not present
-        ('loras', 'Crazy_Girlfriend_Mix'),
-        ('loras', 'Insta_Baddie'),
-    ]
-    
-    for category, item_name in cinematic_items:
-        items = category_data.get(category, [])
-        for idx, item in enumerate(items):
-            if item_name in item.get('name', '') or item_name in item.get('filename', ''):
-                toggle_states.setdefault(category, {})[idx] = bool(enabled)
-                btn = toggle_widgets.get(category, {}).get(idx)
-                if btn is not None:
-                    try:
-                        if enabled:
-                            btn.add_class('active')
-                        else:
-                            btn.remove_class('active')
-                    except Exception:
-                        if enabled and 'active' not in btn._dom_classes:
-                            btn._dom_classes = btn._dom_classes + ['active']
-                        if not enabled and 'active' in btn._dom_classes:
-                            btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
+    apply_preset('cinematic', enabled)
 
 # Add missing LoRAs that might not be in your current list
 missing_loras = [
@@ -4140,14 +2150,7 @@ except Exception:
 # Removed inline preview image — keep only the toggle row for Cinematic
 # Build 6-method test row for Cinematic preset
 base_img = os.path.join('.', 'Uploads', 'ComfyUI_00083_.png')
-cinematic_images_html = generate_triple_image_html(base_img, 'Cinematic Realistic Photography')
-
-cinematic_content_row = widgets.HBox([
-    cinematic_row,
-    widgets.HTML(value=cinematic_images_html)
-], layout=widgets.Layout(align_items='center', width='100%', gap='20px'))
-
-cinematic_container = widgets.VBox([cinematic_content_row], layout=widgets.Layout(width='900px', align_items='center', margin='5px 0px'))
+cinematic_container = create_preset_section(cinematic_row, 'Cinematic Realistic Photography', base_img)
 
 # Notebook-friendly gallery helper removed to keep file focused on the three preset base64 previews.
 
@@ -4162,11 +2165,14 @@ downloads_container = widgets.VBox([
     impasto_container,
     # Cinematic container (toggle + image)
     cinematic_container,
-    all_downloads_row
+    all_downloads_row,
+    profiles_row,
+    search_row
 ], layout=widgets.Layout(display='none', align_items='center', margin='5px 0px'))
 
 header_box = widgets.VBox([
     status_label,
+    selection_notice,
     progress_container,
     # civitai_status_link removed: token link appears in the advanced controls
     # Download-only progress/status (reserve space below the main progress)
@@ -4178,77 +2184,31 @@ header_box = widgets.VBox([
     controls_box
 ], layout=widgets.Layout(align_items='center', width='100%', margin='0px 0px'))
 
-# Main container now places header fixed under title and categories below
-main_container = widgets.VBox(
-    [title_row, header_box, downloads_container] + list(category_containers.values()),
-    layout=widgets.Layout(
-        display='flex',
-        flex_flow='column',
-        align_items='center',
-        width='100%',
-        gap='10px'
-    )
-)
-
-try:
-    main_container.add_class('comfy-root')
-except Exception:
-    # fallback for older ipywidgets versions
-    if not hasattr(main_container, '_dom_classes'):
-        try:
-            main_container._dom_classes = []
-        except Exception:
-            pass
-    if 'comfy-root' not in getattr(main_container, '_dom_classes', []):
-        main_container._dom_classes = getattr(main_container, '_dom_classes', []) + ['comfy-root']
-
-display(main_container)
+# Replace the loading line in the shell with the full UI
+paint_timer.mark('widgets')
+main_container.children = [title_row, header_box, downloads_container] + list(category_containers.values())
+logger.info("Shell painted in %.2fs, controls ready in %.2fs (python -m comfy_startup.startup_timer for history)",
+            paint_timer.marks['first_paint'], paint_timer.finish())
 
 # -----------------------------
 # ComfyUI Status Monitoring
 # -----------------------------
 def check_comfyui_status():
-    """Check if ComfyUI is running on port 8188"""
-    if psutil is None:
-        return False
-    
-    try:
-        # Check if any process is listening on port 8188
-        for conn in psutil.net_connections(kind='inet'):
-            if conn.laddr.port == 8188 and conn.status == psutil.CONN_LISTEN:
-                return True
-        return False
-    except Exception:
-        return False
+    """Check if ComfyUI is running on port 8188 and answering requests"""
+    return comfy_monitor.probe(port=8188)
+
+def update_comfyui_link_status(is_running):
+    """Show the Open Comfy UI link while ComfyUI is up; called only when the state changes"""
+    if is_running:
+        # Show the link (anchor uses .open-link-text which by default is hidden; we add 'running' to force visible underline)
+        open_link_html.value = f'<a href="{public_url}" target="_blank" class="open-link-text running">Open Comfy UI</a>'
+    else:
+        # Hide the link completely when ComfyUI is not running
+        open_link_html.value = ''
 
-def update_comfyui_link_status():
-    """Background thread to monitor ComfyUI status and update link styling"""
-    while True:
-        try:
-            is_running = check_comfyui_status()
-            
-            # Update the link styling based on ComfyUI status
-            if is_running:
-                # Show the link (anchor uses .open-link-text which by default is hidden; we add 'running' to force visible underline)
-                open_link_html.value = f'<a href="{public_url}" target="_blank" class="open-link-text running">Open Comfy UI</a>'
-            else:
-                # Hide the link completely when ComfyUI is not running
-                open_link_html.value = ''
-            
-            # Check every 5 seconds
-            time.sleep(5)
-            
-        except Exception as e:
-            # If monitoring fails, just continue without status updates
-            time.sleep(10)
-
-# Start the monitoring thread if psutil is available
-if psutil is not None:
-    monitoring_thread = threading.Thread(target=update_comfyui_link_status, daemon=True)
-    monitoring_thread.start()
-else:
-    # ComfyUI status monitoring disabled when psutil is not available. Silent fallback.
-    pass
+# Probe port 8188 in the background, backing off while the state is stable
+comfyui_monitor = comfy_monitor.ComfyMonitor(port=8188, on_change=update_comfyui_link_status)
+comfyui_monitor.start()
 
 # Debug functions were intentionally removed to reduce console clutter.
 
@@ -0,0 +1,6 @@
+"""Shared helpers for the ComfyUI start-up notebook and the ninja installer.
+
+Both ``Start_Up.py`` (run through ``%run`` from the notebook) and
+``ninja_start.py`` (run as a plain script) import from here, so anything that
+decides *how* ComfyUI gets installed lives in one place.
+"""
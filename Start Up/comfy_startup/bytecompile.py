@@ -0,0 +1,97 @@
+"""Byte-compile the venv, ComfyUI core and custom nodes once provisioning finishes.
+
+Without this the first ``main.py`` launch writes ``.pyc`` files for torch,
+transformers and every custom node on the critical path of the boot. Running
+``compileall`` with one worker per core straight after the install moves that
+cost off the first launch; a phase stamp keeps warm restarts from walking the
+trees again.
+"""
+import glob
+import logging
+import os
+import subprocess
+
+from .phase_stamps import fingerprint, git_head, venv_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Top-level ComfyUI entries that never hold importable sources (or are covered separately)
+_SKIP_CORE_ENTRIES = {"venv", "custom_nodes", "models", "input", "output", "temp", "user", ".git"}
+
+
+def site_packages_dirs(venv_path):
+    """site-packages directories owned by the venv (system site-packages are left alone)."""
+    patterns = [os.path.join(venv_path, "lib", "python*", "site-packages"),
+                os.path.join(venv_path, "Lib", "site-packages")]
+    return sorted(path for pattern in patterns for path in glob.glob(pattern))
+
+
+def compile_targets(comfy_dir, venv_dir="venv"):
+    """Paths to byte-compile for a ComfyUI checkout: venv site-packages, core sources and custom nodes."""
+    comfy_dir = os.path.abspath(comfy_dir)
+    targets = site_packages_dirs(os.path.join(comfy_dir, venv_dir))
+    try:
+        entries = sorted(os.listdir(comfy_dir))
+    except OSError:
+        entries = []
+    for entry in entries:
+        path = os.path.join(comfy_dir, entry)
+        if entry in _SKIP_CORE_ENTRIES or entry.startswith("."):
+            continue
+        if os.path.isdir(path) or entry.endswith(".py"):
+            targets.append(path)
+    custom_nodes = os.path.join(comfy_dir, "custom_nodes")
+    if os.path.isdir(custom_nodes):
+        targets.append(custom_nodes)
+    return targets
+
+
+def compile_fingerprint(comfy_dir, venv_dir="venv"):
+    """Changes when pip adds or removes packages, the venv is rebuilt, or any checkout moves."""
+    venv_path = os.path.join(comfy_dir, venv_dir)
+    site_mtimes = []
+    for path in site_packages_dirs(venv_path):
+        try:
+            site_mtimes.append(os.path.getmtime(path))
+        except OSError:
+            site_mtimes.append(None)
+    custom_nodes = os.path.join(comfy_dir, "custom_nodes")
+    try:
+        node_dirs = sorted(os.listdir(custom_nodes))
+    except OSError:
+        node_dirs = []
+    node_heads = [(name, git_head(os.path.join(custom_nodes, name)))
+                  for name in node_dirs if os.path.isdir(os.path.join(custom_nodes, name))]
+    return fingerprint(venv_fingerprint(venv_path), site_mtimes, git_head(comfy_dir), node_heads)
+
+
+def compile_command(python_exe, targets, workers=0):
+    """compileall invocation; ``workers=0`` lets compileall use every core."""
+    return [python_exe, "-m", "compileall", "-q", "-j", str(workers), *targets]
+
+
+def byte_compile(comfy_dir, python_exe, stamps=None, venv_dir="venv", timeout=1800):
+    """Compile every target with the venv interpreter so the cache tags match what ComfyUI imports.
+
+    compileall exits non-zero when any file fails to compile (vendored Python 2
+    sources, templates named ``*.py``...), which is expected and not treated as
+    a failure. Returns True when the compile ran, False when skipped.
+    """
+    targets = compile_targets(comfy_dir, venv_dir)
+    if not targets:
+        return False
+
+    def run():
+        try:
+            result = subprocess.run(compile_command(python_exe, targets), cwd=comfy_dir,
+                                    capture_output=True, text=True, timeout=timeout)
+        except Exception as e:
+            logger.warning("Byte-compilation did not finish: %s", e)
+            return False
+        if result.returncode != 0:
+            logger.info("compileall reported files it could not compile; continuing")
+        return True
+
+    if stamps is None:
+        return run() is not False
+    return stamps.run("bytecompile", compile_fingerprint(comfy_dir, venv_dir), run)
@@ -0,0 +1,305 @@
+"""One normalized, immutable view of the download catalog in ``Library/Library.py``.
+
+``DOWNLOAD_LIBRARY`` mixes label strings, flat lists and nested subcategory
+maps. This module walks it once into ``CatalogEntry`` records with a stable
+``id`` (the destination path under ``models/``, e.g. ``loras/SDXL_ClassiPaint.safetensors``)
+and builds lookup tables by id, name, filename, normalized URL, category and
+subcategory. The built catalog is pickled next to the library and reused
+until Library.py changes, so the notebook, dev.py and ninja_start.py all get
+the same view without re-walking the source on every start.
+"""
+import ast
+import hashlib
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_LIBRARY = Path(__file__).resolve().parents[2] / "Library" / "Library.py"
+CACHE_VERSION = 1
+
+# Library.py section -> category id used by the notebook UI (category_data keys)
+UI_CATEGORIES = {
+    "custom_nodes": "custom-nodes",
+    "checkpoints": "checkpoints",
+    "loras": "loras",
+    "embeddings": "embeddings",
+    "clip_models": "clip",
+    "clip_vision_models": "clip-vision",
+    "vae_models": "vae",
+    "controlnet_models": "controlnet",
+    "upscale_models": "upscale",
+    "additional_downloads": "additional",
+    "diffusion_models": "additional",
+    "style_models": "additional",
+    "model_patches": "additional",
+}
+
+# Query parameters that only carry credentials or download hints, not file identity
+_VOLATILE_QUERY = {"token", "download"}
+
+_KNOWN_FIELDS = ("display_title", "name", "source_page", "url", "filename", "dest_dir",
+                 "info", "required", "size", "vram", "sha256")
+
+
+def normalize_url(url):
+    """Canonical form of a download URL: lower-case host, no credentials, sorted query."""
+    if not url:
+        return ""
+    parsed = urlparse(url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parsed.query) if k.lower() not in _VOLATILE_QUERY)
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path.rstrip("/"),
+                       "", urlencode(query), ""))
+
+
+def _display_title(item):
+    name = item.get("name") or item.get("filename") or ""
+    pretty = re.sub(r"\.(safetensors|ckpt|pth|pt|bin|gguf)$", "", name).replace("_", " ")
+    return pretty.strip() or name
+
+
+def _source_page(url):
+    match = re.search(r"civitai\.com/.*?/models/(\d+)", url or "")
+    return f"https://civitai.com/models/{match.group(1)}" if match else ""
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """A single downloadable item. Immutable; use ``as_item()`` for a mutable dict."""
+
+    id: str
+    category: str
+    subcategory: str = None
+    group: str = None
+    name: str = ""
+    display_title: str = ""
+    filename: str = ""
+    url: str = ""
+    dest_dir: str = ""
+    source_page: str = ""
+    info: str = ""
+    required: bool = False
+    size: str = None
+    vram: str = None
+    sha256: str = None
+    extra: tuple = field(default=(), compare=False)
+
+    @property
+    def ui_category(self):
+        return UI_CATEGORIES.get(self.category, self.category.replace("_", "-"))
+
+    @property
+    def folder(self):
+        """ComfyUI folder the file lands in ("models/loras" -> "loras")."""
+        parts = self.dest_dir.strip("/").split("/")
+        return "/".join(parts[1:]) if parts[0] == "models" and len(parts) > 1 else self.dest_dir.strip("/")
+
+    def as_item(self):
+        """The entry as the dict shape the UI and download code already use."""
+        item = dict(self.extra)
+        for key in _KNOWN_FIELDS:
+            value = getattr(self, key)
+            if value not in (None, ""):
+                item[key] = value
+        item["required"] = self.required
+        item["catalog_id"] = self.id
+        if self.subcategory:
+            item["subcategory"] = self.subcategory
+        if self.group:
+            item["group"] = self.group
+        return item
+
+
+class Catalog:
+    """Immutable catalog with O(1) lookups."""
+
+    def __init__(self, entries, labels=None, source_digest=None):
+        self.entries = tuple(entries)
+        self.labels = dict(labels or {})
+        self.source_digest = source_digest
+        self.by_id = {}
+        self._by_name = {}
+        self._by_filename = {}
+        self._by_url = {}
+        self._by_category = {}
+        self._by_subcategory = {}
+        for entry in self.entries:
+            self.by_id[entry.id] = entry
+            if entry.name:
+                self._by_name.setdefault(entry.name.lower(), entry)
+            if entry.filename:
+                self._by_filename.setdefault(entry.filename.lower(), entry)
+            if entry.url:
+                self._by_url.setdefault(normalize_url(entry.url), entry)
+            self._by_category.setdefault(entry.category, []).append(entry)
+            self._by_subcategory.setdefault((entry.category, entry.subcategory), []).append(entry)
+        self._by_category = {k: tuple(v) for k, v in self._by_category.items()}
+        self._by_subcategory = {k: tuple(v) for k, v in self._by_subcategory.items()}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def get(self, entry_id):
+        return self.by_id.get(entry_id)
+
+    def find(self, name=None, filename=None, url=None):
+        """Look an entry up by any one identity; returns None when unknown."""
+        if url:
+            hit = self._by_url.get(normalize_url(url))
+            if hit:
+                return hit
+        if filename:
+            hit = self._by_filename.get(filename.lower())
+            if hit:
+                return hit
+        if name:
+            return self._by_name.get(name.lower()) or self._by_filename.get(name.lower())
+        return None
+
+    def in_category(self, category, subcategory=None):
+        if subcategory is None:
+            return self._by_category.get(category, ())
+        return self._by_subcategory.get((category, subcategory), ())
+
+    @property
+    def categories(self):
+        return tuple(self._by_category)
+
+    def ui_lists(self):
+        """``{ui category id: [item dict, ...]}`` in library order, flattened for the toggle UI."""
+        lists = {}
+        for entry in self.entries:
+            lists.setdefault(entry.ui_category, []).append(entry.as_item())
+        return lists
+
+
+def _walk_library(library):
+    labels = {}
+    for key, value in library.items():
+        if isinstance(value, str):
+            labels[key] = value
+        elif isinstance(value, dict) and all(isinstance(v, str) for v in value.values()):
+            labels.update(value)
+    for key, value in library.items():
+        if isinstance(value, list):
+            for item in value:
+                yield key, None, None, item
+        elif isinstance(value, dict):
+            for sub, sub_value in value.items():
+                if isinstance(sub_value, list):
+                    for item in sub_value:
+                        yield key, sub, None, item
+                elif isinstance(sub_value, dict):
+                    for group, items in sub_value.items():
+                        for item in items if isinstance(items, list) else ():
+                            yield key, sub, group, item
+    yield labels
+
+
+def build_catalog(library, source_digest=None):
+    """Build a ``Catalog`` from a ``DOWNLOAD_LIBRARY`` mapping."""
+    entries, seen = [], set()
+    labels = {}
+    for record in _walk_library(library):
+        if isinstance(record, dict):
+            labels = record
+            continue
+        category, sub, group, item = record
+        if not isinstance(item, dict):
+            continue
+        url = item.get("url") or item.get("download_url") or ""
+        filename = item.get("filename") or os.path.basename(urlparse(url).path)
+        dest_dir = item.get("dest_dir") or (category if category == "custom_nodes" else f"models/{category}")
+        folder = dest_dir.strip("/")
+        folder = folder[len("models/"):] if folder.startswith("models/") else folder
+        entry_id = f"{folder}/{filename or item.get('name') or len(entries)}"
+        base_id, n = entry_id, 2
+        while entry_id in seen:
+            entry_id, n = f"{base_id}#{n}", n + 1
+        seen.add(entry_id)
+        extra = tuple(sorted((k, v) for k, v in item.items()
+                             if k not in _KNOWN_FIELDS and k != "download_url" and isinstance(v, (str, int, float, bool))))
+        entries.append(CatalogEntry(
+            id=entry_id,
+            category=category,
+            subcategory=sub,
+            group=group,
+            name=item.get("name") or filename,
+            display_title=item.get("display_title") or _display_title(item),
+            filename=filename,
+            url=url,
+            dest_dir=dest_dir,
+            source_page=item.get("source_page") or _source_page(url),
+            info=item.get("info") or "",
+            required=bool(item.get("required", False)),
+            size=item.get("size"),
+            vram=item.get("vram"),
+            sha256=item.get("sha256"),
+            extra=extra,
+        ))
+    return Catalog(entries, labels, source_digest)
+
+
+def _read_library(source):
+    """Evaluate the DOWNLOAD_LIBRARY literal without executing the file."""
+    tree = ast.parse(source)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "DOWNLOAD_LIBRARY" for t in node.targets):
+            return ast.literal_eval(node.value)
+    return {}
+
+
+def _cache_path(library_path):
+    tag = hashlib.sha1(str(library_path).encode("utf-8")).hexdigest()[:10]
+    return library_path.parent / "__pycache__" / f"catalog.{tag}.pickle"
+
+
+_loaded = {}
+
+
+def load_catalog(library_path=None):
+    """Return the catalog for `library_path`, building it only when Library.py changed.
+
+    Cached in-process and on disk; the disk cache is keyed on the file's
+    mtime/size and falls back to a content hash so a touched-but-unchanged
+    library still reuses it.
+    """
+    library_path = Path(library_path or os.environ.get("COMFY_LIBRARY") or DEFAULT_LIBRARY).resolve()
+    stat = library_path.stat()
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    memo = _loaded.get(library_path)
+    if memo and memo[0] == stat_key:
+        return memo[1]
+
+    cache_path = _cache_path(library_path)
+    cached = None
+    try:
+        with open(cache_path, "rb") as fh:
+            cached = pickle.load(fh)
+    except Exception:
+        cached = None
+    if cached and cached.get("version") == CACHE_VERSION and cached.get("stat") == stat_key:
+        catalog = cached["catalog"]
+    else:
+        source = library_path.read_bytes()
+        digest = hashlib.sha256(source).hexdigest()
+        if cached and cached.get("version") == CACHE_VERSION and cached.get("digest") == digest:
+            catalog = cached["catalog"]
+        else:
+            catalog = build_catalog(_read_library(source.decode("utf-8")), digest)
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as fh:
+                pickle.dump({"version": CACHE_VERSION, "stat": stat_key, "digest": digest, "catalog": catalog}, fh,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+    _loaded[library_path] = (stat_key, catalog)
+    return catalog
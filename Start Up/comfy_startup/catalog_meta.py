@@ -0,0 +1,241 @@
+"""Per-entry catalog metadata (size, sha256, base architecture, VRAM) in a sidecar file.
+
+Library.py only carries ``size``/``vram`` for a handful of entries. The refresh
+tool resolves the rest once and writes ``Library/catalog_meta.json``, keyed on
+catalog ids::
+
+    python -m comfy_startup.catalog_meta refresh --comfy ComfyUI
+    python -m comfy_startup.catalog_meta show
+
+Sources, in order of preference: a local copy of the file (size, plus sha256
+from the model hash cache), Civitai model-version metadata (through the
+shared ``civitai_cache``), and the Hugging
+Face resolve headers (``X-Linked-Size``/``X-Linked-Etag``). Installers only call
+``load_meta``, which reads the sidecar and never touches the network.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import civitai_cache
+from .catalog import DEFAULT_LIBRARY, load_catalog
+from .model_aliases import load_hash_cache, source_ids
+
+META_FILE = "catalog_meta.json"
+
+# Base architecture -> VRAM (GB) it needs to run at its shipped precision
+RECOMMENDED_VRAM_GB = {
+    "sd15": 4,
+    "sdxl": 8,
+    "pony": 8,
+    "illustrious": 8,
+    "flux": 12,
+}
+
+# Civitai baseModel / filename hints -> architecture key
+_ARCH_PATTERNS = (
+    ("pony", r"pony"),
+    ("illustrious", r"illustrious|noobai"),
+    ("flux", r"flux"),
+    ("sdxl", r"sdxl|sd_xl|xl\b"),
+    ("sd15", r"sd\s*1\.5|sd15|sd1\.5|stable_diffusion_loras"),
+)
+
+
+def guess_arch(*hints):
+    """Architecture key for the first hint that names one, or None."""
+    for hint in hints:
+        text = (hint or "").lower()
+        for arch, pattern in _ARCH_PATTERNS:
+            if re.search(pattern, text):
+                return arch
+    return None
+
+
+def meta_path(library_path=None):
+    return os.path.join(os.path.dirname(os.path.abspath(library_path or DEFAULT_LIBRARY)), META_FILE)
+
+
+_loaded = {}
+
+
+def load_meta(library_path=None):
+    """``{catalog id: {"size": bytes, "sha256": ..., "arch": ..., "vram_gb": ...}}`` from the sidecar.
+
+    Cached per process until the sidecar changes; an absent file is an empty mapping.
+    """
+    path = meta_path(library_path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _loaded.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            entries = json.load(fh).get("entries", {})
+    except (OSError, ValueError):
+        entries = {}
+    _loaded[path] = (mtime, entries)
+    return entries
+
+
+def save_meta(entries, library_path=None):
+    path = meta_path(library_path)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+        json.dump({"generated": int(time.time()), "entries": entries}, fh, indent=1, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def format_size(size):
+    """Bytes as the "2.5GB"/"890MB" strings Library.py uses."""
+    if not size:
+        return None
+    if size >= 1 << 30:
+        return f"{size / (1 << 30):.1f}GB"
+    return f"{size / (1 << 20):.0f}MB"
+
+
+def enrich_items(items, meta):
+    """Fill missing ``size``/``vram``/``sha256`` on UI item dicts from cached metadata, in place."""
+    for item in items:
+        cached = meta.get(item.get("catalog_id")) if isinstance(item, dict) else None
+        if not cached:
+            continue
+        if cached.get("size"):
+            item.setdefault("size", format_size(cached["size"]))
+        if cached.get("vram_gb"):
+            item.setdefault("vram", f"~{cached['vram_gb']:g}GB")
+        if cached.get("sha256"):
+            item.setdefault("sha256", cached["sha256"])
+    return items
+
+
+def _from_local(entry, comfy_dir, hashes):
+    path = os.path.join(comfy_dir, entry.dest_dir, entry.filename)
+    if not os.path.isfile(path):
+        return {}
+    meta = {"size": os.path.getsize(path), "source": "local"}
+    cached = hashes.get(os.path.relpath(path, os.path.join(comfy_dir, "models")))
+    if cached and cached.get("size") == meta["size"]:
+        meta["sha256"] = cached.get("sha256")
+    return meta
+
+
+def _from_civitai(data):
+    files = data.get("files") or []
+    primary = next((f for f in files if f.get("primary")), files[0] if files else {})
+    meta = {"arch": guess_arch(data.get("baseModel")), "base_model": data.get("baseModel"), "source": "civitai"}
+    if primary.get("sizeKB"):
+        meta["size"] = int(primary["sizeKB"] * 1024)
+    sha256 = (primary.get("hashes") or {}).get("SHA256")
+    if sha256:
+        meta["sha256"] = sha256.lower()
+    return meta
+
+
+def _from_huggingface(url, session, token=None):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    resp = session.head(url.split("?", 1)[0], headers=headers, allow_redirects=False, timeout=30)
+    if resp.status_code >= 400:
+        resp.raise_for_status()
+    meta = {"source": "huggingface"}
+    size = resp.headers.get("X-Linked-Size") or (resp.headers.get("Content-Length") if resp.status_code == 200 else None)
+    if size:
+        meta["size"] = int(size)
+    # LFS files report their sha256 as the linked etag
+    etag = (resp.headers.get("X-Linked-Etag") or "").strip('"')
+    if re.fullmatch(r"[0-9a-f]{64}", etag):
+        meta["sha256"] = etag
+    return meta
+
+
+def resolve_entry(entry, comfy_dir=None, hashes=None, session=None, civitai=None, hf_token=None):
+    """Metadata for one catalog entry; network sources fill whatever the local file did not.
+
+    `civitai` maps version ids to metadata already fetched by ``civitai_cache.resolve_versions``.
+    """
+    meta = _from_local(entry, comfy_dir, hashes or {}) if comfy_dir else {}
+    if session is not None and not (meta.get("size") and meta.get("sha256")):
+        ids = source_ids(entry.url)
+        remote = {}
+        try:
+            if ids and ids[0].startswith("civitai:"):
+                data = (civitai or {}).get(ids[0].split(":", 1)[1])
+                if data is None:
+                    raise LookupError("Civitai version lookup failed")
+                remote = _from_civitai(data)
+            elif ids and ids[0].startswith("hf:"):
+                remote = _from_huggingface(entry.url, session, hf_token)
+        except Exception as e:
+            meta.setdefault("error", str(e))
+        for key, value in remote.items():
+            meta.setdefault(key, value)
+    meta["arch"] = meta.get("arch") or guess_arch(entry.filename, entry.name, entry.subcategory)
+    if entry.vram:
+        meta["vram_gb"] = float(re.sub(r"[^0-9.]", "", entry.vram) or 0) or None
+    elif meta["arch"] and entry.category == "checkpoints":
+        meta["vram_gb"] = RECOMMENDED_VRAM_GB.get(meta["arch"])
+    meta["fetched"] = int(time.time())
+    return {k: v for k, v in meta.items() if v is not None}
+
+
+def refresh(library_path=None, comfy_dir=None, only_missing=True, offline=False,
+            civitai_token=None, hf_token=None, workers=8):
+    """Resolve metadata for every model entry and rewrite the sidecar; returns the entries."""
+    catalog = load_catalog(library_path)
+    existing = dict(load_meta(library_path))
+    hashes = load_hash_cache(os.path.join(comfy_dir, "models")) if comfy_dir else {}
+    session = None
+    if not offline:
+        import requests
+        session = requests.Session()
+
+    todo = [entry for entry in catalog
+            if entry.dest_dir.startswith("models") and entry.url
+            and not (only_missing and existing.get(entry.id, {}).get("size") and "error" not in existing[entry.id])]
+    # One concurrent batch through the shared version cache instead of a request per entry
+    civitai = {} if offline else civitai_cache.resolve_versions(
+        [civitai_cache.version_id(entry.url) for entry in todo], token=civitai_token, workers=workers)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda e: (e.id, resolve_entry(e, comfy_dir, hashes, session, civitai, hf_token)), todo)
+        for entry_id, meta in results:
+            existing[entry_id] = meta
+    live_ids = {entry.id for entry in catalog}
+    entries = {k: v for k, v in existing.items() if k in live_ids}
+    save_meta(entries, library_path)
+    return entries
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Refresh or show cached catalog metadata")
+    parser.add_argument("action", choices=["refresh", "show"])
+    parser.add_argument("--library", default=str(DEFAULT_LIBRARY))
+    parser.add_argument("--comfy", default=None, help="ComfyUI directory to read local files and hashes from")
+    parser.add_argument("--all", action="store_true", help="refresh: re-resolve entries that already have metadata")
+    parser.add_argument("--offline", action="store_true", help="refresh: local files and heuristics only")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    if args.action == "refresh":
+        entries = refresh(args.library, args.comfy, only_missing=not args.all, offline=args.offline,
+                          civitai_token=os.environ.get("CIVITAI_TOKEN"), hf_token=os.environ.get("HF_TOKEN"),
+                          workers=args.workers)
+        failed = sum(1 for meta in entries.values() if "error" in meta)
+        print(f"Wrote metadata for {len(entries)} entries to {meta_path(args.library)} ({failed} with errors)")
+        return
+    entries = load_meta(args.library)
+    for entry_id, meta in sorted(entries.items()):
+        print(f"{entry_id:70} {format_size(meta.get('size')) or '?':>8} {meta.get('arch') or '?':>12} "
+              f"{meta.get('vram_gb') or '?':>5}")
+    if not entries:
+        print("No metadata cached yet; run `refresh`.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""A whole catalog category as one virtualized, scrollable table widget.
+
+The notebook's default rows are an ``HBox(Button, HTML)`` per item, with a
+Python ``on_click`` closure each: three widget models per row on the comm
+channel. ``CatalogTable`` is a single `anywidget`_ model instead. ``rows``
+carries the row data once and ``states`` mirrors the category's slice of
+``toggle_states``. The front end draws only the rows in view, and one
+delegated click listener turns a click into a ``states`` update, which the
+kernel copies back into ``toggle_states``::
+
+    table = CatalogTable("loras", category_data["loras"], toggle_states)
+    ...apply a preset...
+    sync_tables({"loras": table})
+
+``anywidget`` is optional. Without it ``AVAILABLE`` is False and the notebook
+keeps its per-row buttons.
+
+``visible`` limits the drawn rows to a list of row keys (``None`` shows all);
+``show_only`` sets it from search results.
+
+.. _anywidget: https://anywidget.dev
+"""
+from .presets import iter_positions
+
+try:
+    import anywidget
+    import traitlets
+except ImportError:
+    anywidget = None
+
+AVAILABLE = anywidget is not None
+
+ROW_HEIGHT = 46
+# Rows drawn above and below the viewport so fast scrolling does not flash blank
+OVERSCAN = 8
+
+_ESM = """
+function render({ model, el }) {
+  const rowHeight = model.get("row_height");
+  const viewport = document.createElement("div");
+  viewport.className = "catalog-table";
+  viewport.style.cssText = `position:relative; overflow-y:auto; max-height:${model.get("max_height")}px; width:100%;`;
+  const spacer = document.createElement("div");
+  spacer.style.position = "relative";
+  viewport.appendChild(spacer);
+  el.appendChild(viewport);
+
+  function draw() {
+    const visible = model.get("visible");
+    const keep = visible ? new Set(visible) : null;
+    const rows = keep ? model.get("rows").filter((row) => keep.has(row.key)) : model.get("rows");
+    const states = model.get("states");
+    spacer.style.height = `${rows.length * rowHeight}px`;
+    const first = Math.max(0, Math.floor(viewport.scrollTop / rowHeight) - OVERSCAN);
+    const last = Math.min(rows.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / rowHeight) + OVERSCAN);
+    const html = [];
+    for (let i = first; i < last; i++) {
+      const row = rows[i];
+      const classes = ["custom-toggle"];
+      if (states[row.key]) classes.push("active");
+      if (row.required) classes.push("disabled");
+      const title = row.href ? `<a href="${row.href}" target="_blank" class="display-title">${row.title}</a>`
+                             : `<span class="display-title">${row.title}</span>`;
+      const badge = row.required ? '<span class="required-badge">Always included</span>' : "";
+      html.push(
+        `<div class="item-row" data-key="${row.key}" style="position:absolute; top:${i * rowHeight}px; ` +
+        `height:${rowHeight}px; left:0; right:0; display:flex; align-items:center;">` +
+        `<button class="${classes.join(" ")}" style="width:60px; height:30px;"></button>` +
+        `<div class="item-info"><div class="item-name">${title} ${badge}</div>` +
+        `<div class="item-filename"></div><div class="item-description"></div></div></div>`);
+    }
+    spacer.innerHTML = html.join("");
+    // Plain-text fields go through textContent rather than the HTML string
+    spacer.querySelectorAll(".item-row").forEach((node, n) => {
+      const row = rows[first + n];
+      node.querySelector(".item-filename").textContent = row.filename || "";
+      node.querySelector(".item-description").textContent = row.info || "";
+    });
+  }
+
+  // One listener for every row, present or future
+  spacer.addEventListener("click", (event) => {
+    const button = event.target.closest("button.custom-toggle");
+    if (!button || button.classList.contains("disabled")) return;
+    const key = button.parentElement.dataset.key;
+    const states = Object.assign({}, model.get("states"));
+    states[key] = !states[key];
+    model.set("states", states);
+    model.save_changes();
+  });
+
+  let pending = false;
+  viewport.addEventListener("scroll", () => {
+    if (pending) return;
+    pending = true;
+    requestAnimationFrame(() => { pending = false; draw(); });
+  });
+  model.on("change:rows", draw);
+  model.on("change:states", draw);
+  model.on("change:visible", () => { viewport.scrollTop = 0; draw(); });
+  requestAnimationFrame(draw);
+}
+export default { render };
+""".replace("OVERSCAN", str(OVERSCAN))
+
+
+def position_key(subcategory, idx):
+    """Row key used in ``states``: ``"3"`` or ``"<subcategory>/3"``."""
+    return f"{subcategory}/{idx}" if subcategory is not None else str(idx)
+
+
+def _states_for(category, items, toggle_states):
+    states = toggle_states.get(category, {})
+    result = {}
+    for subcategory, idx, item in iter_positions(items):
+        if not isinstance(item, dict):
+            continue
+        scoped = states.get(subcategory, {}) if subcategory is not None else states
+        result[position_key(subcategory, idx)] = bool(scoped.get(idx, item.get("required", False)))
+    return result
+
+
+def row_for(category, subcategory, idx, item, link_for=None):
+    """Row dict for one catalog item, with the fields ``create_toggle_widget`` shows."""
+    url = item.get("url") or item.get("download_url") or ""
+    title = item.get("display_title") or item.get("name", "")
+    if subcategory is not None:
+        title = f"{subcategory} · {title}"
+    return {
+        "key": position_key(subcategory, idx),
+        "title": title,
+        "href": item.get("source_page") or (link_for(url) if link_for else None) or "",
+        "filename": item.get("filename") or item.get("name") or "",
+        # Descriptions are only shown for custom nodes, as in the per-row UI
+        "info": item.get("info", "") if category == "custom-nodes" else "",
+        "required": bool(item.get("required", False)),
+    }
+
+
+if AVAILABLE:
+
+    class CatalogTable(anywidget.AnyWidget):
+        """One category of the catalog; see the module docstring."""
+
+        _esm = _ESM
+        rows = traitlets.List().tag(sync=True)
+        states = traitlets.Dict().tag(sync=True)
+        row_height = traitlets.Int(ROW_HEIGHT).tag(sync=True)
+        max_height = traitlets.Int(460).tag(sync=True)
+        visible = traitlets.List(None, allow_none=True).tag(sync=True)
+
+        def __init__(self, category, items, toggle_states, link_for=None, **kwargs):
+            rows = [row_for(category, subcategory, idx, item, link_for)
+                    for subcategory, idx, item in iter_positions(items) if isinstance(item, dict)]
+            super().__init__(rows=rows, states=_states_for(category, items, toggle_states), **kwargs)
+            self.category = category
+            self.items = items
+            self.toggle_states = toggle_states
+            self._required = {row["key"] for row in rows if row["required"]}
+            self.observe(self._on_states, names="states")
+
+        def _on_states(self, change):
+            states = self.toggle_states.setdefault(self.category, {})
+            for key, active in change["new"].items():
+                if change["old"].get(key) == active:
+                    continue
+                if key in self._required:
+                    active = True
+                subcategory, _, idx = key.rpartition("/")
+                scoped = states.setdefault(subcategory, {}) if subcategory else states
+                scoped[int(idx)] = bool(active)
+
+        def refresh(self):
+            """Re-read ``toggle_states`` and send it to the front end if anything changed."""
+            states = _states_for(self.category, self.items, self.toggle_states)
+            if states != self.states:
+                self.states = states
+                return True
+            return False
+
+        def show_only(self, positions):
+            """Draw only the rows at `positions` (``(category, subcategory, idx)``, None for all)."""
+            keys = None if positions is None else sorted(
+                position_key(subcategory, idx) for category, subcategory, idx in positions if category == self.category)
+            if keys != self.visible:
+                self.visible = keys
+
+else:
+    CatalogTable = None
+
+
+def sync_tables(tables, categories=None):
+    """Refresh the tables for `categories` (all by default) after a bulk change to ``toggle_states``."""
+    refreshed = 0
+    for category, table in tables.items():
+        if categories is None or category in categories:
+            refreshed += table.refresh()
+    return refreshed
@@ -0,0 +1,171 @@
+"""Civitai model-version metadata, fetched in batches and cached on the workspace volume.
+
+The notebook used to guess everything from the download URL, and any real
+lookup (model page, file name, size, hash, base model) would have cost one
+request per item while the UI was being built. Here lookups are split in two:
+
+* ``prefetch``/``resolve_versions`` fetch every uncached version id
+  concurrently and store the responses with a timestamp;
+* ``cached_version`` and the helpers built on it only ever read the cache, so
+  UI construction never waits on the network.
+
+The cache lives next to the repository checkout (on the persistent
+``/workspace`` volume on RunPod), so every pod started from the same volume
+shares it. Override the location with ``COMFY_CIVITAI_CACHE``::
+
+    python -m comfy_startup.civitai_cache 143906 345685
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE = Path(__file__).resolve().parents[2] / ".civitai_cache.json"
+VERSION_API = "https://civitai.com/api/v1/model-versions/{}"
+TTL = 7 * 24 * 3600
+# Failed lookups are retried sooner than good ones expire
+ERROR_TTL = 3600
+
+
+def version_id(url):
+    """Civitai model-version id from a download URL, or None."""
+    if not url or "civitai.com" not in url:
+        return None
+    match = re.search(r"/models/(\d+)", url)
+    return match.group(1) if match else None
+
+
+class CivitaiCache:
+    """Thread-safe ``{version id: {"fetched": ts, "data": {...}}}`` store backed by one JSON file."""
+
+    def __init__(self, path=None, ttl=TTL):
+        self.path = Path(path or os.environ.get("COMFY_CIVITAI_CACHE") or DEFAULT_CACHE)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = None
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as fh:
+                    self._entries = json.load(fh)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, vid):
+        """Fresh cached entry for `vid` or None."""
+        with self._lock:
+            entry = self._load().get(str(vid))
+        if not entry:
+            return None
+        ttl = ERROR_TTL if "error" in entry else self.ttl
+        return entry if time.time() - entry.get("fetched", 0) < ttl else None
+
+    def put_many(self, results):
+        """Merge ``{vid: entry}`` into the cache and write it back atomically."""
+        with self._lock:
+            entries = self._load()
+            entries.update({str(k): v for k, v in results.items()})
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix(".tmp")
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(entries, fh)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning("Could not write Civitai cache %s: %s", self.path, e)
+
+
+_default = None
+
+
+def default_cache():
+    global _default
+    if _default is None:
+        _default = CivitaiCache()
+    return _default
+
+
+def _fetch(session, vid, token):
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    try:
+        resp = session.get(VERSION_API.format(vid), headers=headers, timeout=30)
+        resp.raise_for_status()
+        return {"fetched": time.time(), "data": resp.json()}
+    except Exception as e:
+        return {"fetched": time.time(), "error": str(e)}
+
+
+def resolve_versions(version_ids, token=None, workers=8, cache=None):
+    """``{vid: data}`` for every id, fetching only the ones missing from the cache, in parallel.
+
+    Ids whose lookup failed map to None.
+    """
+    cache = cache or default_cache()
+    ids = list(dict.fromkeys(str(v) for v in version_ids if v))
+    entries = {vid: cache.get(vid) for vid in ids}
+    missing = [vid for vid, entry in entries.items() if entry is None]
+    if missing:
+        import requests
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = dict(zip(missing, pool.map(lambda vid: _fetch(session, vid, token), missing)))
+        cache.put_many(fetched)
+        entries.update(fetched)
+        failed = sum(1 for entry in fetched.values() if "error" in entry)
+        logger.info("Resolved %d Civitai versions (%d failed)", len(missing), failed)
+    return {vid: entry.get("data") for vid, entry in entries.items()}
+
+
+def prefetch(urls, token=None, cache=None):
+    """Start a daemon thread that warms the cache for every Civitai URL in `urls`."""
+    ids = [version_id(url) for url in urls]
+
+    def warm():
+        try:
+            resolve_versions(ids, token=token, cache=cache)
+        except Exception as e:
+            logger.info("Civitai cache prefetch skipped: %s", e)
+
+    thread = threading.Thread(target=warm, daemon=True)
+    thread.start()
+    return thread
+
+
+def cached_version(url_or_id, cache=None):
+    """Cached version metadata for a download URL or version id, never touching the network."""
+    vid = url_or_id if str(url_or_id).isdigit() else version_id(url_or_id)
+    entry = (cache or default_cache()).get(vid) if vid else None
+    return entry.get("data") if entry else None
+
+
+def model_page_url(download_url, cache=None):
+    """Model page for a download URL; exact when the version is cached, a best guess otherwise."""
+    vid = version_id(download_url)
+    if not vid:
+        return None
+    data = cached_version(vid, cache)
+    if data and data.get("modelId"):
+        return f"https://civitai.com/models/{data['modelId']}?modelVersionId={vid}"
+    return f"https://civitai.com/models/{vid}"
+
+
+def main(argv=None):
+    ids = argv if argv is not None else sys.argv[1:]
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for vid, data in resolve_versions(ids, token=os.environ.get("CIVITAI_TOKEN")).items():
+        if data:
+            print(f"{vid}: {(data.get('model') or {}).get('name')} / {data.get('name')} ({data.get('baseModel')})")
+        else:
+            print(f"{vid}: lookup failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Event-driven readiness monitor for the local ComfyUI server.
+
+The notebook used to decide whether ComfyUI was up by enumerating every inet
+socket through ``psutil.net_connections`` every 5 seconds, which is slow and
+often needs privileges in containers, and it rewrote the "Open Comfy UI" link
+on every pass. ``probe`` instead makes one TCP connect to the server port and,
+once that succeeds, one ``GET /system_stats``; ComfyUI only answers it after
+custom nodes have loaded, so "up" means usable, not just listening.
+
+``ComfyMonitor`` probes from a daemon thread, every ``min_interval`` seconds
+while the state is changing and backing off to ``max_interval`` while it is
+stable. Listeners are called only on transitions::
+
+    monitor = ComfyMonitor(on_change=lambda up: print("ComfyUI", "up" if up else "down"))
+    monitor.start()
+    monitor.poke()                 # just launched it: probe fast again
+    monitor.wait_until(True, 600)
+
+Command line (exit status 0 once the server answers)::
+
+    python -m comfy_startup.comfy_monitor --timeout 600
+"""
+import argparse
+import json
+import logging
+import socket
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8188
+MIN_INTERVAL = 1.0
+MAX_INTERVAL = 30.0
+
+
+def probe(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=2.0, http=True):
+    """True when ComfyUI accepts connections and (with `http`) answers ``/system_stats``."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError:
+        return False
+    if not http:
+        return True
+    import urllib.request
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/system_stats", timeout=timeout) as resp:
+            return resp.status == 200 and "system" in json.loads(resp.read() or b"{}")
+    except (OSError, ValueError):
+        return False
+
+
+class ComfyMonitor:
+    """Background prober that reports up/down transitions; see the module docstring."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, on_change=None,
+                 min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL, http=True):
+        self.host = host
+        self.port = port
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.http = http
+        self.up = None
+        self._listeners = [on_change] if on_change else []
+        self._changed = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+        if self.up is not None:
+            callback(self.up)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="comfy-monitor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def poke(self):
+        """Probe now and at the fastest rate again, e.g. right after launching the server."""
+        self._wake.set()
+
+    def wait_until(self, up=True, timeout=None):
+        """Block until the monitored state is `up`; False on timeout."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.up == up, timeout)
+
+    def _set(self, up):
+        with self._changed:
+            self.up = up
+            self._changed.notify_all()
+        for callback in list(self._listeners):
+            try:
+                callback(up)
+            except Exception as e:
+                logger.warning("ComfyUI monitor listener failed: %s", e)
+
+    def _run(self):
+        interval = self.min_interval
+        while not self._stop.is_set():
+            up = probe(self.host, self.port, http=self.http)
+            if up != self.up:
+                logger.info("ComfyUI on port %d is %s", self.port, "up" if up else "down")
+                self._set(up)
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+            if self._wake.wait(interval):
+                self._wake.clear()
+                interval = self.min_interval
+
+
+def wait_until_up(host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=600, interval=MIN_INTERVAL):
+    """Poll until ComfyUI answers or `timeout` seconds pass; for scripts without a monitor thread."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if probe(host, port):
+            return True
+        time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+        interval = min(interval * 1.5, 10.0)
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Wait until the local ComfyUI server answers /system_stats")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args(argv)
+    if wait_until_up(args.host, args.port, args.timeout):
+        print(f"ComfyUI is up on {args.host}:{args.port}")
+        return 0
+    print(f"ComfyUI did not answer on {args.host}:{args.port} within {args.timeout:g}s", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""Process-pool download and clone engine used by the notebook installer.
+
+Downloads and ``git clone`` jobs run in separate worker processes (10 and 6
+of them), with results collected as they finish. Keeping the worker
+functions in a module, instead of in the ``%run`` script, means the pool can
+pickle them by reference under any start method. It also means the notebook
+only loads this code when a download actually starts::
+
+    download_results, clone_results = run_parallel_downloads(download_tasks, clone_tasks, progress_callback)
+
+A download task is a dict with ``url``, ``dest_path`` and optionally
+``token``, ``name`` and ``sha256``. A clone task has ``url``, ``dest_path``
+(the directory to clone into) and ``name``.
+"""
+import logging
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import task_dedupe, url_cache
+
+logger = logging.getLogger(__name__)
+
+
+def download_file_process(url, dest_path, token=None):
+    """Download file in a separate process - returns (success, message)"""
+    try:
+        # Ensure destination directory exists
+        try:
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        except Exception:
+            pass
+
+        is_civit = 'civitai.com' in (url or '')
+        if is_civit and token:
+            headers = {'Authorization': f'Bearer {token}'}
+            try:
+                # Streams through the cached signed CDN URL instead of re-hitting the API
+                with url_cache.get(url, headers=headers, timeout=300) as r:
+                    with open(dest_path, 'wb') as fh:
+                        for chunk in r.iter_content(chunk_size=8192):
+                            if chunk:
+                                fh.write(chunk)
+                return True, f"Downloaded: {os.path.basename(dest_path)}"
+            except Exception:
+                # Fall through to wget
+                pass
+
+        # Fallback: use wget, on the resolved URL first and the original if that was rejected
+        try:
+            result = None
+            resolved = url_cache.resolve_quietly(url)
+            for target in dict.fromkeys((resolved, url)):
+                cmd = f"wget -O '{dest_path}' '{target}'"
+                result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
+                if result.returncode == 0:
+                    return True, f"Downloaded (wget): {os.path.basename(dest_path)}"
+                if target != url:
+                    url_cache.invalidate(url)
+            return False, f"wget failed for {os.path.basename(dest_path)}: {result.stderr}"
+        except Exception as e:
+            return False, f"Download failed for {os.path.basename(dest_path)}: {str(e)}"
+            
+    except Exception as e:
+        return False, f"Process error for {os.path.basename(dest_path)}: {str(e)}"
+
+
+def clone_repo_process(repo_url, dest_path, repo_name, install_requirements=True):
+    """Clone git repository in a separate process - returns (success, message)
+    With `install_requirements=False` only the clone runs, so callers can install
+    node requirements later once the venv is ready."""
+    try:
+        # Ensure destination directory exists
+        try:
+            os.makedirs(dest_path, exist_ok=True)
+        except Exception:
+            pass
+        # Clone the repository
+        result = subprocess.run(
+            f"git clone {repo_url}", 
+            shell=True, 
+            cwd=dest_path, 
+            capture_output=True, 
+            text=True, 
+            timeout=300
+        )
+        if result.returncode == 0:
+            # Try to install requirements if they exist
+            req_path = os.path.join(dest_path, repo_name, "requirements.txt")
+            if install_requirements and os.path.exists(req_path):
+                pip_result = subprocess.run(
+                    "../../venv/bin/pip install -r requirements.txt",
+                    shell=True,
+                    cwd=os.path.join(dest_path, repo_name),
+                    capture_output=True,
+                    text=True,
+                    timeout=120
+                )
+                if pip_result.returncode == 0:
+                    return True, f"Cloned and installed: {repo_name}"
+                else:
+                    return True, f"Cloned (pip install failed): {repo_name}"
+            else:
+                return True, f"Cloned: {repo_name}"
+        else:
+            return False, f"Git clone failed for {repo_name}: {result.stderr}"
+        
+    except Exception as e:
+        return False, f"Clone error for {repo_name}: {str(e)}"
+
+
+def run_parallel_downloads(download_tasks, clone_tasks, progress_callback=None, install_requirements=True):
+    """Run downloads and clones in parallel with progress tracking"""
+    # Fetch each artifact once; extra destinations are hardlinked afterwards
+    download_tasks, duplicate_links = task_dedupe.coalesce_tasks(download_tasks)
+    total_tasks = len(download_tasks) + len(clone_tasks)
+    completed_tasks = 0
+    # Results storage
+    download_results = []
+    clone_results = []
+    def update_progress():
+        nonlocal completed_tasks
+        completed_tasks += 1
+        if progress_callback:
+            progress = int((completed_tasks / total_tasks) * 100)
+            progress_callback(progress)
+    # Start download processes (10 workers)
+    with ProcessPoolExecutor(max_workers=10) as download_executor:
+        download_futures = {
+            download_executor.submit(download_file_process, task['url'], task['dest_path'], task.get('token')): task
+            for task in download_tasks
+        }
+        # Start clone processes (6 workers) 
+        with ProcessPoolExecutor(max_workers=6) as clone_executor:
+            clone_futures = {
+                clone_executor.submit(clone_repo_process, task['url'], task['dest_path'], task['name'], install_requirements): task
+                for task in clone_tasks
+            }
+            # Collect download results
+            for future in as_completed(download_futures):
+                task = download_futures[future]
+                try:
+                    success, message = future.result()
+                    download_results.append({
+                        'task': task,
+                        'success': success,
+                        'message': message
+                    })
+                    logger.info("Download: %s", message)
+                except Exception as e:
+                    download_results.append({
+                        'task': task,
+                        'success': False,
+                        'message': f"Exception: {str(e)}"
+                    })
+                    logger.warning("Download failed: %s - %s", task.get('name', 'Unknown'), str(e))
+                finally:
+                    update_progress()
+            # Collect clone results
+            for future in as_completed(clone_futures):
+                task = clone_futures[future]
+                try:
+                    success, message = future.result()
+                    clone_results.append({
+                        'task': task,
+                        'success': success,
+                        'message': message
+                    })
+                    logger.info("Clone: %s", message)
+                except Exception as e:
+                    clone_results.append({
+                        'task': task,
+                        'success': False,
+                        'message': f"Exception: {str(e)}"
+                    })
+                    logger.warning("Clone failed: %s - %s", task.get('name', 'Unknown'), str(e))
+                finally:
+                    update_progress()
+    linked = task_dedupe.materialize_links(duplicate_links)
+    if linked:
+        logger.info("Linked %d duplicate downloads", linked)
+    return download_results, clone_results
@@ -0,0 +1,148 @@
+"""Built-in download library used when Library/Library.py cannot be read.
+
+Start_Up.py normally builds its category lists from the shared catalog
+(``catalog.load_catalog``); this copy keeps the notebook usable without the
+Library checkout and is only imported on that fallback path. The top-level
+keys are the notebook's runtime list names, each a list of item dicts in the
+Library.py format.
+"""
+
+DOWNLOAD_LIBRARY = {
+    "custom_nodes": [
+        {
+            "display_title": "Essential ComfyUI Manager",
+            "name": "ComfyUI-Manager",
+            "url": "https://github.com/ltdrdata/ComfyUI-Manager.git",
+            "filename": "ComfyUI-Manager",
+            "info": "Essential node manager for ComfyUI",
+            "required": True
+        },
+        {
+            "display_title": "RGThree Utilities",
+            "name": "rgthree-comfy",
+            "url": "https://github.com/rgthree/rgthree-comfy.git",
+            "filename": "rgthree-comfy",
+            "info": "Quality of life nodes and utilities",
+            "required": False
+        },
+        {
+            "display_title": "ComfyUI Easy Use",
+            "name": "ComfyUI-Easy-Use",
+            "url": "https://github.com/yolain/ComfyUI-Easy-Use.git",
+            "filename": "ComfyUI-Easy-Use",
+            "info": "Simplified workflow nodes for beginners",
+            "required": False
+        }
+    ],
+
+    "checkpoints": [
+        {
+            "display_title": "SDXL Base Model",
+            "name": "SDXL.safetensors",
+            "source_page": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0",
+            "url": "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0/resolve/main/sd_xl_base_1.0.safetensors",
+            "filename": "SDXL.safetensors",
+            "dest_dir": "models/checkpoints",
+            "info": "Official SDXL base checkpoint",
+            "required": False
+        },
+        {
+            "display_title": "DreamShaper (SD1.5)",
+            "name": "SD1.5_DreamShaper.safetensors",
+            "source_page": "https://civitai.com/models/128713/dreamshaper",
+            "url": "https://civitai.com/api/download/models/128713",
+            "filename": "SD1.5_DreamShaper.safetensors",
+            "dest_dir": "models/checkpoints",
+            "info": "DreamShaper SD1.5 variant",
+            "required": False
+        },
+        {
+            "display_title": "Pony Diffusion V6 XL",
+            "name": "Pony_Diffusion_V6_XL.safetensors",
+            "source_page": "https://civitai.com/models/290640/pony-diffusion-v6-xl",
+            "url": "https://civitai.com/api/download/models/290640?type=Model&format=SafeTensor&size=pruned&fp=fp16",
+            "filename": "Pony_Diffusion_V6_XL.safetensors",
+            "dest_dir": "models/checkpoints",
+            "info": "Pony Diffusion V6 XL - Versatile SDXL",
+            "required": False
+        }
+    ],
+
+    "loras": [
+        {"name": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "url": "https://civitai.com/api/download/models/145907", "filename": "Stable_Diffusion_Loras_Detailed_Eyes.safetensors", "dest_dir": "models/loras", "info": "Detailed eyes LoRA", "required": False},
+        {"name": "SDXL_Pop_Art_Style.safetensors", "url": "https://civitai.com/api/download/models/192584", "filename": "SDXL_Pop_Art_Style.safetensors", "dest_dir": "models/loras", "info": "SDXL Pop Art LoRA", "required": False},
+        {"name": "Illustrious_USNR_Style.safetensors", "url": "https://civitai.com/api/download/models/959419", "filename": "Illustrious_USNR_Style.safetensors", "dest_dir": "models/loras", "info": "Illustrious style LoRA", "required": False}
+    ],
+
+    "embeddings": [
+        {"name": "EasyNegative.pt", "url": "https://civitai.com/api/download/models/9208?type=Model&format=SafeTensor&size=full&fp=fp16", "filename": "EasyNegative.pt", "dest_dir": "models/embeddings", "info": "EasyNegative embedding", "required": False},
+        {"name": "PositivePrompts.pt", "url": "https://example.com/positiveprompts.pt", "filename": "PositivePrompts.pt", "dest_dir": "models/embeddings", "info": "Positive prompt embeddings", "required": False},
+        {"name": "StyleEmbedding.pt", "url": "https://example.com/styleembedding.pt", "filename": "StyleEmbedding.pt", "dest_dir": "models/embeddings", "info": "Style embedding pack", "required": False}
+    ],
+
+    "clip_models": [
+        {"name": "clip_l.safetensors", "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/clip_l.safetensors?download=true", "filename": "clip_l.safetensors", "dest_dir": "models/clip", "info": "Flux clip_l encoder", "required": False},
+        {"name": "clip_g.safetensors", "url": "https://huggingface.co/calcuis/sd3.5-large-gguf/resolve/main/clip_g.safetensors?download=true", "filename": "clip_g.safetensors", "dest_dir": "models/clip", "info": "Large CLIP G encoder", "required": False},
+        {"name": "t5xxl_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp16.safetensors?download=true", "filename": "t5xxl_fp16.safetensors", "dest_dir": "models/clip", "info": "T5 encoder", "required": False}
+    ],
+
+    "clip_vision_models": [
+        {"name": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors", "url": "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors", "filename": "CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors", "dest_dir": "models/clip_vision", "info": "CLIP ViT-H encoder", "required": False},
+        {"name": "clip_vision_h.safetensors", "url": "https://huggingface.co/Comfy-Org/Wan_2.1_ComfyUI_repackaged/resolve/main/split_files/clip_vision/clip_vision_h.safetensors?download=true", "filename": "clip_vision_h.safetensors", "dest_dir": "models/clip_vision", "info": "Comfy repackaged clip_vision_h", "required": False},
+        {"name": "sigclip_vision_patch14_384.safetensors", "url": "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors?download=true", "filename": "sigclip_vision_patch14_384.safetensors", "dest_dir": "models/clip_vision", "info": "SigCLIP vision model", "required": False}
+    ],
+
+    "vae_models": [
+        {"name": "SDXL_Vae.safetensors", "url": "https://huggingface.co/stabilityai/sdxl-vae/resolve/main/sdxl_vae.safetensors?download=true", "filename": "SDXL_Vae.safetensors", "dest_dir": "models/vae", "info": "Official SDXL VAE", "required": False},
+        {"name": "ae.safetensors", "url": "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged/resolve/main/split_files/vae/ae.safetensors?download=true", "filename": "ae.safetensors", "dest_dir": "models/vae", "info": "Lumina ae VAE", "required": False},
+        {"name": "VAE_MSE.safetensors", "url": "https://huggingface.co/stabilityai/sd-vae-ft-mse-original/resolve/main/vae.safetensors?download=true", "filename": "VAE_MSE.safetensors", "dest_dir": "models/vae", "info": "High quality VAE", "required": False}
+    ],
+
+    "controlnet_models": [
+        {"name": "FLUX.1-dev-Controlnet-Union.safetensors", "url": "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union/resolve/main/diffusion_pytorch_model.safetensors", "filename": "FLUX.1-dev-Controlnet-Union.safetensors", "dest_dir": "models/controlnet", "info": "FLUX dev ControlNet union", "required": False},
+        {"name": "control_v11p_sd15_inpaint_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors", "filename": "control_v11p_sd15_inpaint_fp16.safetensors", "dest_dir": "models/controlnet", "info": "ControlNet inpaint model", "required": False},
+        {"name": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "url": "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "filename": "control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors", "dest_dir": "models/controlnet", "info": "Control Lora", "required": False}
+    ],
+
+    "upscale_models": [
+        {"name": "RealESRGAN_x4plus.pth", "url": "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth", "filename": "RealESRGAN_x4plus.pth", "dest_dir": "models/upscale_models", "info": "Real-ESRGAN x4", "required": False},
+        {"name": "4x-UltraSharp.safetensors", "url": "https://civitai.com/api/download/models/125843", "filename": "4x-UltraSharp.safetensors", "dest_dir": "models/upscale_models", "info": "Ultra sharp upscaler", "required": False},
+        {"name": "OmniSR_X2_DIV2K.safetensors", "url": "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X2_DIV2K.safetensors", "filename": "OmniSR_X2_DIV2K.safetensors", "dest_dir": "models/upscale_models", "info": "OmniSR X2", "required": False}
+    ],
+
+    "additional_downloads": [
+        {"name": "uso-flux1-projector-v1.safetensors", "url": "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/model_patches/uso-flux1-projector-v1.safetensors", "filename": "uso-flux1-projector-v1.safetensors", "dest_dir": "models/model_patches", "info": "Projector patch", "required": False},
+        {"name": "Flux_Redux.safetensors", "url": "https://civitai.com/api/download/models/1086258", "filename": "Flux_Redux.safetensors", "dest_dir": "models/style_models", "info": "Flux Redux", "required": False},
+        {"name": "Extra_Packs.zip", "url": "https://example.com/extra_packs.zip", "filename": "Extra_Packs.zip", "dest_dir": "workspace/downloads", "info": "Extra utilities pack", "required": False}
+    ],
+
+    "images_downloads": [
+        {"name": "Image Processing Tools", "url": "https://example.com/image_tools.zip", "info": "Tools for image manipulation", "required": False},
+        {"name": "Image Enhancement Models", "url": "https://example.com/image_enhance.zip", "info": "Enhancement pack", "required": False},
+        {"name": "Image Converters", "url": "https://example.com/image_converters.zip", "info": "Format converters", "required": False}
+    ],
+
+    "videos_downloads": [
+        {"name": "Video Processing Tools", "url": "https://example.com/video_tools.zip", "info": "Video utilities", "required": False},
+        {"name": "Animation Tools", "url": "https://example.com/animation_tools.zip", "info": "Animation pack", "required": False},
+        {"name": "Video Codecs", "url": "https://example.com/codecs.zip", "info": "Codec pack", "required": False}
+    ],
+
+    "audio_downloads": [
+        {"name": "Audio Processing Libraries", "url": "https://example.com/audio_libs.zip", "info": "Audio tools", "required": False},
+        {"name": "Audio Enhancement Tools", "url": "https://example.com/audio_enhance.zip", "info": "Audio enhancers", "required": False},
+        {"name": "Audio Converters", "url": "https://example.com/audio_conv.zip", "info": "Audio format converters", "required": False}
+    ],
+
+    "text_downloads": [
+        {"name": "Text Processing Tools", "url": "https://example.com/text_tools.zip", "info": "NLP utilities", "required": False},
+        {"name": "Font Collections", "url": "https://example.com/fonts.zip", "info": "Fonts pack", "required": False},
+        {"name": "Translation Tools", "url": "https://example.com/translate.zip", "info": "Translation utilities", "required": False}
+    ],
+
+    "code_downloads": [
+        {"name": "Development Tools", "url": "https://example.com/dev_tools.zip", "info": "Dev utilities", "required": False},
+        {"name": "Code Templates", "url": "https://example.com/templates.zip", "info": "Project templates", "required": False},
+        {"name": "Docs Generators", "url": "https://example.com/docs.zip", "info": "Doc generators", "required": False}
+    ]
+}
@@ -0,0 +1,181 @@
+"""Dependency-graph scheduler for the install pipeline.
+
+Each install step is a task with declared prerequisites. Tasks whose
+prerequisites are finished run concurrently on a thread pool, so a cold start
+takes roughly as long as its slowest chain (clone -> venv -> torch -> requirements)
+instead of the sum of every stage.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class InstallTask:
+    """One node in the install graph."""
+
+    def __init__(self, name, func, deps=(), weight=1, label=None):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.weight = weight
+        self.label = label or name
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class InstallGraph:
+    """Run install tasks as a dependency graph, overlapping independent work.
+
+    A task fails only when its function raises; dependents of a failed task
+    are skipped while unrelated branches keep running.
+    """
+
+    def __init__(self, max_workers=6):
+        self.max_workers = max_workers
+        self.tasks = {}
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def add(self, name, func, deps=(), weight=1, label=None):
+        """Register `func` (called without arguments) to run after every task in `deps`."""
+        if name in self.tasks:
+            raise ValueError(f"Duplicate install task: {name}")
+        self.tasks[name] = InstallTask(name, func, deps, weight, label)
+        return self.tasks[name]
+
+    def _validate(self):
+        for task in self.tasks.values():
+            for dep in task.deps:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task {task.name!r} depends on unknown task {dep!r}")
+        # Kahn's algorithm: anything left over sits on a cycle
+        indegree = {name: len(task.deps) for name, task in self.tasks.items()}
+        ready = [name for name, count in indegree.items() if count == 0]
+        seen = 0
+        while ready:
+            current = ready.pop()
+            seen += 1
+            for task in self.tasks.values():
+                if current in task.deps:
+                    indegree[task.name] -= 1
+                    if indegree[task.name] == 0:
+                        ready.append(task.name)
+        if seen != len(self.tasks):
+            raise ValueError("Install graph contains a dependency cycle")
+
+    def _run_task(self, task):
+        task.started = time.monotonic()
+        try:
+            task.result = task.func()
+            task.status = DONE
+        except Exception as e:
+            task.error = e
+            task.status = FAILED
+            logger.exception("Install task failed: %s", task.label)
+        finally:
+            task.finished = time.monotonic()
+        return task
+
+    def _skip_dependents(self, failed_name):
+        for task in self.tasks.values():
+            if task.status == PENDING and failed_name in task.deps:
+                task.status = SKIPPED
+                logger.warning("Skipping %s because %s did not complete", task.label, failed_name)
+                self._skip_dependents(task.name)
+
+    def run(self, progress_callback=None):
+        """Execute the graph and return ``{name: task}``.
+
+        `progress_callback(percent)` is invoked after every finished task,
+        weighted by each task's `weight`.
+        """
+        self._validate()
+        total_weight = sum(task.weight for task in self.tasks.values()) or 1
+        done_weight = 0
+        self.started = time.monotonic()
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                with self._lock:
+                    for task in self.tasks.values():
+                        if task.status != PENDING:
+                            continue
+                        if all(self.tasks[dep].status == DONE for dep in task.deps):
+                            task.status = RUNNING
+                            logger.info("Starting install task: %s", task.label)
+                            running[executor.submit(self._run_task, task)] = task
+                if not running:
+                    break
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    if task.status == FAILED:
+                        self._skip_dependents(task.name)
+                    done_weight += task.weight
+                    if progress_callback:
+                        try:
+                            progress_callback(int(done_weight / total_weight * 100))
+                        except Exception:
+                            pass
+        self.finished = time.monotonic()
+        if progress_callback and done_weight < total_weight:
+            # Skipped tasks never finish; close out the bar once the graph drains
+            try:
+                progress_callback(100)
+            except Exception:
+                pass
+        return self.tasks
+
+    def critical_path(self):
+        """Return ``(task_names, seconds)`` for the longest chain of completed tasks."""
+        best = {}
+
+        def chain(name):
+            if name not in best:
+                task = self.tasks[name]
+                prefix, prefix_time = [], 0.0
+                for dep in task.deps:
+                    dep_chain, dep_time = chain(dep)
+                    if dep_time > prefix_time:
+                        prefix, prefix_time = dep_chain, dep_time
+                best[name] = (prefix + [name], prefix_time + task.duration)
+            return best[name]
+
+        longest = ([], 0.0)
+        for name in self.tasks:
+            candidate = chain(name)
+            if candidate[1] > longest[1]:
+                longest = candidate
+        return longest
+
+    def report(self):
+        """Human-readable timing summary including the critical path."""
+        wall = (self.finished or time.monotonic()) - (self.started or time.monotonic())
+        serial = sum(task.duration for task in self.tasks.values())
+        path, path_time = self.critical_path()
+        lines = [f"Install finished in {wall:.1f}s (stages add up to {serial:.1f}s run serially)"]
+        lines.append(f"Critical path ({path_time:.1f}s): " +
+                     " -> ".join(f"{self.tasks[n].label} {self.tasks[n].duration:.1f}s" for n in path))
+        for task in sorted(self.tasks.values(), key=lambda t: t.duration, reverse=True):
+            if task.status != DONE:
+                lines.append(f"  {task.label}: {task.status}")
+        return "\n".join(lines)
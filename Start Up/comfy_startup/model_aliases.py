@@ -0,0 +1,281 @@
+"""Map the names workflows use for a model onto the file we already have.
+
+The catalog renames files on download (``sd_xl_base_1.0.safetensors`` is
+stored as ``SDXL.safetensors``, Civitai version ids become arbitrary names), so
+a workflow shared from elsewhere references files that do not exist locally
+and would trigger a second multi-gigabyte download. The alias index maps
+
+* the local filename,
+* the upstream filename at the end of the download URL,
+* ``civitai:<version id>`` and ``hf:<repo>/<path>`` source ids,
+* ``sha256:<digest>`` when the catalog or a hash cache knows it
+
+to the local path, relative to its models folder. Workflows can then be
+rewritten to use local names, or upstream names can be exposed through
+symlinks registered in ``extra_model_paths.yaml``::
+
+    python -m comfy_startup.model_aliases rewrite "../Workflows/download (1).json" -o fixed.json
+    python -m comfy_startup.model_aliases link "../Workflows/download (1).json"
+"""
+import argparse
+import copy
+import hashlib
+import json
+import os
+import re
+import sys
+from urllib.parse import unquote, urlparse
+
+from .node_index import load_workflow
+from .workflow_plan import (INPUT_FOLDERS, LOADER_WIDGETS, MODEL_EXTENSIONS, extract_model_refs,
+                            item_dest_dir, item_filename, iter_catalog_items, load_library, url_filename)
+
+ALIAS_DIR = "_aliases"
+HASH_CACHE = ".sha256_cache.json"
+_YAML_BEGIN = "# BEGIN comfy_startup model aliases (generated)"
+_YAML_END = "# END comfy_startup model aliases"
+
+
+def source_ids(url):
+    """Stable ids for where a file comes from: ``civitai:<version>`` and/or ``hf:<repo>/<path>``."""
+    parsed = urlparse(url or "")
+    ids = []
+    if "civitai.com" in parsed.netloc:
+        match = re.search(r"/models/(\d+)", parsed.path)
+        if match:
+            ids.append(f"civitai:{match.group(1)}")
+    elif "huggingface.co" in parsed.netloc:
+        match = re.match(r"/([^/]+/[^/]+)/(?:resolve|blob)/[^/]+/(.+)", unquote(parsed.path))
+        if match:
+            ids.append(f"hf:{match.group(1)}/{match.group(2)}".lower())
+    return ids
+
+
+def _folder_of(dest_dir):
+    """ComfyUI models folder for a catalog ``dest_dir`` ("models/loras" -> "loras")."""
+    parts = dest_dir.strip("/").split("/")
+    return "/".join(parts[1:]) if parts[0] == "models" and len(parts) > 1 else parts[-1]
+
+
+def load_hash_cache(models_dir):
+    try:
+        with open(os.path.join(models_dir, HASH_CACHE), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def hash_local_models(models_dir, extensions=(".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".gguf")):
+    """sha256 every model file under `models_dir`, reusing digests whose size and mtime are unchanged."""
+    cache = load_hash_cache(models_dir)
+    fresh = {}
+    for root, dirs, files in os.walk(models_dir):
+        dirs[:] = [d for d in dirs if d != ALIAS_DIR and not d.startswith(".")]
+        for name in files:
+            if not name.lower().endswith(extensions):
+                continue
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, models_dir)
+            stat = os.stat(path)
+            entry = cache.get(rel)
+            if entry and entry.get("size") == stat.st_size and entry.get("mtime") == stat.st_mtime:
+                fresh[rel] = entry
+                continue
+            digest = hashlib.sha256()
+            with open(path, "rb") as fh:
+                for chunk in iter(lambda: fh.read(8 << 20), b""):
+                    digest.update(chunk)
+            fresh[rel] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": digest.hexdigest()}
+    with open(os.path.join(models_dir, HASH_CACHE), "w", encoding="utf-8") as fh:
+        json.dump(fresh, fh, indent=1)
+    return fresh
+
+
+class AliasIndex:
+    """Alias key -> ``(folder, local name)`` for models that exist, or will exist, under ``models/``."""
+
+    def __init__(self, models_dir):
+        self.models_dir = models_dir
+        self.aliases = {}
+
+    def add(self, key, folder, local_name):
+        if key:
+            self.aliases.setdefault(key.lower(), (folder, local_name))
+
+    def local_path(self, folder, local_name):
+        return os.path.join(self.models_dir, folder, local_name)
+
+    def lookup(self, name=None, url=None, sha256=None, folder=None):
+        """Resolve any known identity of a model to ``(folder, local name)``, or None."""
+        keys = []
+        if sha256:
+            keys.append(f"sha256:{sha256}")
+        keys.extend(source_ids(url))
+        if url:
+            keys.append(url_filename(url))
+        if name:
+            keys.append(name.replace("\\", "/").rsplit("/", 1)[-1])
+        for key in keys:
+            hit = self.aliases.get(key.lower())
+            if hit and (folder is None or hit[0] == folder or not os.path.isdir(os.path.join(self.models_dir, folder))):
+                return hit
+        return None
+
+    def exists(self, hit):
+        return hit is not None and os.path.exists(self.local_path(*hit))
+
+
+def build_alias_index(catalog, comfy_dir):
+    """Index every catalog entry plus whatever is already on disk (with cached hashes)."""
+    models_dir = os.path.join(comfy_dir, "models")
+    index = AliasIndex(models_dir)
+    for category, subcategory, item in iter_catalog_items(catalog):
+        dest_dir = item_dest_dir(item, category)
+        if not dest_dir.startswith("models"):
+            continue
+        folder, local_name = _folder_of(dest_dir), item_filename(item)
+        url = item.get("url") or item.get("download_url")
+        index.add(local_name, folder, local_name)
+        if item.get("sha256"):
+            index.add(f"sha256:{item['sha256']}", folder, local_name)
+        for key in source_ids(url) + [url_filename(url)]:
+            index.add(key, folder, local_name)
+    for rel, entry in load_hash_cache(models_dir).items():
+        folder, _, local_name = rel.replace(os.sep, "/").rpartition("/")
+        index.add(f"sha256:{entry.get('sha256')}", folder, local_name)
+        index.add(local_name, folder, local_name)
+    return index
+
+
+def rewrite_workflow(workflow, index):
+    """Return ``(workflow copy, changes)`` with model names swapped for local files we already have.
+
+    Only values that do not exist locally but resolve to a local file are
+    rewritten, so a workflow that already matches is returned unchanged.
+    """
+    workflow = copy.deepcopy(workflow)
+    changes = []
+
+    def swap(value, folder, node_type):
+        if not isinstance(value, str) or "." not in value:
+            return value
+        if folder and os.path.exists(os.path.join(index.models_dir, folder, value)):
+            return value
+        hit = index.lookup(name=value, folder=folder)
+        if not index.exists(hit) or hit[1] == value:
+            return value
+        changes.append((node_type, value, hit[1]))
+        return hit[1]
+
+    nodes = []
+    if "nodes" in workflow:
+        nodes = list(workflow.get("nodes") or [])
+        for subgraph in (workflow.get("definitions") or {}).get("subgraphs") or []:
+            nodes.extend(subgraph.get("nodes") or [])
+    for node in nodes:
+        widgets = node.get("widgets_values")
+        if not isinstance(widgets, list):
+            continue
+        positions = LOADER_WIDGETS.get(node.get("type"), {})
+        for pos, value in enumerate(widgets):
+            if isinstance(value, dict) and isinstance(value.get("lora"), str):
+                value["lora"] = swap(value["lora"], "loras", node.get("type"))
+            elif isinstance(value, str) and value.lower().endswith(MODEL_EXTENSIONS):
+                widgets[pos] = swap(value, positions.get(pos), node.get("type"))
+    if "nodes" not in workflow:
+        for node in workflow.values():
+            if isinstance(node, dict) and "class_type" in node:
+                inputs = node.get("inputs") or {}
+                for key, value in inputs.items():
+                    if isinstance(value, str) and value.lower().endswith(MODEL_EXTENSIONS):
+                        inputs[key] = swap(value, INPUT_FOLDERS.get(key), node["class_type"])
+    return workflow, changes
+
+
+def link_aliases(refs, index, comfy_dir):
+    """Symlink referenced names we only have under another name into ``models/_aliases/<folder>/``.
+
+    Returns the list of created links and registers the alias tree in
+    ``extra_model_paths.yaml`` so ComfyUI lists the upstream names too.
+    """
+    alias_root = os.path.join(index.models_dir, ALIAS_DIR)
+    links, folders = [], set()
+    for ref in refs:
+        folder = ref.folder or "checkpoints"
+        if os.path.exists(os.path.join(index.models_dir, folder, ref.filename)):
+            continue
+        hit = index.lookup(name=ref.filename, url=ref.url, sha256=ref.sha256, folder=ref.folder)
+        if not index.exists(hit):
+            continue
+        link_path = os.path.join(alias_root, folder, ref.filename)
+        os.makedirs(os.path.dirname(link_path), exist_ok=True)
+        if os.path.lexists(link_path):
+            os.remove(link_path)
+        os.symlink(index.local_path(*hit), link_path)
+        links.append((link_path, index.local_path(*hit)))
+        folders.add(folder)
+    if folders:
+        write_extra_model_paths(comfy_dir, alias_root, folders)
+    return links
+
+
+def write_extra_model_paths(comfy_dir, alias_root, folders):
+    """Add or replace our generated section in ComfyUI's extra_model_paths.yaml, keeping user sections."""
+    path = os.path.join(comfy_dir, "extra_model_paths.yaml")
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            existing = fh.read()
+    except OSError:
+        existing = ""
+    existing = re.sub(re.escape(_YAML_BEGIN) + r".*?" + re.escape(_YAML_END) + r"\n?", "", existing, flags=re.S)
+    section = [_YAML_BEGIN, "comfy_startup_aliases:", f"    base_path: {os.path.abspath(alias_root)}"]
+    section += [f"    {folder}: {folder}" for folder in sorted(folders)]
+    section.append(_YAML_END)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(existing.rstrip("\n") + ("\n\n" if existing.strip() else "") + "\n".join(section) + "\n")
+
+
+def link_workflow_aliases(workflow_paths, catalog, comfy_dir):
+    """Build the index and link every alias the given workflows need."""
+    index = build_alias_index(catalog, comfy_dir)
+    refs = []
+    for path in workflow_paths:
+        refs.extend(extract_model_refs(load_workflow(path)))
+    return link_aliases(refs, index, comfy_dir)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve workflow model names to local files")
+    parser.add_argument("action", choices=["rewrite", "link", "hash"])
+    parser.add_argument("workflows", nargs="*", help="Workflow JSON files")
+    parser.add_argument("--library", default=os.path.join(os.path.dirname(__file__), "..", "..", "Library", "Library.py"))
+    parser.add_argument("--comfy", default="ComfyUI", help="ComfyUI directory")
+    parser.add_argument("-o", "--output", help="rewrite: output file (single workflow) instead of stdout")
+    args = parser.parse_intermixed_args(argv)
+
+    if args.action == "hash":
+        digests = hash_local_models(os.path.join(args.comfy, "models"))
+        print(f"Hashed {len(digests)} model files")
+        return
+    if not args.workflows:
+        parser.error(f"{args.action} needs at least one workflow")
+    catalog = load_library(args.library)
+    if args.action == "link":
+        for link_path, target in link_workflow_aliases(args.workflows, catalog, args.comfy):
+            print(f"{link_path} -> {target}")
+        return
+    index = build_alias_index(catalog, args.comfy)
+    for path in args.workflows:
+        rewritten, changes = rewrite_workflow(load_workflow(path), index)
+        for node_type, old, new in changes:
+            print(f"{path}: {node_type}: {old} -> {new}", file=sys.stderr)
+        if args.output and len(args.workflows) == 1:
+            with open(args.output, "w", encoding="utf-8") as fh:
+                json.dump(rewritten, fh, indent=2)
+        else:
+            json.dump(rewritten, sys.stdout, indent=2)
+            print()
+
+
+if __name__ == "__main__":
+    main()
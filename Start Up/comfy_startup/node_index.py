@@ -0,0 +1,292 @@
+"""Enable only the custom node packs the workflows being served actually use.
+
+Each node ``type`` in a workflow is mapped back to the pack that provides it:
+first through the ``cnr_id``/``aux_id`` the frontend stores in
+``properties``, then through a cached index of ``NODE_CLASS_MAPPINGS`` built
+by booting ComfyUI once with ``--quick-test-for-ci`` under the import profiler.
+Packs nobody needs are parked in ``custom_nodes/.disabled/``, which ComfyUI
+skips while loading (the same place ComfyUI-Manager parks disabled packs)::
+
+    python -m comfy_startup.node_index plan  --comfy ComfyUI "Workflows/download (1).json"
+    python -m comfy_startup.node_index apply --comfy ComfyUI "Workflows/download (1).json"
+    python -m comfy_startup.node_index restore --comfy ComfyUI
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from . import node_profiler
+from .phase_stamps import git_head
+
+logger = logging.getLogger(__name__)
+
+DISABLED_DIR = ".disabled"
+INDEX_FILE = "node_index.json"
+CORE_CNR_ID = "comfy-core"
+# Packs that stay enabled regardless of what the workflows reference
+ALWAYS_KEEP = {"comfyuimanager"}
+
+
+def normalize(name):
+    """Compare pack identifiers case- and punctuation-insensitively."""
+    return re.sub(r"[^a-z0-9]", "", (name or "").lower())
+
+
+def load_workflow(path):
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def workflow_nodes(workflow):
+    """Yield ``(type, cnr_id, aux_id)`` for every node in a UI or API format workflow, subgraphs included."""
+    if not isinstance(workflow, dict):
+        return
+    if "nodes" in workflow:
+        for node in workflow.get("nodes") or []:
+            props = node.get("properties") or {}
+            yield node.get("type"), props.get("cnr_id"), props.get("aux_id")
+        for subgraph in (workflow.get("definitions") or {}).get("subgraphs") or []:
+            yield from workflow_nodes(subgraph)
+        return
+    # API format: {"<id>": {"class_type": ..., "inputs": {...}}}
+    for node in workflow.values():
+        if isinstance(node, dict) and "class_type" in node:
+            yield node["class_type"], None, None
+
+
+def _pyproject_name(pack_dir):
+    try:
+        with open(os.path.join(pack_dir, "pyproject.toml"), "r", encoding="utf-8") as fh:
+            match = re.search(r'^\s*name\s*=\s*["\']([^"\']+)["\']', fh.read(), re.M)
+        return match.group(1) if match else None
+    except OSError:
+        return None
+
+
+def _git_remote_repo(pack_dir):
+    try:
+        with open(os.path.join(pack_dir, ".git", "config"), "r", encoding="utf-8") as fh:
+            match = re.search(r"url\s*=\s*\S+?/([^/\s]+?)(?:\.git)?\s*$", fh.read(), re.M)
+        return match.group(1) if match else None
+    except OSError:
+        return None
+
+
+def pack_ids(pack_dir):
+    """Normalised identifiers a workflow may use for a pack: folder, registry name and repo name."""
+    name = os.path.basename(pack_dir.rstrip(os.sep))
+    if name.endswith(".py"):
+        name = name[:-3]
+    return {normalize(i) for i in (name, _pyproject_name(pack_dir), _git_remote_repo(pack_dir)) if i}
+
+
+def list_packs(custom_nodes_dir, parked=False):
+    """Pack names (directories or single .py files) that are active, or parked with `parked=True`."""
+    root = os.path.join(custom_nodes_dir, DISABLED_DIR) if parked else custom_nodes_dir
+    try:
+        entries = sorted(os.listdir(root))
+    except OSError:
+        return []
+    packs = []
+    for entry in entries:
+        path = os.path.join(root, entry)
+        if entry.startswith(".") or entry == "__pycache__" or entry.endswith(".disabled"):
+            continue
+        if os.path.isdir(path) or entry.endswith(".py"):
+            packs.append(entry)
+    return packs
+
+
+def load_index(comfy_dir):
+    try:
+        with open(os.path.join(comfy_dir, INDEX_FILE), "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"packs": {}}
+
+
+def _save_index(comfy_dir, index):
+    path = os.path.join(comfy_dir, INDEX_FILE)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as fh:
+        json.dump(index, fh, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def ensure_index(comfy_dir, python_exe, timeout=900):
+    """Return ``{"packs": {name: {"head": sha, "node_types": [...]}}}``, rescanning only when stale.
+
+    The scan boots ComfyUI with ``--quick-test-for-ci`` (load every node, then
+    exit) under the import profiler, which records the node types each pack
+    registers. Entries for parked packs are carried over from the cache.
+    Returns None when the scan fails, times out or records nothing; the cache
+    is left untouched then, so the next run scans again.
+    """
+    custom_nodes_dir = os.path.join(comfy_dir, "custom_nodes")
+    index = load_index(comfy_dir)
+    cached = index.get("packs", {})
+    active = list_packs(custom_nodes_dir)
+    heads = {name: git_head(os.path.join(custom_nodes_dir, name)) for name in active}
+    if all(name in cached and cached[name].get("head") == heads[name] for name in active):
+        return index
+
+    fd, profile_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        cmd = node_profiler.launch_command(python_exe, ["--quick-test-for-ci", "--cpu"],
+                                           profile=True, output=profile_path)
+        logger.info("Scanning custom node classes for the node index")
+        try:
+            result = subprocess.run(cmd, cwd=comfy_dir, capture_output=True, text=True, timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning("Node index scan did not finish: %s", e)
+            return None
+        profile = node_profiler.load_profile(profile_path)
+        if result.returncode != 0 or not profile.get("packs"):
+            tail = " ".join((result.stderr or "").strip().splitlines()[-3:])
+            logger.warning("Node index scan failed (exit status %d, %d packs recorded): %s",
+                           result.returncode, len(profile.get("packs") or []), tail)
+            return None
+    finally:
+        try:
+            os.remove(profile_path)
+        except OSError:
+            pass
+
+    scanned = {}
+    for record in profile.get("packs", []):
+        entry = scanned.setdefault(record["pack"], set())
+        entry.update(record.get("node_types") or [])
+    packs = {name: info for name, info in cached.items() if name not in heads}
+    for name in active:
+        packs[name] = {"head": heads[name], "node_types": sorted(scanned.get(name.rsplit(".py", 1)[0], ()))}
+    index = {"packs": packs}
+    _save_index(comfy_dir, index)
+    return index
+
+
+def plan_enablement(workflow_paths, custom_nodes_dir, index):
+    """Work out which packs to keep and which to park for `workflow_paths`.
+
+    Returns a dict with ``keep`` and ``park`` (pack names), ``missing``
+    (registry ids referenced by a workflow but not installed) and
+    ``unresolved`` (node types no installed pack is known to provide).
+    """
+    packs = list_packs(custom_nodes_dir) + list_packs(custom_nodes_dir, parked=True)
+    ids_by_pack = {}
+    for name in packs:
+        path = os.path.join(custom_nodes_dir, name)
+        if not os.path.exists(path):
+            path = os.path.join(custom_nodes_dir, DISABLED_DIR, name)
+        ids_by_pack[name] = pack_ids(path)
+    pack_by_id = {i: name for name, ids in ids_by_pack.items() for i in ids}
+    pack_by_type = {}
+    for name, info in index.get("packs", {}).items():
+        for node_type in info.get("node_types", []):
+            pack_by_type.setdefault(node_type, name)
+
+    keep = {name for name, ids in ids_by_pack.items() if ids & ALWAYS_KEEP}
+    missing, unresolved = set(), set()
+    for path in workflow_paths:
+        for node_type, cnr_id, aux_id in workflow_nodes(load_workflow(path)):
+            if cnr_id == CORE_CNR_ID:
+                continue
+            candidates = [normalize(cnr_id), normalize((aux_id or "").rsplit("/", 1)[-1])]
+            pack = next((pack_by_id[c] for c in candidates if c and c in pack_by_id), None)
+            pack = pack or pack_by_type.get(node_type)
+            if pack:
+                keep.add(pack)
+            elif cnr_id:
+                missing.add(cnr_id)
+            elif node_type:
+                # No registry id and not in the index: core, or a frontend-only
+                # node (e.g. "Label (rgthree)") whose pack is referenced elsewhere
+                unresolved.add(node_type)
+    return {
+        "keep": sorted(keep),
+        "park": sorted(set(packs) - keep),
+        "missing": sorted(missing),
+        "unresolved": sorted(unresolved),
+    }
+
+
+def _move(src, dest):
+    if os.path.exists(dest):
+        shutil.rmtree(dest) if os.path.isdir(dest) else os.remove(dest)
+    os.replace(src, dest)
+
+
+def apply_plan(custom_nodes_dir, plan):
+    """Move parked packs into ``.disabled/`` and bring kept ones back out."""
+    disabled_dir = os.path.join(custom_nodes_dir, DISABLED_DIR)
+    os.makedirs(disabled_dir, exist_ok=True)
+    for name in plan["park"]:
+        src = os.path.join(custom_nodes_dir, name)
+        if os.path.exists(src):
+            _move(src, os.path.join(disabled_dir, name))
+    for name in plan["keep"]:
+        src = os.path.join(disabled_dir, name)
+        if os.path.exists(src):
+            _move(src, os.path.join(custom_nodes_dir, name))
+
+
+def restore_all(custom_nodes_dir):
+    """Re-enable every parked pack."""
+    apply_plan(custom_nodes_dir, {"keep": list_packs(custom_nodes_dir, parked=True), "park": []})
+
+
+def keep_all_plan(custom_nodes_dir):
+    """Plan that parks nothing, used when the node index is unavailable."""
+    return {"keep": list_packs(custom_nodes_dir), "park": [], "missing": [], "unresolved": []}
+
+
+def enable_for_workflows(comfy_dir, python_exe, workflow_paths):
+    """Restore all packs, refresh the index if needed and park whatever the workflows do not use."""
+    custom_nodes_dir = os.path.join(comfy_dir, "custom_nodes")
+    restore_all(custom_nodes_dir)
+    index = ensure_index(comfy_dir, python_exe)
+    if index is None:
+        # Without the index, packs named only by node type would look unused; park nothing
+        logger.warning("Node index unavailable; keeping every custom node pack enabled")
+        return keep_all_plan(custom_nodes_dir)
+    plan = plan_enablement(workflow_paths, custom_nodes_dir, index)
+    apply_plan(custom_nodes_dir, plan)
+    logger.info("Enabled %d custom node packs, parked %d", len(plan["keep"]), len(plan["park"]))
+    if plan["missing"]:
+        logger.warning("Workflows reference packs that are not installed: %s", ", ".join(plan["missing"]))
+    return plan
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Enable only the custom nodes used by given workflows")
+    parser.add_argument("action", choices=["plan", "apply", "restore"])
+    parser.add_argument("workflows", nargs="*", help="Workflow JSON files (UI or API format)")
+    parser.add_argument("--comfy", default="ComfyUI", help="ComfyUI directory")
+    parser.add_argument("--python", default=None, help="Interpreter for the index scan (default: the ComfyUI venv)")
+    args = parser.parse_intermixed_args(argv)
+
+    custom_nodes_dir = os.path.join(args.comfy, "custom_nodes")
+    if args.action == "restore":
+        restore_all(custom_nodes_dir)
+        print(f"Re-enabled all packs in {custom_nodes_dir}")
+        return
+    if not args.workflows:
+        parser.error(f"{args.action} needs at least one workflow")
+    python_exe = args.python or os.path.abspath(os.path.join(args.comfy, "venv", "bin", "python"))
+    if args.action == "apply":
+        plan = enable_for_workflows(args.comfy, python_exe, args.workflows)
+    else:
+        index = ensure_index(args.comfy, python_exe)
+        plan = (plan_enablement(args.workflows, custom_nodes_dir, index) if index is not None
+                else keep_all_plan(custom_nodes_dir))
+    json.dump(plan, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Measure how long each custom node pack takes to import when ComfyUI boots.
+
+Run in place of ``main.py`` by the venv interpreter::
+
+    venv/bin/python node_profiler.py run --output node_import_profile.json -- main.py --listen
+
+ComfyUI loads every custom node through ``importlib.util.spec_from_file_location``
+followed by ``loader.exec_module``. The wrapper hooks that call, times each
+top-level pack, and records the RSS growth it caused plus the node classes it
+registered. The JSON artifact is rewritten after every pack, so it is usable
+while the server keeps running. ``report`` ranks the packs::
+
+    python node_profiler.py report node_import_profile.json
+
+This file only uses the standard library and no package-relative imports,
+because it runs inside the ComfyUI venv rather than the notebook kernel.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import runpy
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_OUTPUT = "node_import_profile.json"
+
+
+def _current_rss_mb():
+    try:
+        with open("/proc/self/statm", "r") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def pack_name(path):
+    """Name of the custom node pack that owns `path`, or None outside custom_nodes."""
+    parts = os.path.normpath(os.path.abspath(path)).split(os.sep)
+    if "custom_nodes" not in parts:
+        return None
+    idx = len(parts) - 1 - parts[::-1].index("custom_nodes")
+    if idx + 1 >= len(parts):
+        return None
+    name = parts[idx + 1]
+    return name[:-3] if name.endswith(".py") else name
+
+
+class NodeImportProfiler:
+    """Wrap exec_module for custom node packs and collect per-pack measurements."""
+
+    def __init__(self, output=DEFAULT_OUTPUT):
+        self.output = output
+        self.records = []
+        self.started = time.time()
+        self._depth = 0
+        self._original = None
+
+    def install(self):
+        self._original = importlib.util.spec_from_file_location
+        profiler = self
+
+        def spec_from_file_location(name, location=None, *args, **kwargs):
+            spec = profiler._original(name, location, *args, **kwargs)
+            pack = pack_name(location) if location else None
+            if spec is not None and spec.loader is not None and pack:
+                profiler._wrap_loader(spec.loader, pack, location)
+            return spec
+
+        importlib.util.spec_from_file_location = spec_from_file_location
+
+    def _wrap_loader(self, loader, pack, location):
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            if self._depth:
+                # A pack loading its own files this way is part of the outer measurement
+                return exec_module(module)
+            self._depth += 1
+            rss_before = _current_rss_mb()
+            start = time.perf_counter()
+            error = None
+            try:
+                return exec_module(module)
+            except BaseException as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                self._depth -= 1
+                elapsed = time.perf_counter() - start
+                rss_after = _current_rss_mb()
+                mappings = getattr(module, "NODE_CLASS_MAPPINGS", None) or {}
+                self.records.append({
+                    "pack": pack,
+                    "path": location,
+                    "seconds": round(elapsed, 4),
+                    "rss_delta_mb": round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+                    "peak_rss_mb": _peak_rss_mb(),
+                    "node_types": sorted(mappings) if isinstance(mappings, dict) else [],
+                    "error": error,
+                })
+                self.write()
+
+        loader.exec_module = timed_exec_module
+
+    def write(self):
+        data = {"started": self.started, "packs": self.records}
+        tmp_path = f"{self.output}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, indent=2)
+            os.replace(tmp_path, self.output)
+        except OSError:
+            pass
+
+
+def load_profile(path=DEFAULT_OUTPUT):
+    """Read a profile artifact; returns an empty profile when it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"packs": []}
+
+
+def format_report(profile, top=None):
+    """Ranked, human-readable summary of the slowest packs."""
+    packs = sorted(profile.get("packs", []), key=lambda r: r.get("seconds") or 0, reverse=True)
+    if not packs:
+        return "No custom node imports recorded."
+    total = sum(r.get("seconds") or 0 for r in packs)
+    lines = [f"Custom node imports: {len(packs)} packs, {total:.2f}s total"]
+    for rank, record in enumerate(packs[:top] if top else packs, 1):
+        rss = record.get("rss_delta_mb")
+        rss_text = f"{rss:+.0f} MB" if rss is not None else "n/a"
+        share = (record.get("seconds") or 0) / total * 100 if total else 0
+        status = "  FAILED" if record.get("error") else ""
+        lines.append(f"{rank:>3}. {record.get('seconds', 0):7.2f}s {share:5.1f}%  RSS {rss_text:>9}  "
+                     f"{len(record.get('node_types') or []):>4} nodes  {record.get('pack')}{status}")
+    return "\n".join(lines)
+
+
+def launch_command(python_exe, main_args, profile=False, output=DEFAULT_OUTPUT):
+    """Command that starts ComfyUI's main.py, optionally under the import profiler."""
+    if not profile:
+        return [python_exe, "main.py", *main_args]
+    return [python_exe, os.path.abspath(__file__), "run", "--output", output, "--", "main.py", *main_args]
+
+
+def _run(args):
+    script, script_args = args.command[0], args.command[1:]
+    profiler = NodeImportProfiler(os.path.abspath(args.output))
+    profiler.install()
+    sys.argv = [script, *script_args]
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    runpy.run_path(script, run_name="__main__")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile ComfyUI custom node import times")
+    sub = parser.add_subparsers(dest="action", required=True)
+    run_parser = sub.add_parser("run", help="Run a script (normally main.py) with import profiling")
+    run_parser.add_argument("--output", default=DEFAULT_OUTPUT, help="JSON artifact path")
+    run_parser.add_argument("command", nargs=argparse.REMAINDER, help="-- main.py [args...]")
+    report_parser = sub.add_parser("report", help="Print a ranked report from a JSON artifact")
+    report_parser.add_argument("path", nargs="?", default=DEFAULT_OUTPUT)
+    report_parser.add_argument("--top", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.action == "report":
+        print(format_report(load_profile(args.path), args.top))
+        return
+    if args.command and args.command[0] == "--":
+        args.command = args.command[1:]
+    if not args.command:
+        parser.error("run needs a script to execute, e.g. -- main.py --listen")
+    _run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Completion stamps that let install phases skip work whose inputs have not changed.
+
+Every phase hashes its inputs (package lists, requirement file digests, commit
+SHAs, the catalog selection...) into a fingerprint. After the phase succeeds
+the fingerprint is written to ``<stamp_dir>/<phase>.json``; the next run skips
+the phase while the fingerprint still matches, so a warm restart does not
+re-run apt and pip.
+"""
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(*parts):
+    """Stable sha256 over any JSON-serialisable inputs."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    """sha256 of a file's contents, or None when it does not exist."""
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError:
+        return None
+
+
+def git_head(repo_dir):
+    """Commit SHA checked out in `repo_dir`, or None."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=repo_dir,
+                                capture_output=True, text=True, timeout=30)
+    except Exception:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def git_remote_head(repo_dir):
+    """Commit SHA of the remote default branch (one cheap ls-remote round trip), or None."""
+    try:
+        result = subprocess.run(["git", "ls-remote", "origin", "HEAD"], cwd=repo_dir,
+                                capture_output=True, text=True, timeout=60)
+    except Exception:
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.split()[0]
+
+
+def venv_fingerprint(venv_path):
+    """Identity of a venv that changes whenever it is recreated or re-pointed at system site-packages."""
+    cfg_path = os.path.join(str(venv_path), "pyvenv.cfg")
+    try:
+        mtime = os.path.getmtime(cfg_path)
+    except OSError:
+        mtime = None
+    return fingerprint(file_digest(cfg_path), mtime)
+
+
+class PhaseStamps:
+    """Read and write per-phase completion stamps under `stamp_dir`."""
+
+    def __init__(self, stamp_dir):
+        self.stamp_dir = str(stamp_dir)
+
+    def _path(self, phase):
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in phase)
+        return os.path.join(self.stamp_dir, f"{safe}.json")
+
+    def current(self, phase):
+        """Fingerprint recorded for `phase`, or None."""
+        try:
+            with open(self._path(phase), "r", encoding="utf-8") as fh:
+                return json.load(fh).get("fingerprint")
+        except (OSError, ValueError):
+            return None
+
+    def is_current(self, phase, fp):
+        return fp is not None and self.current(phase) == fp
+
+    def record(self, phase, fp):
+        os.makedirs(self.stamp_dir, exist_ok=True)
+        path = self._path(phase)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"fingerprint": fp, "completed_at": time.time()}, fh)
+        os.replace(tmp_path, path)
+
+    def clear(self, phase):
+        try:
+            os.remove(self._path(phase))
+        except OSError:
+            pass
+
+    def run(self, phase, fp, func, *args, **kwargs):
+        """Run `func` unless `phase` already completed with fingerprint `fp`.
+
+        The stamp is only written when `func` returns something other than
+        False, so failed commands are retried on the next start. Returns True
+        when the phase ran, False when it was skipped.
+        """
+        if self.is_current(phase, fp):
+            logger.info("Skipping %s: inputs unchanged since last run", phase)
+            return False
+        self.clear(phase)
+        if func(*args, **kwargs) is not False:
+            self.record(phase, fp)
+        return True
@@ -0,0 +1,192 @@
+"""Download presets as data, compiled once into toggle positions.
+
+A preset is a list of ``(category id, pattern)`` pairs: ``ALL`` selects the
+whole category, anything else is a case-insensitive substring of an item's
+``name`` or ``filename`` (the matching the notebook presets always used) or
+``display_title``, which stays stable when the catalog renames a file.
+``PresetIndex`` walks ``category_data`` once and keeps, per preset, the
+``(category, subcategory, idx)`` positions it covers, so applying a preset is
+one pass over its own targets instead of a scan of the whole catalog. The
+index recompiles itself when a category list is replaced or resized.
+
+Widget updates are diffed the same way: ``sync_widgets`` compares each button
+with ``toggle_states`` and assigns ``_dom_classes`` only on the buttons whose
+state changed, so buttons that are already right cost no comm message.
+``bulk_toggle`` is the "everything on/off" variant used by All Downloads and
+the media master toggles. Each row button is its own widget model, so a bulk
+change still sends one message per changed button; a ``CatalogTable`` takes
+the whole category in one ``states`` message.
+"""
+
+ALL = "*"
+
+PRESETS = {
+    # All custom nodes plus the essential models for a general-purpose pod
+    "standard": (
+        ("custom-nodes", ALL),
+        ("checkpoints", "flux1-dev-fp8"),
+        ("checkpoints", "Flux_Fill"),
+        ("checkpoints", "SDXL_WildCard"),
+        ("checkpoints", "SD1.5_Epic_Realism"),
+        ("upscale", ALL),
+        ("controlnet", ALL),
+        ("vae", ALL),
+        ("clip", ALL),
+        ("clip-vision", ALL),
+    ),
+    "disney": (
+        ("custom-nodes", ALL),
+        ("checkpoints", "Pony Diffusion V6 XL"),
+        ("loras", "Disney_Princess_XL_v2.0.safetensors"),
+        ("loras", "ExpressiveH_Hentai_Style"),
+        ("loras", "Vixons_Pony_Gothic_Neon_v1.0.safetensors"),
+        ("loras", "Incase_Style_PonyXL_v3.0.safetensors"),
+        ("embeddings", "EasyNegative.pt"),
+        ("upscale", "4x_foolhardy_Remacri.pth"),
+    ),
+    "impasto": (
+        ("custom-nodes", ALL),
+        ("checkpoints", "A-mix_Illustrious"),
+        ("loras", "Ri-mix_Style_LORA"),
+    ),
+    "cinematic": (
+        ("custom-nodes", ALL),
+        ("checkpoints", "CyberRealistic_Pony"),
+        ("loras", "Crazy_Girlfriend_Mix"),
+        ("loras", "Insta_Baddie"),
+    ),
+}
+
+
+def iter_positions(items):
+    """Yield ``(subcategory, idx, item)`` for a flat list or a one-level subcategory map."""
+    if isinstance(items, dict):
+        for subcategory, sublist in items.items():
+            if isinstance(sublist, list):
+                for idx, item in enumerate(sublist):
+                    yield subcategory, idx, item
+    elif isinstance(items, list):
+        for idx, item in enumerate(items):
+            yield None, idx, item
+
+
+class PresetIndex:
+    """Preset name -> tuple of ``(category, subcategory, idx)`` positions in `category_data`."""
+
+    def __init__(self, category_data, presets=PRESETS):
+        self.category_data = category_data
+        self.presets = presets
+        self._signature = None
+        self._index = {}
+
+    def _current_signature(self):
+        return tuple((category, id(items), len(items)) for category, items in self.category_data.items())
+
+    def compile(self):
+        patterns = {}
+        for preset, entries in self.presets.items():
+            for category, pattern in entries:
+                patterns.setdefault(category, []).append((preset, pattern.lower()))
+        index = {preset: [] for preset in self.presets}
+        for category, wanted in patterns.items():
+            for subcategory, idx, item in iter_positions(self.category_data.get(category)):
+                if not isinstance(item, dict):
+                    continue
+                keys = [(item.get(key) or "").lower() for key in ("name", "filename", "display_title")]
+                for preset, pattern in wanted:
+                    if pattern == ALL or any(pattern in key for key in keys):
+                        index[preset].append((category, subcategory, idx))
+        # dict.fromkeys keeps order while dropping positions matched by two patterns
+        self._index = {preset: tuple(dict.fromkeys(targets)) for preset, targets in index.items()}
+        self._signature = self._current_signature()
+
+    def targets(self, preset):
+        if self._signature != self._current_signature():
+            self.compile()
+        return self._index.get(preset, ())
+
+
+def _nested(mapping, category, subcategory, create=False):
+    inner = mapping.setdefault(category, {}) if create else mapping.get(category, {})
+    if subcategory is not None:
+        inner = inner.setdefault(subcategory, {}) if create else inner.get(subcategory, {})
+    return inner
+
+
+def apply_targets(targets, enabled, toggle_states):
+    """Set every target in `toggle_states` to `enabled`; returns the positions that changed."""
+    enabled = bool(enabled)
+    changed = []
+    for category, subcategory, idx in targets:
+        states = _nested(toggle_states, category, subcategory, create=True)
+        if states.get(idx) != enabled:
+            states[idx] = enabled
+            changed.append((category, subcategory, idx))
+    return changed
+
+
+def active_classes(widget, active, css_class="active"):
+    """`widget`'s ``_dom_classes`` with `css_class` added or removed, or None when already right."""
+    classes = tuple(getattr(widget, "_dom_classes", ()))
+    if (css_class in classes) == bool(active):
+        return None
+    return classes + (css_class,) if active else tuple(c for c in classes if c != css_class)
+
+
+def send_updates(updates):
+    """Apply ``(widget, {trait: value})`` pairs, skipping traits that already hold their value.
+
+    Returns how many widgets changed.
+    """
+    sent = 0
+    for widget, traits in updates:
+        traits = {name: value for name, value in traits.items() if getattr(widget, name, None) != value}
+        for name, value in traits.items():
+            setattr(widget, name, value)
+        sent += bool(traits)
+    return sent
+
+
+def set_active(widget, active, css_class="active"):
+    """Add or remove `css_class` with a single trait assignment, skipping no-op updates."""
+    classes = active_classes(widget, active, css_class)
+    return bool(classes is not None and send_updates([(widget, {"_dom_classes": classes})]))
+
+
+def sync_widgets(targets, toggle_states, toggle_widgets):
+    """Make the toggle buttons for `targets` match `toggle_states`; returns how many were updated."""
+    updates = []
+    for category, subcategory, idx in targets:
+        btn = _nested(toggle_widgets, category, subcategory).get(idx)
+        if btn is None:
+            continue
+        classes = active_classes(btn, _nested(toggle_states, category, subcategory).get(idx, False))
+        if classes is not None:
+            updates.append((btn, {"_dom_classes": classes}))
+    return send_updates(updates)
+
+
+def bulk_toggle(category_data, enabled, toggle_states, toggle_widgets, categories=None):
+    """Switch every optional item in `categories` (all by default) on or off; required items stay on.
+
+    The state change is one pass over the catalog and only buttons whose state
+    actually changed are sent. Returns the changed positions.
+    """
+    optional, required = [], []
+    for category, items in category_data.items():
+        if categories is not None and category not in categories:
+            continue
+        for subcategory, idx, item in iter_positions(items):
+            if isinstance(item, dict):
+                (required if item.get("required") else optional).append((category, subcategory, idx))
+    changed = apply_targets(optional, enabled, toggle_states) + apply_targets(required, True, toggle_states)
+    sync_widgets(changed, toggle_states, toggle_widgets)
+    return changed
+
+
+def apply_preset(index, preset, enabled, toggle_states, toggle_widgets):
+    """Apply a preset: one batched state update, then one widget sync. Returns its targets."""
+    targets = index.targets(preset)
+    apply_targets(targets, enabled, toggle_states)
+    sync_widgets(targets, toggle_states, toggle_widgets)
+    return targets
@@ -0,0 +1,156 @@
+"""Named download selections saved as small JSON files.
+
+Every kernel starts with only the required items selected. A profile records
+the optional items that were switched on as ``[category id, item id]`` pairs.
+The item id is the catalog id (``loras/SDXL_Pop_Art_Style.safetensors``), so
+a profile keeps working when the library is reordered or an item is renamed::
+
+    {"version":1,"items":[["loras","loras/SDXL_Pop_Art_Style.safetensors"],...]}
+
+Profiles live in ``Profiles/`` at the repository root (``workspace/Uploads`` on
+the pod, so they survive pod restarts), or in ``COMFY_PROFILES`` when set.
+The notebook saves the current selection as ``last`` whenever an install or a
+download starts, and restores it on the next start. Only ``toggle_states`` is
+written there, so nothing in the UI has to be built first. The installer can
+use a profile without the notebook::
+
+    python ninja_start.py --profile portraits
+    python -m comfy_startup.profiles                 # list saved profiles
+    python -m comfy_startup.profiles portraits       # show one
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+from pathlib import Path
+
+from .presets import apply_targets, iter_positions, sync_widgets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = Path(__file__).resolve().parents[2] / "Profiles"
+LAST_PROFILE = "last"
+FORMAT_VERSION = 1
+
+
+def profile_dir(directory=None):
+    return Path(directory or os.environ.get("COMFY_PROFILES") or DEFAULT_DIR)
+
+
+def profile_path(name, directory=None):
+    """``<dir>/<name>.json``, with anything unsafe in a file name replaced by ``_``."""
+    safe = re.sub(r"[^\w.-]+", "_", name.strip()).strip("._") or LAST_PROFILE
+    return profile_dir(directory) / f"{safe}.json"
+
+
+def list_profiles(directory=None):
+    """Saved profile names, most recently saved first."""
+    try:
+        paths = sorted(profile_dir(directory).glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except OSError:
+        return []
+    return [path.stem for path in paths]
+
+
+def item_id(item):
+    """Stable id of a catalog item: its catalog id, or its filename for items outside the catalog."""
+    return item.get("catalog_id") or item.get("filename") or item.get("name") or ""
+
+
+def snapshot(category_data, toggle_states):
+    """``[category, item id]`` for every optional item that is switched on."""
+    selected = []
+    for category, items in category_data.items():
+        states = toggle_states.get(category, {})
+        for subcategory, idx, item in iter_positions(items):
+            if not isinstance(item, dict) or item.get("required"):
+                continue
+            scoped = states.get(subcategory, {}) if subcategory is not None else states
+            if scoped.get(idx):
+                selected.append([category, item_id(item)])
+    return selected
+
+
+def save_profile(name, category_data, toggle_states, directory=None):
+    """Write the current selection as profile `name`; returns the file path."""
+    path = profile_path(name, directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"version": FORMAT_VERSION, "items": snapshot(category_data, toggle_states)}
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        json.dump(record, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_profile(name, directory=None):
+    """``[(category, item id), ...]`` saved as `name`; empty when missing or unreadable."""
+    try:
+        with open(profile_path(name, directory), "r", encoding="utf-8") as fh:
+            record = json.load(fh)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(record, dict) or record.get("version") != FORMAT_VERSION:
+        logger.warning("Ignoring profile %r: unknown format", name)
+        return []
+    return [(category, entry) for category, entry in record.get("items", [])]
+
+
+def resolve(entries, category_data):
+    """Positions ``(category, subcategory, idx)`` for profile entries; unknown ids are skipped."""
+    wanted = {}
+    for category, entry in entries:
+        wanted.setdefault(category, set()).add(entry)
+    positions = []
+    for category, ids in wanted.items():
+        for subcategory, idx, item in iter_positions(category_data.get(category)):
+            if isinstance(item, dict) and item_id(item) in ids:
+                positions.append((category, subcategory, idx))
+    return positions
+
+
+def apply_profile(entries, category_data, toggle_states, toggle_widgets):
+    """Make the optional selection exactly `entries` and update the changed buttons.
+
+    All state changes happen first and only the buttons that actually flipped
+    are sent (see ``presets.sync_widgets``). Returns the changed positions.
+    """
+    wanted = set(resolve(entries, category_data))
+    off = [(category, subcategory, idx)
+           for category, items in category_data.items()
+           for subcategory, idx, item in iter_positions(items)
+           if isinstance(item, dict) and not item.get("required") and (category, subcategory, idx) not in wanted]
+    changed = apply_targets(off, False, toggle_states) + apply_targets(sorted(wanted, key=str), True, toggle_states)
+    sync_widgets(changed, toggle_states, toggle_widgets)
+    return changed
+
+
+def catalog_ids(entries, skip_categories=("custom-nodes",)):
+    """Catalog ids from profile entries, for installers that take a download list."""
+    return [entry for category, entry in entries if category not in skip_categories]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List saved download profiles or show one")
+    parser.add_argument("name", nargs="?", help="profile to show (default: list all)")
+    parser.add_argument("--dir", default=None, help="profile directory (default: Profiles/ at the repository root)")
+    args = parser.parse_args(argv)
+
+    if args.name is None:
+        names = list_profiles(args.dir)
+        if not names:
+            print("No profiles saved yet.", file=sys.stderr)
+        for name in names:
+            print(f"{name}  ({len(load_profile(name, args.dir))} items)")
+        return
+    entries = load_profile(args.name, args.dir)
+    if not entries:
+        print(f"Profile {args.name!r} is empty or missing.", file=sys.stderr)
+    for category, entry in entries:
+        print(f"{category:15s} {entry}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Coalesced, rate-limited widget updates from worker threads.
+
+The installer and the download pool report progress from background threads,
+and each report used to rebuild an HTML string and assign it to a widget
+straight away: one comm message per finished task, or per chunk once
+byte-level progress is reported. ``ProgressHub.publish`` only records the
+latest value per widget under a lock. A single flusher thread writes the
+pending values at a fixed frame rate, and skips widgets whose value is
+unchanged::
+
+    hub = ProgressHub(fps=5)
+    hub.publish(progress_html, render_bar(pct))   # from any thread, any rate
+    hub.set(status_html, "Done")                  # final states: written now, drops pending ones
+
+The flusher starts on the first publish and exits after ``IDLE_TIMEOUT``
+seconds without updates, so an idle notebook keeps no extra thread alive.
+"""
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FPS = 5
+IDLE_TIMEOUT = 5.0
+
+
+class ProgressHub:
+    """Latest-value-wins mailbox for widget ``value`` traits, flushed at `fps`."""
+
+    def __init__(self, fps=DEFAULT_FPS, idle_timeout=IDLE_TIMEOUT):
+        self.interval = 1.0 / fps
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    def publish(self, widget, value):
+        """Queue `value` for `widget`; cheap enough to call from every worker callback."""
+        with self._lock:
+            self._pending[id(widget)] = (widget, value)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="progress-hub", daemon=True)
+                self._thread.start()
+
+    def set(self, widget, value):
+        """Write `value` now, dropping anything still queued for `widget` so it cannot land afterwards."""
+        with self._lock:
+            self._pending.pop(id(widget), None)
+            self._write(widget, value)
+
+    def flush(self):
+        """Write every queued value; returns how many widgets changed."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return sum(self._write(widget, value) for widget, value in pending.values())
+
+    @staticmethod
+    def _write(widget, value):
+        if getattr(widget, "value", None) == value:
+            return False
+        try:
+            widget.value = value
+        except Exception as e:
+            logger.debug("Progress update for %r failed: %s", widget, e)
+            return False
+        return True
+
+    def _run(self):
+        idle_since = time.monotonic()
+        while True:
+            time.sleep(self.interval)
+            if self.flush():
+                idle_since = time.monotonic()
+            with self._lock:
+                if not self._pending and time.monotonic() - idle_since > self.idle_timeout:
+                    self._thread = None
+                    return
@@ -0,0 +1,181 @@
+"""Fit a download selection to the pod's GPU memory and disk budget.
+
+Costs come from the item itself (``size``/``vram`` strings in Library.py),
+the ``catalog_meta`` sidecar, and per-category defaults when neither is known.
+VRAM is checked per model, since ComfyUI loads one checkpoint at a time, plus
+a peak estimate for the largest checkpoint loaded together with a ControlNet.
+Disk is checked against the total of everything not already on disk.
+
+``plan_selection`` keeps every required item, then adds the wanted ones in
+category priority order, smallest first, while they fit. Items that cannot
+fit are dropped and the reason is reported::
+
+    plan = plan_selection(wanted_positions(category_data, toggle_states), category_data,
+                          detect_budget("/workspace"), comfy_dir="ComfyUI", meta=load_meta())
+    changed = apply_selection(plan, toggle_states)
+"""
+import os
+import re
+import shutil
+import subprocess
+from collections import namedtuple
+
+from .catalog_meta import RECOMMENDED_VRAM_GB, format_size, guess_arch
+from .presets import apply_targets, iter_positions
+
+GB = 1 << 30
+
+# Fallback download size per UI category when neither the item nor the sidecar knows it
+DEFAULT_SIZE = {
+    "checkpoints": int(6.5 * GB),
+    "loras": 200 << 20,
+    "embeddings": 1 << 20,
+    "clip": 5 * GB,
+    "clip-vision": int(1.7 * GB),
+    "vae": 330 << 20,
+    "controlnet": int(2.5 * GB),
+    "upscale": 70 << 20,
+    "additional": 2 * GB,
+}
+
+# Lower sorts first: small shared dependencies before the large models that use them
+CATEGORY_PRIORITY = ("custom-nodes", "vae", "clip", "clip-vision", "embeddings", "upscale",
+                     "checkpoints", "loras", "controlnet", "additional")
+
+# Free space to leave on the volume for outputs, pip caches and the venv
+DISK_HEADROOM = 5 * GB
+
+Budget = namedtuple("Budget", ["vram_gb", "disk_free"])
+Plan = namedtuple("Plan", ["selected", "dropped", "disk_bytes", "peak_vram_gb", "warnings"])
+
+
+def detect_budget(path="/workspace"):
+    """GPU memory (GB, largest card) and free disk bytes at `path`; either may be None when unknown."""
+    vram_gb = None
+    try:
+        result = subprocess.run(["nvidia-smi", "--query-gpu=memory.total", "--format=csv,noheader,nounits"],
+                                capture_output=True, text=True, timeout=30)
+        if result.returncode == 0:
+            totals = [int(line) for line in result.stdout.split() if line.strip().isdigit()]
+            vram_gb = max(totals) / 1024 if totals else None
+    except Exception:
+        vram_gb = None
+    try:
+        disk_free = shutil.disk_usage(path).free
+    except OSError:
+        disk_free = None
+    return Budget(vram_gb, disk_free)
+
+
+def parse_size(text):
+    """"2.5GB"/"890MB"/"~12GB" -> bytes, or None."""
+    match = re.search(r"([\d.]+)\s*([KMGT]?)B", text or "", re.I)
+    if not match:
+        return None
+    scale = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}[match.group(2).upper()]
+    return int(float(match.group(1)) * scale)
+
+
+def item_cost(category, item, meta=None):
+    """``(download bytes, VRAM GB or None)`` for a catalog item."""
+    cached = (meta or {}).get(item.get("catalog_id"), {})
+    size = cached.get("size") or parse_size(item.get("size")) or DEFAULT_SIZE.get(category, 0)
+    vram = cached.get("vram_gb")
+    if vram is None and item.get("vram"):
+        vram = (parse_size(item["vram"]) or 0) / GB or None
+    if vram is None and category == "checkpoints":
+        vram = RECOMMENDED_VRAM_GB.get(guess_arch(item.get("filename"), item.get("name")))
+    if category == "controlnet":
+        # ControlNets sit in VRAM next to the checkpoint; their weights are the cost
+        vram = size / GB
+    return size, vram
+
+
+def _position_item(category_data, category, subcategory, idx):
+    items = category_data.get(category)
+    if subcategory is not None:
+        items = (items or {}).get(subcategory)
+    try:
+        return items[idx]
+    except (IndexError, KeyError, TypeError):
+        return None
+
+
+def wanted_positions(category_data, toggle_states):
+    """``(category, subcategory, idx)`` for every item that is toggled on or required."""
+    positions = []
+    for category, items in category_data.items():
+        states = toggle_states.get(category, {})
+        for subcategory, idx, item in iter_positions(items):
+            if not isinstance(item, dict):
+                continue
+            state = (states.get(subcategory, {}) if subcategory is not None else states).get(idx, False)
+            if state is True or item.get("required"):
+                positions.append((category, subcategory, idx))
+    return positions
+
+
+def _already_downloaded(item, category, comfy_dir):
+    if not comfy_dir or category == "custom-nodes":
+        return False
+    url = item.get("url") or item.get("download_url") or ""
+    filename = item.get("filename") or url.split("/")[-1].split("?")[0]
+    dest_dir = item.get("dest_dir") or f"models/{category}"
+    return bool(filename) and os.path.exists(os.path.join(comfy_dir, dest_dir, filename))
+
+
+def plan_selection(positions, category_data, budget, comfy_dir=None, meta=None):
+    """Keep the required positions plus as many wanted ones as fit `budget`; see the module docstring."""
+    disk_limit = budget.disk_free - DISK_HEADROOM if budget.disk_free is not None else None
+    candidates, dropped, warnings = [], [], []
+    for position in dict.fromkeys(positions):
+        item = _position_item(category_data, *position)
+        if not isinstance(item, dict):
+            continue
+        size, vram = item_cost(position[0], item, meta)
+        if _already_downloaded(item, position[0], comfy_dir):
+            size = 0
+        candidates.append((position, item, size, vram))
+
+    def order(candidate):
+        position, item, size, _ = candidate
+        rank = CATEGORY_PRIORITY.index(position[0]) if position[0] in CATEGORY_PRIORITY else len(CATEGORY_PRIORITY)
+        return (not item.get("required"), rank, size)
+
+    selected, disk_used, peak_checkpoint, peak_controlnet = [], 0, 0, 0
+    for position, item, size, vram in sorted(candidates, key=order):
+        label = item.get("display_title") or item.get("name") or item.get("filename") or str(position)
+        required = item.get("required", False)
+        if (not required and budget.vram_gb is not None and vram
+                and position[0] == "checkpoints" and vram > budget.vram_gb):
+            dropped.append((position, f"{label} needs ~{vram:g} GB VRAM, GPU has {budget.vram_gb:.0f} GB"))
+            continue
+        # Already-downloaded items cost nothing, so they stay even on a full volume
+        if not required and size and disk_limit is not None and disk_used + size > disk_limit:
+            dropped.append((position, f"{label} ({format_size(size) or '0MB'}) does not fit the remaining disk"))
+            continue
+        selected.append(position)
+        disk_used += size
+        if position[0] == "checkpoints" and vram:
+            peak_checkpoint = max(peak_checkpoint, vram)
+        elif position[0] == "controlnet" and vram:
+            peak_controlnet = max(peak_controlnet, vram)
+
+    peak_vram = peak_checkpoint + peak_controlnet
+    if budget.vram_gb is not None and peak_vram > budget.vram_gb:
+        warnings.append(f"Largest checkpoint plus a ControlNet needs ~{peak_vram:.1f} GB VRAM; "
+                        f"the GPU has {budget.vram_gb:.0f} GB, expect offloading or OOM")
+    if any("disk" in reason for _, reason in dropped):
+        warnings.append(f"Selection trimmed to {format_size(disk_used) or '0MB'} to keep "
+                        f"{format_size(DISK_HEADROOM)} free on the volume")
+    warnings.extend(reason for _, reason in dropped)
+    return Plan(selected, dropped, disk_used, peak_vram, warnings)
+
+
+def apply_selection(plan, toggle_states):
+    """Write a plan back into `toggle_states`: dropped positions off, selected ones on.
+
+    Returns the positions that changed, for ``presets.sync_widgets``.
+    """
+    return (apply_targets([position for position, _ in plan.dropped], False, toggle_states)
+            + apply_targets(plan.selected, True, toggle_states))
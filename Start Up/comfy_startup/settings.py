@@ -0,0 +1,133 @@
+"""Small persistent settings store: the CivitAI token and UI preferences.
+
+The notebook used to append a timestamped line to ``Civit Ai Key/CivitAi Api
+Key.txt`` on every keystroke in the token box (twice, through a duplicated
+observer), and reading the key meant scanning that ever-growing file.
+``SettingsStore`` keeps every setting in one JSON object in memory. ``get`` is
+a dict lookup, and ``set`` marks the store dirty and (re)arms a short timer.
+The file is rewritten once typing pauses, atomically, through a temporary
+file and ``os.replace``, so a crash leaves either the old or the new settings
+on disk::
+
+    settings = open_settings()
+    settings.get("civitai_token", "")
+    settings.set("civitai_token", widget.value)    # cheap, call it per keystroke
+
+Pending changes are also written at interpreter exit. The file lives at the
+repository root as ``.comfy_settings.json`` (override with ``COMFY_SETTINGS``),
+is created readable by the owner only, and is not committed. On first use the
+most recent key from the old text file is carried over.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_PATH = ROOT / ".comfy_settings.json"
+LEGACY_KEY_FILE = ROOT / "Civit Ai Key" / "CivitAi Api Key.txt"
+DEBOUNCE_SECONDS = 1.0
+
+
+def settings_path():
+    return Path(os.environ.get("COMFY_SETTINGS") or DEFAULT_PATH)
+
+
+def read_legacy_key(path=LEGACY_KEY_FILE):
+    """Most recent key in the old append-only key file, or "" when there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            lines = [line.strip() for line in fh]
+    except OSError:
+        return ""
+    keys = [line for line in lines if line and not line.startswith("#")]
+    return keys[-1] if keys else ""
+
+
+class SettingsStore:
+    """In-memory settings with debounced, atomic write-behind to one JSON file."""
+
+    def __init__(self, path=None, delay=DEBOUNCE_SECONDS):
+        self.path = Path(path or settings_path())
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._dirty = False
+        self._values = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                values = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return values if isinstance(values, dict) else {}
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def get(self, key, default=None):
+        return self._values.get(key, default)
+
+    def set(self, key, value):
+        """Change one setting; it reaches disk `delay` seconds after the last change."""
+        self.update({key: value})
+
+    def update(self, values):
+        with self._lock:
+            changed = {k: v for k, v in values.items() if self._values.get(k) != v}
+            if not changed:
+                return
+            self._values.update(changed)
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes now; returns True when the file was rewritten."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return False
+            try:
+                self._write(dict(self._values))
+            except OSError as e:
+                logger.warning("Could not save settings to %s: %s", self.path, e)
+                return False
+            self._dirty = False
+            return True
+
+    def _write(self, values):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            json.dump(values, fh, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+_stores = {}
+
+
+def open_settings(path=None):
+    """The shared store for `path`, created on first use with the legacy key migrated in."""
+    path = Path(path or settings_path()).resolve()
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = SettingsStore(path)
+        if "civitai_token" not in store:
+            legacy = read_legacy_key()
+            if legacy:
+                store.set("civitai_token", legacy)
+                store.flush()
+        atexit.register(store.flush)
+    return store
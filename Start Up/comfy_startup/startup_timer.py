@@ -0,0 +1,99 @@
+"""Time from running the notebook cell to the first paint and to usable controls.
+
+Start_Up.py notes when ``%run`` begins and displays a small shell (title and
+a loading line) before it loads the catalog. ``first_paint`` is the moment
+that shell is on screen. The catalog, presets and controls are then built
+and swapped into the shell, and ``ready`` is when they are clickable. A few
+milestones in between are marked as well. Each run appends one JSON line to ``.startup_metrics.jsonl`` at the repository root
+(override with ``COMFY_STARTUP_METRICS``), so regressions show up across
+pods and commits::
+
+    python -m comfy_startup.startup_timer            # recent runs, median and p90
+    python -m comfy_startup.startup_timer --last 50
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG = Path(__file__).resolve().parents[2] / ".startup_metrics.jsonl"
+# Milestones copied to the top level of each record and summarized by the CLI
+SUMMARY_MARKS = ("first_paint", "ready")
+
+
+def log_path():
+    return Path(os.environ.get("COMFY_STARTUP_METRICS") or DEFAULT_LOG)
+
+
+class StartupTimer:
+    """Milestones since `started` (a ``time.perf_counter()`` value), written out by ``finish``."""
+
+    def __init__(self, started=None):
+        self.started = time.perf_counter() if started is None else started
+        self.marks = {}
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def mark(self, name):
+        self.marks[name] = round(self.elapsed(), 4)
+
+    def finish(self, name="ready"):
+        """Record the final milestone, append the run to the metrics log and return its seconds."""
+        self.mark(name)
+        record = {"time": int(time.time()), "marks": self.marks}
+        record.update((key, self.marks[key]) for key in SUMMARY_MARKS if key in self.marks)
+        try:
+            path = log_path()
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.debug("Could not record startup metrics: %s", e)
+        return self.marks[name]
+
+
+def load_runs(path=None):
+    runs = []
+    try:
+        with open(path or log_path(), "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    runs.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return runs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize recorded notebook startup times")
+    parser.add_argument("--log", default=None, help="metrics file (default: .startup_metrics.jsonl at the repository root)")
+    parser.add_argument("--last", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    runs = [r for r in load_runs(args.log) if "first_paint" in r][-args.last:]
+    if not runs:
+        print("No startup runs recorded yet.", file=sys.stderr)
+        return
+    for run in runs:
+        marks = " ".join(f"{k}={v:.2f}s" for k, v in run.get("marks", {}).items() if k not in SUMMARY_MARKS)
+        ready = f"ready {run['ready']:.2f}s  " if "ready" in run else ""
+        print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run['time']))}  "
+              f"first paint {run['first_paint']:.2f}s  {ready}{marks}")
+    for key in SUMMARY_MARKS:
+        values = sorted(r[key] for r in runs if key in r)
+        if values:
+            p90 = values[min(len(values) - 1, int(len(values) * 0.9))]
+            print(f"{key.replace('_', ' ')}: median {statistics.median(values):.2f}s  p90 {p90:.2f}s  "
+                  f"over {len(values)} runs")
+
+
+if __name__ == "__main__":
+    main()
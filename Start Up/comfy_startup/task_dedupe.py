@@ -0,0 +1,108 @@
+"""Download each artifact once, however many names the selection asks for it under.
+
+The catalog lists the same file more than once (SDXL base in two checkpoint
+lists, Pony V6 under two names, Hyper-SDXL under two LoRA groups), and "All
+downloads" would fetch every copy. ``coalesce_tasks`` groups download tasks
+that share a normalized URL, a Civitai version id or a known sha256, keeps one
+task per group and turns the other destinations into links that
+``materialize_links`` creates once the download has finished::
+
+    download_tasks, links = coalesce_tasks(download_tasks)
+    ...run the downloads...
+    materialize_links(links)
+
+Links are hardlinks when source and destination share a filesystem and full
+copies otherwise.
+"""
+import logging
+import os
+import shutil
+from urllib.parse import parse_qs, urlparse
+
+from .catalog import normalize_url
+from .model_aliases import source_ids
+
+logger = logging.getLogger(__name__)
+
+
+def task_keys(task):
+    """Identities a download task can be matched on."""
+    url = task.get("url") or ""
+    keys = []
+    if task.get("sha256"):
+        keys.append(f"sha256:{task['sha256'].lower()}")
+    for source_id in source_ids(url):
+        if source_id.startswith("civitai:"):
+            # size/fp/format only pick a variant of the primary file; type selects a different file
+            file_type = (parse_qs(urlparse(url).query).get("type") or ["model"])[0].lower()
+            source_id = f"{source_id}:{file_type}"
+        keys.append(source_id)
+    if url:
+        keys.append(f"url:{normalize_url(url)}")
+    return keys
+
+
+def _exists(path):
+    try:
+        return os.path.getsize(path) > 0
+    except OSError:
+        return False
+
+
+def coalesce_tasks(tasks):
+    """Return ``(download_tasks, links)`` with one task per distinct artifact.
+
+    `links` is a list of ``(source path, destination path)`` for every other
+    requested destination; the first task of each group is the one kept.
+    """
+    parent = list(range(len(tasks)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, task in enumerate(tasks):
+        for key in task_keys(task) + [f"dest:{os.path.abspath(task['dest_path'])}"]:
+            if key in owner:
+                parent[find(i)] = find(owner[key])
+            else:
+                owner[key] = i
+
+    groups = {}
+    for i in range(len(tasks)):
+        groups.setdefault(find(i), []).append(tasks[i])
+
+    download_tasks, links = [], []
+    for group in groups.values():
+        primary = group[0]
+        download_tasks.append(primary)
+        source = os.path.abspath(primary["dest_path"])
+        dests = dict.fromkeys(os.path.abspath(task["dest_path"]) for task in group)
+        links.extend((source, dest) for dest in dests if dest != source)
+    if len(download_tasks) < len(tasks):
+        logger.info("Coalesced %d download tasks into %d downloads", len(tasks), len(download_tasks))
+    return download_tasks, links
+
+
+def materialize_links(links):
+    """Hardlink (or copy across filesystems) each downloaded source to its extra destinations.
+
+    Returns the number of destinations created; sources that failed to
+    download are skipped.
+    """
+    created = 0
+    for source, dest in links:
+        if not _exists(source) or _exists(dest):
+            continue
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.lexists(dest):
+            os.remove(dest)
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copy2(source, dest)
+        created += 1
+    return created
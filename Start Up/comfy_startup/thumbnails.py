@@ -0,0 +1,115 @@
+"""Small cached thumbnails for the decorative preset previews.
+
+The preset rows used to inline the full-size ComfyUI PNGs (1.2-1.5 MB each)
+as base64, three times per preset, which put over 10 MB into the notebook
+output and the widget comm channel. ``thumbnail`` downscales a source image
+once with Pillow and writes the result to a ``.thumbs`` directory next to it.
+The file name carries a digest of the source contents, so an edited image
+gets a fresh thumbnail and unchanged ones are reused across pods on the same
+volume. The digest is memoized per ``(path, mtime, size)``, so the source is
+only re-read after it changes.
+
+``preview_css`` puts the thumbnail in one CSS class, so HTML that shows it
+several times carries the image data only once::
+
+    thumb = thumbnail("Uploads/ComfyUI_00083_.png")
+    html = f"<style>{preview_css(thumb, 'disney-thumb')}</style>" + "<div class='preset-thumb disney-thumb'></div>" * 3
+
+Pillow is imported on the first thumbnail that has to be rendered; without it
+the source file is served as-is, as before.
+"""
+import base64
+import hashlib
+import mimetypes
+import os
+from collections import namedtuple
+
+THUMB_DIR = ".thumbs"
+# Twice the 180px the previews are drawn at, for high-DPI screens
+DEFAULT_WIDTH = 360
+QUALITY = 80
+
+Thumb = namedtuple("Thumb", ["path", "uri", "width", "height"])
+
+_digests = {}
+_uris = {}
+
+
+def source_digest(path):
+    """Short sha1 of the file contents, recomputed only when mtime or size change."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _digests:
+        h = hashlib.sha1()
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        _digests[key] = h.hexdigest()[:16]
+    return _digests[key]
+
+
+def thumbnail_path(path, width=DEFAULT_WIDTH, fmt="webp"):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(path)), THUMB_DIR,
+                        f"{stem}.{source_digest(path)}.{width}.{fmt}")
+
+
+def _pil_image():
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    return Image
+
+
+def _render(Image, path, dest, width, fmt):
+    with Image.open(path) as img:
+        img.thumbnail((width, width * 4))
+        if fmt == "jpg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp_path = f"{dest}.{os.getpid()}.tmp"
+        img.save(tmp_path, "WEBP" if fmt == "webp" else "JPEG", quality=QUALITY)
+        os.replace(tmp_path, dest)
+
+
+def data_uri(path):
+    """``data:`` URI for a file, memoized per ``(path, mtime)``."""
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _uris:
+        mime = mimetypes.guess_type(path)[0] or "image/png"
+        with open(path, "rb") as fh:
+            _uris[key] = f"data:{mime};base64,{base64.b64encode(fh.read()).decode('ascii')}"
+    return _uris[key]
+
+
+def thumbnail(path, width=DEFAULT_WIDTH, fmt="webp"):
+    """Cached thumbnail of `path` as a ``Thumb``, or None when the source cannot be read.
+
+    Falls back to the source file itself when Pillow is missing or cannot encode it.
+    """
+    try:
+        if not os.path.isfile(path):
+            return None
+        Image = _pil_image()
+        if Image is not None:
+            dest = thumbnail_path(path, width, fmt)
+            try:
+                if not os.path.isfile(dest):
+                    _render(Image, path, dest, width, fmt)
+                with Image.open(dest) as img:
+                    size = img.size
+                return Thumb(dest, data_uri(dest), *size)
+            except (OSError, ValueError):
+                pass
+        return Thumb(path, data_uri(path), None, None)
+    except OSError:
+        return None
+
+
+def preview_css(thumb, css_class):
+    """CSS rule that shows `thumb` as the background of `css_class`."""
+    rule = f".{css_class} {{ background-image: url('{thumb.uri}');"
+    if thumb.width and thumb.height:
+        rule += f" aspect-ratio: {thumb.width} / {thumb.height};"
+    return rule + " }"
@@ -0,0 +1,166 @@
+"""Detect a preinstalled CUDA torch and plan how the ComfyUI venv should use it.
+
+RunPod PyTorch images already ship a torch build that matches the GPU driver.
+Creating the venv with ``--system-site-packages`` lets ComfyUI reuse that build
+instead of downloading several gigabytes of wheels on every pod start.
+"""
+import json
+import logging
+import os
+import re
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+TORCH_INDEX_BASE = "https://download.pytorch.org/whl"
+TORCH_PACKAGES = "torch torchvision torchaudio"
+
+# Wheel indexes published by download.pytorch.org, newest first, paired with
+# the CUDA version the driver has to support to run that build.
+CUDA_WHEEL_INDEXES = [
+    ((12, 8), "cu128"),
+    ((12, 6), "cu126"),
+    ((12, 4), "cu124"),
+    ((12, 1), "cu121"),
+    ((11, 8), "cu118"),
+]
+
+# Runs inside the candidate interpreter. Reads torch/version.py directly so the
+# probe does not pay for a full `import torch`.
+_PROBE_SCRIPT = r"""
+import importlib.metadata as md, importlib.util, json, os, re, sys
+info = {'python': '%d.%d' % sys.version_info[:2]}
+spec = importlib.util.find_spec('torch')
+if spec and spec.submodule_search_locations:
+    info['torch'] = md.version('torch')
+    version_py = os.path.join(list(spec.submodule_search_locations)[0], 'version.py')
+    try:
+        with open(version_py, encoding='utf-8') as fh:
+            match = re.search(r"^cuda[^=]*=\s*['\"]([\d.]+)['\"]", fh.read(), re.M)
+        info['cuda'] = match.group(1) if match else None
+    except OSError:
+        info['cuda'] = None
+    for name in ('torchvision', 'torchaudio'):
+        try:
+            info[name] = md.version(name)
+        except md.PackageNotFoundError:
+            info[name] = None
+print(json.dumps(info))
+"""
+
+
+def _parse_version(text):
+    """Return (major, minor) from a version string like '12.1' or None."""
+    match = re.match(r"(\d+)\.(\d+)", text or "")
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def detect_driver_cuda_version():
+    """Return the highest CUDA version the NVIDIA driver supports as (major, minor), or None."""
+    try:
+        result = subprocess.run(["nvidia-smi"], capture_output=True, text=True, timeout=30)
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    match = re.search(r"CUDA Version:\s*(\d+\.\d+)", result.stdout)
+    return _parse_version(match.group(1)) if match else None
+
+
+def select_torch_index(driver_cuda):
+    """Pick the newest PyTorch wheel index the driver can run (CPU index without a GPU)."""
+    if driver_cuda is None:
+        return f"{TORCH_INDEX_BASE}/cpu"
+    for required, tag in CUDA_WHEEL_INDEXES:
+        if driver_cuda >= required:
+            return f"{TORCH_INDEX_BASE}/{tag}"
+    return f"{TORCH_INDEX_BASE}/cpu"
+
+
+def detect_system_torch(python="python3"):
+    """Return torch/torchvision/torchaudio versions visible to `python`, or None if torch is missing."""
+    try:
+        result = subprocess.run([python, "-c", _PROBE_SCRIPT], capture_output=True, text=True, timeout=60)
+        info = json.loads(result.stdout.strip() or "{}")
+    except Exception:
+        return None
+    return info if info.get("torch") else None
+
+
+def is_compatible(info, driver_cuda):
+    """True when the system torch stack is complete and built for a CUDA the driver supports."""
+    if not info or not info.get("torchvision") or not info.get("torchaudio"):
+        return False
+    if driver_cuda is None:
+        # No GPU: any build runs in CPU mode, so reuse whatever is installed
+        return True
+    built_for = _parse_version(info.get("cuda"))
+    return built_for is not None and built_for <= driver_cuda
+
+
+def plan_torch_setup(python="python3"):
+    """Decide whether the venv should reuse the system torch or install a matching wheel set.
+
+    Returns a plain dict so it can be logged or passed between threads:
+    ``reuse_system_torch``, ``system_torch``, ``driver_cuda`` and ``index_url``.
+    """
+    driver_cuda = detect_driver_cuda_version()
+    info = detect_system_torch(python)
+    reuse = is_compatible(info, driver_cuda)
+    plan = {
+        "python": python,
+        "reuse_system_torch": reuse,
+        "system_torch": info,
+        "driver_cuda": "%d.%d" % driver_cuda if driver_cuda else None,
+        "index_url": select_torch_index(driver_cuda),
+    }
+    if reuse:
+        logger.info("Reusing system torch %s (CUDA %s, driver supports %s)",
+                    info.get("torch"), info.get("cuda"), plan["driver_cuda"])
+    else:
+        logger.info("No compatible system torch found; will install from %s", plan["index_url"])
+    return plan
+
+
+def venv_command(plan, venv_dir="venv"):
+    """Return the shell command that creates the ComfyUI venv for `plan`."""
+    python = (plan or {}).get("python", "python3")
+    if plan and plan.get("reuse_system_torch"):
+        return f"{python} -m venv --system-site-packages {venv_dir}"
+    return f"{python} -m venv {venv_dir}"
+
+
+def enable_system_site_packages(venv_path):
+    """Overlay system site-packages onto an existing venv by flipping its pyvenv.cfg flag.
+
+    Venvs created before system torch reuse existed were built without
+    ``--system-site-packages``; recreating them would throw away every other
+    installed package, so the flag is switched in place instead.
+    """
+    cfg_path = os.path.join(venv_path, "pyvenv.cfg")
+    try:
+        with open(cfg_path, "r", encoding="utf-8") as fh:
+            lines = fh.readlines()
+    except OSError:
+        return False
+    changed = False
+    for i, line in enumerate(lines):
+        key, _, value = line.partition("=")
+        if key.strip() == "include-system-site-packages" and value.strip().lower() != "true":
+            lines[i] = "include-system-site-packages = true\n"
+            changed = True
+    if changed:
+        with open(cfg_path, "w", encoding="utf-8") as fh:
+            fh.writelines(lines)
+        logger.info("Enabled system site-packages for %s", venv_path)
+    return True
+
+
+def torch_install_command(pip_cmd, plan):
+    """Return the pip command that installs torch for `plan`, or None when the system build is reused."""
+    if plan and plan.get("reuse_system_torch"):
+        return None
+    index_url = (plan or {}).get("index_url") or select_torch_index(detect_driver_cuda_version())
+    return f'"{pip_cmd}" install {TORCH_PACKAGES} --index-url {index_url}'
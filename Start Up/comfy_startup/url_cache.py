@@ -0,0 +1,158 @@
+"""Remember where Civitai/Hugging Face download URLs redirect to, until the signature expires.
+
+``civitai.com/api/download/models/<id>`` and ``huggingface.co/.../resolve/...``
+answer with a redirect to a short-lived signed CDN URL. Resolving that redirect
+on every retry or wget fallback re-hits the API origin and counts against its
+rate limits. ``resolve`` follows the redirect chain once and stores the final
+URL together with the expiry encoded in its signature (``X-Amz-Date`` +
+``X-Amz-Expires``, ``Expires``, ``exp`` or ``se``); ``get`` streams through the
+cached URL and re-resolves only when it has expired or the CDN answers
+401/403/410.
+
+The cache is one small JSON file at the repository root, next to
+``.civitai_cache.json``, so the download worker processes share it. Signed URLs
+work as bearer credentials until they expire, so the file is created readable
+by the owner only and is not committed. They are also tied to the credentials
+used to resolve them, so entries are keyed on a digest of the URL and the auth
+header.
+"""
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, urljoin, urlparse
+
+DEFAULT_CACHE = str(Path(__file__).resolve().parents[2] / ".signed_urls.json")
+# Assumed lifetime when a signed URL does not say when it expires
+DEFAULT_TTL = 10 * 60
+# Stop reusing a URL this long before it expires, so a request does not start on a dying signature
+SAFETY_MARGIN = 60
+_STALE_STATUS = (401, 403, 410)
+# Origins that answer downloads with a redirect to a signed CDN URL
+REDIRECTING_HOSTS = ("civitai.com", "huggingface.co")
+
+
+def expiry_of(url):
+    """Unix time a signed URL stops working, from its query string; None when it does not say."""
+    query = {k.lower(): v[0] for k, v in parse_qs(urlparse(url).query).items()}
+    try:
+        if "x-amz-date" in query and "x-amz-expires" in query:
+            signed = datetime.strptime(query["x-amz-date"], "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+            return signed.timestamp() + int(query["x-amz-expires"])
+        for key in ("expires", "exp"):
+            if key in query:
+                return float(query[key])
+        if "se" in query:
+            return datetime.fromisoformat(query["se"].replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+    return None
+
+
+def _key(url, headers):
+    # Hashed: the URL itself may carry a ?token= credential
+    auth = (headers or {}).get("Authorization", "")
+    return hashlib.sha1(f"{url}\n{auth}".encode("utf-8")).hexdigest()
+
+
+class SignedUrlCache:
+    """``key -> {"url": final url, "expires": unix time}`` persisted to `path`."""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        now = time.time()
+        entries = {k: v for k, v in entries.items() if v.get("expires", 0) > now}
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entries, fh)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        entry = self._read().get(key)
+        if entry and entry.get("expires", 0) - SAFETY_MARGIN > time.time():
+            return entry["url"]
+        return None
+
+    def put(self, key, final_url, expires):
+        entries = self._read()
+        entries[key] = {"url": final_url, "expires": expires}
+        self._write(entries)
+
+    def invalidate(self, key):
+        entries = self._read()
+        if entries.pop(key, None) is not None:
+            self._write(entries)
+
+
+def resolve(url, headers=None, session=None, cache=None, max_hops=5):
+    """Final URL `url` redirects to, from the cache when still valid.
+
+    URLs that do not redirect are returned unchanged and not cached.
+    """
+    if not any(host in urlparse(url).netloc for host in REDIRECTING_HOSTS):
+        return url
+    cache = cache or SignedUrlCache()
+    key = _key(url, headers)
+    cached = cache.get(key)
+    if cached:
+        return cached
+    if session is None:
+        import requests
+        session = requests
+    current = url
+    for _ in range(max_hops):
+        # Only the API origin gets the credentials; signed URLs carry their own
+        send = headers if current == url else None
+        with session.get(current, headers=send, allow_redirects=False, stream=True, timeout=60) as resp:
+            location = resp.headers.get("Location")
+            if resp.status_code not in (301, 302, 303, 307, 308) or not location:
+                break
+        current = urljoin(current, location)
+    if current != url:
+        expires = expiry_of(current) or time.time() + DEFAULT_TTL
+        cache.put(key, current, expires)
+    return current
+
+
+def get(url, headers=None, session=None, cache=None, timeout=300):
+    """Streaming GET of `url` through its cached signed URL, re-resolving once if the CDN rejects it."""
+    cache = cache or SignedUrlCache()
+    if session is None:
+        import requests
+        session = requests
+    for attempt in range(2):
+        final = resolve(url, headers, session, cache)
+        resp = session.get(final, headers=headers if final == url else None, stream=True, timeout=timeout)
+        if resp.status_code in _STALE_STATUS and final != url and attempt == 0:
+            resp.close()
+            cache.invalidate(_key(url, headers))
+            continue
+        resp.raise_for_status()
+        return resp
+
+
+def resolve_quietly(url, headers=None, cache=None):
+    """``resolve`` that falls back to the original URL on any error (for handing URLs to wget)."""
+    try:
+        return resolve(url, headers, cache=cache)
+    except Exception:
+        return url
+
+
+def invalidate(url, headers=None, cache=None):
+    (cache or SignedUrlCache()).invalidate(_key(url, headers))
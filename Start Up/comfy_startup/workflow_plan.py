@@ -0,0 +1,245 @@
+"""Plan model downloads from the workflows a pod will actually run.
+
+Walks ComfyUI workflow JSON (UI or API format), collects every model the graph
+references - loader widgets, rgthree Power Lora Loader rows, ``LoraInfo``,
+any widget value that looks like a model file and the ``properties.models``
+download hints the frontend stores - and resolves them against the download
+catalog. The result is the same ``download_tasks`` list the installers already
+feed to ``run_parallel_downloads``::
+
+    python -m comfy_startup.workflow_plan --library ../Library/Library.py "../Workflows/download (1).json"
+"""
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from .catalog import Catalog, load_catalog
+from .node_index import load_workflow
+
+MODEL_EXTENSIONS = (".safetensors", ".ckpt", ".pt", ".pth", ".bin", ".gguf", ".sft", ".onnx")
+
+# UI-format loaders: widget position -> ComfyUI models folder
+LOADER_WIDGETS = {
+    "CheckpointLoaderSimple": {0: "checkpoints"},
+    "CheckpointLoader": {1: "checkpoints"},
+    "ImageOnlyCheckpointLoader": {0: "checkpoints"},
+    "unCLIPCheckpointLoader": {0: "checkpoints"},
+    "VAELoader": {0: "vae"},
+    "LoraLoader": {0: "loras"},
+    "LoraLoaderModelOnly": {0: "loras"},
+    "LoraInfo": {0: "loras"},
+    "UpscaleModelLoader": {0: "upscale_models"},
+    "CLIPLoader": {0: "clip"},
+    "DualCLIPLoader": {0: "clip", 1: "clip"},
+    "TripleCLIPLoader": {0: "clip", 1: "clip", 2: "clip"},
+    "CLIPVisionLoader": {0: "clip_vision"},
+    "ControlNetLoader": {0: "controlnet"},
+    "DiffControlNetLoader": {0: "controlnet"},
+    "UNETLoader": {0: "diffusion_models"},
+    "StyleModelLoader": {0: "style_models"},
+    "GLIGENLoader": {0: "gligen"},
+    "HypernetworkLoader": {0: "hypernetworks"},
+}
+
+# API-format input names -> models folder
+INPUT_FOLDERS = {
+    "ckpt_name": "checkpoints",
+    "vae_name": "vae",
+    "lora_name": "loras",
+    "clip_name": "clip",
+    "clip_name1": "clip",
+    "clip_name2": "clip",
+    "clip_name3": "clip",
+    "control_net_name": "controlnet",
+    "unet_name": "diffusion_models",
+    "style_model_name": "style_models",
+}
+
+ModelRef = namedtuple("ModelRef", ["filename", "folder", "node_type", "url", "sha256"], defaults=(None,))
+
+
+def _is_model_file(value):
+    return isinstance(value, str) and value.lower().endswith(MODEL_EXTENSIONS)
+
+
+def _basename(value):
+    return value.replace("\\", "/").rsplit("/", 1)[-1]
+
+
+def url_filename(url):
+    """Filename at the end of a download URL, query string removed."""
+    return os.path.basename(urlparse(url or "").path)
+
+
+def _ui_node_refs(node):
+    node_type = node.get("type") or ""
+    widgets = node.get("widgets_values")
+    props = node.get("properties") or {}
+    refs = []
+    positions = LOADER_WIDGETS.get(node_type, {})
+    if isinstance(widgets, list):
+        for pos, value in enumerate(widgets):
+            if isinstance(value, dict):
+                # rgthree Power Lora Loader rows: {"on": ..., "lora": "name.safetensors", ...}
+                if _is_model_file(value.get("lora")):
+                    refs.append(ModelRef(_basename(value["lora"]), "loras", node_type, None))
+            elif _is_model_file(value):
+                refs.append(ModelRef(_basename(value), positions.get(pos), node_type, None))
+    elif isinstance(widgets, dict):
+        for value in widgets.values():
+            if _is_model_file(value):
+                refs.append(ModelRef(_basename(value), None, node_type, None))
+    # Frontend download hints only count when the widget still points at that file
+    used = {ref.filename for ref in refs}
+    for hint in props.get("models") or []:
+        name = _basename(hint.get("name") or "")
+        if name in used:
+            refs = [r for r in refs if r.filename != name]
+            sha256 = hint.get("hash") if (hint.get("hash_type") or "sha256").lower() == "sha256" else None
+            refs.append(ModelRef(name, hint.get("directory"), node_type, hint.get("url"), sha256))
+    return refs
+
+
+def extract_model_refs(workflow):
+    """Every model file a workflow references, de-duplicated by (filename, folder)."""
+    refs = []
+    if isinstance(workflow, dict) and "nodes" in workflow:
+        nodes = list(workflow.get("nodes") or [])
+        for subgraph in (workflow.get("definitions") or {}).get("subgraphs") or []:
+            nodes.extend(subgraph.get("nodes") or [])
+        for node in nodes:
+            refs.extend(_ui_node_refs(node))
+    elif isinstance(workflow, dict):
+        for node in workflow.values():
+            if not isinstance(node, dict) or "class_type" not in node:
+                continue
+            for key, value in (node.get("inputs") or {}).items():
+                if _is_model_file(value):
+                    refs.append(ModelRef(_basename(value), INPUT_FOLDERS.get(key), node["class_type"], None))
+    unique = {}
+    for ref in refs:
+        key = (ref.filename.lower(), ref.folder)
+        if key not in unique or (ref.url and not unique[key].url):
+            unique[key] = ref
+    return list(unique.values())
+
+
+def iter_catalog_items(data, category=None, subcategory=None):
+    """Yield ``(category, subcategory, item)`` for every downloadable dict in a catalog tree.
+
+    Accepts a ``catalog.Catalog``, ``DOWNLOAD_LIBRARY`` from Library.py as
+    well as Start_Up's ``category_data``; label strings and nested subcategory
+    maps are walked the same way ``add_item_downloads`` does.
+    """
+    if isinstance(data, Catalog):
+        for entry in data:
+            if entry.url:
+                yield entry.category, entry.subcategory, entry.as_item()
+    elif isinstance(data, list):
+        for item in data:
+            if isinstance(item, dict) and (item.get("url") or item.get("download_url")):
+                yield category, subcategory, item
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if category is None:
+                yield from iter_catalog_items(value, key, None)
+            else:
+                yield from iter_catalog_items(value, category, key if subcategory is None else subcategory)
+
+
+def load_library(path):
+    """The catalog for a Library.py file (see ``catalog.load_catalog``)."""
+    return load_catalog(path)
+
+
+def item_filename(item):
+    url = item.get("url") or item.get("download_url")
+    return item.get("filename") or url_filename(url)
+
+
+def item_dest_dir(item, category):
+    return item.get("dest_dir") or f"models/{category}"
+
+
+def resolve_refs(refs, catalog_items):
+    """Match refs to catalog items by local filename, display name or upstream filename.
+
+    Returns ``(matches, unresolved)`` where matches is a list of
+    ``(ref, category, item)``. When several items share a name, the one whose
+    ``dest_dir`` matches the referenced folder wins.
+    """
+    by_key = {}
+    for category, subcategory, item in catalog_items:
+        url = item.get("url") or item.get("download_url")
+        for key in (item_filename(item), item.get("name"), url_filename(url)):
+            if key:
+                by_key.setdefault(key.lower(), []).append((category, item))
+    matches, unresolved = [], []
+    for ref in refs:
+        candidates = by_key.get(ref.filename.lower(), [])
+        if ref.folder:
+            preferred = [c for c in candidates if item_dest_dir(c[1], c[0]).rstrip("/").endswith(ref.folder)]
+            candidates = preferred or candidates
+        if candidates:
+            category, item = candidates[0]
+            matches.append((ref, category, item))
+        else:
+            unresolved.append(ref)
+    return matches, unresolved
+
+
+def plan_downloads(workflow_paths, catalog, comfy_dir, token=None, skip_existing=True):
+    """Build ``download_tasks`` for everything `workflow_paths` need.
+
+    `catalog` is a ``Catalog`` or catalog tree (see ``iter_catalog_items``). Refs missing from
+    the catalog still download when the workflow carries a URL hint for them,
+    unless the alias index shows the same model is already on disk under
+    another name. Returns ``(download_tasks, unresolved_refs)``.
+    """
+    from .model_aliases import build_alias_index
+
+    refs = []
+    for path in workflow_paths:
+        refs.extend(extract_model_refs(load_workflow(path)))
+    matches, unresolved = resolve_refs(refs, list(iter_catalog_items(catalog)))
+
+    tasks, seen, still_unresolved = [], set(), []
+    for ref, category, item in matches:
+        url = item.get("url") or item.get("download_url")
+        dest = os.path.join(comfy_dir, item_dest_dir(item, category), item_filename(item))
+        tasks.append({"url": url, "dest_path": dest, "token": token, "name": item.get("name")})
+    aliases = build_alias_index(catalog, comfy_dir) if any(ref.url for ref in unresolved) else None
+    for ref in unresolved:
+        if ref.url and aliases.exists(aliases.lookup(url=ref.url, sha256=ref.sha256, folder=ref.folder)):
+            continue
+        if ref.url:
+            dest = os.path.join(comfy_dir, "models", ref.folder or "checkpoints", ref.filename)
+            tasks.append({"url": ref.url, "dest_path": dest, "token": token, "name": ref.filename})
+        else:
+            still_unresolved.append(ref)
+
+    unique = []
+    for task in tasks:
+        if task["dest_path"] in seen or (skip_existing and os.path.exists(task["dest_path"])):
+            continue
+        seen.add(task["dest_path"])
+        unique.append(task)
+    return unique, still_unresolved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the downloads a set of workflows needs")
+    parser.add_argument("workflows", nargs="+", help="Workflow JSON files")
+    parser.add_argument("--library", default=os.path.join(os.path.dirname(__file__), "..", "..", "Library", "Library.py"))
+    parser.add_argument("--comfy", default="ComfyUI", help="ComfyUI directory the tasks download into")
+    args = parser.parse_intermixed_args(argv)
+    tasks, unresolved = plan_downloads(args.workflows, load_library(args.library), args.comfy)
+    json.dump({"download_tasks": tasks, "unresolved": [ref._asdict() for ref in unresolved]}, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,12 @@ from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_compl
 import multiprocessing
 from functools import partial
 
+# Make the shared comfy_startup helpers importable when this file is executed via %run
+_startup_dir = os.path.dirname(os.path.abspath(__file__))
+if _startup_dir not in sys.path:
+    sys.path.insert(0, _startup_dir)
+from comfy_startup import catalog, civitai_cache, presets, progress_hub, settings, task_dedupe, thumbnails, url_cache
+
 # -----------------------------
 # Bootstrap required Python packages when run as the first script
 # This will attempt to install missing packages quietly using pip.
@@ -55,11 +61,8 @@ def extract_civitai_model_id(url):
 
 
 def get_civitai_model_url(download_url):
-    """Convert download URL to model page URL"""
-    model_id = extract_civitai_model_id(download_url)
-    if model_id:
-        return f"https://civitai.com/models/{model_id}"
-    return None
+    """Convert download URL to model page URL (exact once the version is in the Civitai cache)"""
+    return civitai_cache.model_page_url(download_url)
 
 # -----------------------------
 # Environment Variables
@@ -513,12 +516,14 @@ title_html = widgets.HTML(
     layout=Layout(height='auto')
 )
 
-# Civitai token input widget (bound to Python)
+# Civitai token input widget (bound to Python); the value is kept in the shared settings store
+user_settings = settings.open_settings()
 civitai_token_widget = widgets.Text(
-    value='',
+    value=user_settings.get('civitai_token', ''),
     placeholder='Civitai API token',
     layout=Layout(width='560px', height='40px')
 )
+civitai_token_widget.observe(lambda change: user_settings.set('civitai_token', change['new'].strip()), names='value')
 # Apply the CSS class so the input inherits our blue styling
 civitai_token_widget.add_class('civit-token-input')
 
@@ -529,30 +534,16 @@ title_row = widgets.VBox([
 
 display(title_row)
 
-import base64
 import os
 
 
 def load_image_as_base64(image_path):
-    """Load an image from `image_path` and return a data URI or None on failure."""
-    try:
-        # Resolve relative to the script directory when a relative path is provided
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        full_path = image_path if os.path.isabs(image_path) else os.path.join(base_dir, image_path)
-        if os.path.exists(full_path):
-            with open(full_path, 'rb') as f:
-                encoded = base64.b64encode(f.read()).decode('utf-8')
-                # Guess mime from extension
-                ext = os.path.splitext(full_path)[1].lower()
-                mime = 'image/png'
-                if ext in ['.jpg', '.jpeg']:
-                    mime = 'image/jpeg'
-                elif ext == '.webp':
-                    mime = 'image/webp'
-                return f'data:{mime};base64,{encoded}'
-        return None
-    except Exception:
-        return None
+    """Return a data URI for a cached thumbnail of `image_path`, or None on failure."""
+    # Resolve relative to the script directory when a relative path is provided
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    full_path = image_path if os.path.isabs(image_path) else os.path.join(base_dir, image_path)
+    thumb = thumbnails.thumbnail(full_path)
+    return thumb.uri if thumb else None
 
 
 def _build_preset_image_html(data_uri: str, alt_text: str = '') -> str:
@@ -633,8 +624,8 @@ def download_file_process(url, dest_path, token=None):
         if is_civit and token:
             headers = {'Authorization': f'Bearer {token}'}
             try:
-                with requests.get(url, headers=headers, stream=True, timeout=300) as r:
-                    r.raise_for_status()
+                # Streams through the cached signed CDN URL instead of re-hitting the API
+                with url_cache.get(url, headers=headers, timeout=300) as r:
                     with open(dest_path, 'wb') as fh:
                         for chunk in r.iter_content(chunk_size=8192):
                             if chunk:
@@ -644,14 +635,18 @@ def download_file_process(url, dest_path, token=None):
                 # Fall through to wget
                 pass
 
-        # Fallback: use wget
+        # Fallback: use wget, on the resolved URL first and the original if that was rejected
         try:
-            cmd = f"wget -O '{dest_path}' '{url}'"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
-            if result.returncode == 0:
-                return True, f"Downloaded (wget): {os.path.basename(dest_path)}"
-            else:
-                return False, f"wget failed for {os.path.basename(dest_path)}: {result.stderr}"
+            result = None
+            resolved = url_cache.resolve_quietly(url)
+            for target in dict.fromkeys((resolved, url)):
+                cmd = f"wget -O '{dest_path}' '{target}'"
+                result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
+                if result.returncode == 0:
+                    return True, f"Downloaded (wget): {os.path.basename(dest_path)}"
+                if target != url:
+                    url_cache.invalidate(url)
+            return False, f"wget failed for {os.path.basename(dest_path)}: {result.stderr}"
         except Exception as e:
             return False, f"Download failed for {os.path.basename(dest_path)}: {str(e)}"
             
@@ -705,6 +700,8 @@ def clone_repo_process(repo_url, dest_path, repo_name):
 
 def run_parallel_downloads(download_tasks, clone_tasks, progress_callback=None):
     """Run downloads and clones in parallel with progress tracking"""
+    # Fetch each artifact once; extra destinations are hardlinked afterwards
+    download_tasks, duplicate_links = task_dedupe.coalesce_tasks(download_tasks)
     total_tasks = len(download_tasks) + len(clone_tasks)
     completed_tasks = 0
     # Results storage
@@ -768,6 +765,9 @@ def run_parallel_downloads(download_tasks, clone_tasks, progress_callback=None):
                     print(f"Clone failed: {task.get('name', 'Unknown')} - {str(e)}")
                 finally:
                     update_progress()
+    linked = task_dedupe.materialize_links(duplicate_links)
+    if linked:
+        print(f"Linked {linked} duplicate downloads")
     return download_results, clone_results
 
 # -----------------------------
@@ -1724,6 +1724,24 @@ loras.extend(loras_data)
 
 # Category Data and State Management
 # -----------------------------
+# Use the shared catalog from Library/Library.py when it is available; the
+# inline lists above remain the fallback.
+try:
+    _catalog_lists = catalog.load_catalog().ui_lists()
+except (OSError, SyntaxError, ValueError) as e:
+    _catalog_lists = {}
+    print(f"Library catalog unavailable ({e}); using the inline download lists")
+custom_nodes = _catalog_lists.get("custom-nodes", custom_nodes)
+checkpoints = _catalog_lists.get("checkpoints", checkpoints)
+loras = _catalog_lists.get("loras", loras)
+embeddings = _catalog_lists.get("embeddings", embeddings)
+clip_models = _catalog_lists.get("clip", clip_models)
+clip_vision_models = _catalog_lists.get("clip-vision", clip_vision_models)
+vae_models = _catalog_lists.get("vae", vae_models)
+controlnet_models = _catalog_lists.get("controlnet", controlnet_models)
+upscale_models = _catalog_lists.get("upscale", upscale_models)
+additional_downloads = _catalog_lists.get("additional", additional_downloads)
+
 category_data = {
     "custom-nodes": custom_nodes,
     "checkpoints": checkpoints,
@@ -1737,6 +1755,10 @@ category_data = {
     "additional": additional_downloads
 }
 
+# Warm the shared Civitai metadata cache in the background; the UI only reads from it
+civitai_cache.prefetch([item.get('url') or item.get('download_url') or ''
+                        for items in category_data.values() for item in items if isinstance(item, dict)])
+
 category_labels = {
     "custom-nodes": "Custom Nodes",
     "checkpoints": "Checkpoints",
@@ -1767,28 +1789,31 @@ for category_id, items in category_data.items():
 # -----------------------------
 # Progress Update Function
 # -----------------------------
+# Worker threads publish here; one flusher writes the widgets at most 5 times a second
+ui_progress = progress_hub.ProgressHub(fps=5)
+
 def update_progress(percent):
     # Make the status and progress visible while preserving reserved layout space
-    progress_container.value = f"""
+    ui_progress.publish(progress_container, f"""
     <div style="display:flex; justify-content:center; margin-bottom:20px;">
         <div class="progress-container" style="display:block; visibility: visible;">
             <div class="progress-bar" style="width:{percent}%;"></div>
         </div>
     </div>
-    """
-    status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>is Installing...</div>"
+    """)
+    ui_progress.publish(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>is Installing...</div>")
 
 
 def update_download_progress(percent, message: str = 'Downloading...'):
     """Update the download-only progress bar and its status text while preserving layout space."""
-    download_progress_container.value = f"""
+    ui_progress.publish(download_progress_container, f"""
     <div style="display:flex; justify-content:center; margin-bottom:20px;">
         <div class="progress-container" style="display:block; visibility: visible;">
             <div class="progress-bar" style="width:{percent}%;"></div>
         </div>
     </div>
-    """
-    download_status_label.value = f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>"
+    """)
+    ui_progress.publish(download_status_label, f"<div class='status-text' style='height: 26px; visibility: visible;'>{message}</div>")
 
 # -----------------------------
 # Python-driven Toggle Widget (no JS bridge)
@@ -1940,7 +1965,7 @@ def startup_comfyui(b):
     b.disabled = True
 
     # Make status placeholder visible with text
-    status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Installing ComfyUI...</div>"
+    ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Installing ComfyUI...</div>")
 
     def run_installation():
         import subprocess
@@ -2005,7 +2030,7 @@ def startup_comfyui(b):
                     os.makedirs(full_dest, exist_ok=True)
                 except Exception:
                     pass
-                download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name')})
+                download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name'), 'sha256': item.get('sha256')})
 
         add_item_downloads(additional_downloads, 'additional')
         add_item_downloads(checkpoints, 'checkpoints')
@@ -2043,7 +2068,7 @@ def startup_comfyui(b):
         update_progress(100)
 
         # Update visible status and re-enable button
-        status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>is up and running!</div>"
+        ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>is up and running!</div>")
         b.disabled = False
 
     threading.Thread(target=run_installation).start()
@@ -2052,16 +2077,25 @@ def startup_comfyui(b):
 # Create Category Widgets with Custom HTML
 # -----------------------------
 def create_category_widget(category_id, label, items):
+    # Rows are built on first expand; until then the body is one empty placeholder,
+    # so the cell renders without syncing a Button+HTML pair per catalog item.
+    content_box = widgets.VBox([], layout=widgets.Layout(display='none'))
+
+    def build_rows():
+        return [create_toggle_widget(category_id, i, item) for i, item in enumerate(items)]
+
     # Create toggle button
     def toggle_category_func(b):
         category_expanded[category_id] = not category_expanded[category_id]
         
         if category_expanded[category_id]:
+            if not content_box.children:
+                content_box.children = tuple(build_rows())
             b.description = f"▲ {label}"
-            category_containers[category_id].children[1].layout.display = 'block'
+            content_box.layout.display = 'block'
         else:
             b.description = f"▼ {label}"
-            category_containers[category_id].children[1].layout.display = 'none'
+            content_box.layout.display = 'none'
     
     button = widgets.Button(
         description=f"▼ {label}",
@@ -2070,15 +2104,6 @@ def create_category_widget(category_id, label, items):
         _dom_classes=['category-button']
     )
     button.on_click(toggle_category_func)
-    # Create content VBox composed of the python-driven toggle rows
-    rows = []
-    for i, item in enumerate(items):
-        row = create_toggle_widget(category_id, i, item)
-        rows.append(row)
-
-    content_box = widgets.VBox(rows, layout=widgets.Layout(display='none'))
-    # wrap in a container to match previous styling
-    content_html = widgets.VBox([widgets.HTML('<div class="item-container"></div>'), content_box], layout=widgets.Layout(display='none'))
     
     container = widgets.VBox([button, content_box], 
                            layout=widgets.Layout(align_items='center', margin='5px 0px'))
@@ -2113,8 +2138,8 @@ def model_dirs_exist():
 def start_downloads_only(b):
     b.disabled = True
     # show the main status placeholder (keep it hidden for installation) but enable download status
-    status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
-    download_status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Running downloads...</div>"
+    ui_progress.set(status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
+    ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Running downloads...</div>")
 
     def run_downloads():
         import os
@@ -2138,7 +2163,7 @@ def start_downloads_only(b):
                     os.makedirs(full_dest, exist_ok=True)
                 except Exception:
                     pass
-                download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name')})
+                download_tasks.append({'url': url, 'dest_path': os.path.join(full_dest, filename), 'token': token, 'name': item.get('name'), 'sha256': item.get('sha256')})
 
         add_items(additional_downloads, 'additional')
         add_items(checkpoints, 'checkpoints')
@@ -2153,22 +2178,22 @@ def start_downloads_only(b):
         try:
             # Use the download-specific progress callback for downloads-only flow
             dl_results, _ = run_parallel_downloads(download_tasks, [], progress_callback=update_download_progress)
-            download_status_label.value = "<div class='status-text' style='height: 26px; visibility: visible;'>Downloads completed.</div>"
+            ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: visible;'>Downloads completed.</div>")
             # Leave the main install status hidden
         except Exception as e:
-            download_status_label.value = f"<div class='status-text' style='height: 26px; visibility: visible;'>Downloads failed: {e}</div>"
+            ui_progress.set(download_status_label, f"<div class='status-text' style='height: 26px; visibility: visible;'>Downloads failed: {e}</div>")
         finally:
             # keep reserved space but hide progress bar (visibility hidden) after completion
-            download_progress_container.value = """
+            ui_progress.set(download_progress_container, """
             <div style="display:flex; justify-content:center; margin-bottom:20px;">
                 <div class="progress-container" style="display:block; visibility: hidden;">
                     <div class="progress-bar" style="width:0%;"></div>
                 </div>
             </div>
-            """
+            """)
             # keep the status text visible for a short while and then revert to hidden placeholder
             time.sleep(1.0)
-            download_status_label.value = "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>"
+            ui_progress.set(download_status_label, "<div class='status-text' style='height: 26px; visibility: hidden;'>Placeholder</div>")
             b.disabled = False
 
     threading.Thread(target=run_downloads, daemon=True).start()
@@ -2329,27 +2354,9 @@ all_label = widgets.HTML(value=f"""
 
 def set_all_downloads(enabled: bool):
     """Set all optional items across categories to enabled/disabled and update visuals."""
-    for cat, items in category_data.items():
-        # skip required-only categories? we still set states but respect 'required' fields
-        for idx in range(len(items)):
-            # respect required flag: if required, always True
-            if items[idx].get('required', False):
-                toggle_states.setdefault(cat, {})[idx] = True
-                continue
-            toggle_states.setdefault(cat, {})[idx] = bool(enabled)
-            # update visual button if present
-            btn = toggle_widgets.get(cat, {}).get(idx)
-            if btn is not None:
-                try:
-                    if enabled:
-                        btn.add_class('active')
-                    else:
-                        btn.remove_class('active')
-                except Exception:
-                    if enabled and 'active' not in btn._dom_classes:
-                        btn._dom_classes = btn._dom_classes + ['active']
-                    if not enabled and 'active' in btn._dom_classes:
-                        btn._dom_classes = [c for c in btn._dom_classes if c != 'active']
+    # One diffed pass: required items stay on and buttons already in the right state send nothing
+    presets.bulk_toggle(category_data, enabled, toggle_states, toggle_widgets)
+
 
 def _on_all_toggle_click(b):
     all_downloads_state['enabled'] = not all_downloads_state['enabled']
@@ -22,9 +22,23 @@ import platform
 import signal
 import atexit
 import argparse
+import hashlib
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
-from contextlib import contextmanager
+
+from comfy_startup import (bytecompile, catalog, comfy_monitor, model_aliases, node_index, node_profiler, profiles,
+                           torch_env, workflow_plan)
+from comfy_startup.install_graph import DONE, InstallGraph
+from comfy_startup.phase_stamps import (PhaseStamps, file_digest, fingerprint, git_head,
+                                          git_remote_head, venv_fingerprint)
+
+LIBRARY_PATH = Path(__file__).parent.parent / "Library" / "Library.py"
+# How long to wait for a freshly started server to answer before the summary
+SERVER_READY_TIMEOUT = 600
+
+# Binaries provided by the apt phase; if any is missing the phase runs again
+SYSTEM_TOOLS = ("git", "python3", "wget", "ffmpeg", "tmux", "netstat", "lsof", "curl")
+
 # Global variables for Rich functionality
 RICH_AVAILABLE = False
 console = None
@@ -49,6 +63,12 @@ def parse_arguments():
     parser.add_argument('--huggingface-token',
                       help='Hugging Face API token for authenticated downloads',
                       default=None)
+    parser.add_argument('--profile-nodes', action='store_true',
+                      help='Record per-node import time and memory when ComfyUI starts')
+    parser.add_argument('--workflows', nargs='+', default=None, metavar='WORKFLOW_JSON',
+                      help='Only enable the custom nodes and download the models these workflows use')
+    parser.add_argument('--profile', default=None, metavar='NAME',
+                      help='Download the models of a selection profile saved from the notebook (e.g. "last")')
     return parser.parse_args()
 
 def clean_civitai_url(url):
@@ -92,11 +112,35 @@ class Colors:
 class ComfyUIInstaller:
     """Main installer class"""
     
-    def __init__(self, civitai_token=None, github_token=None, huggingface_token=None):
+    def __init__(self, civitai_token=None, github_token=None, huggingface_token=None, profile_nodes=False,
+                 workflows=None, profile=None):
         self.workspace = Path(__file__).parent / "ComfyUI"
         self.venv_path = self.workspace / "venv"
         self.is_windows = platform.system() == "Windows"
         self.download_processes = []
+        self.pip_cmd = str(self.venv_path / ("Scripts/pip" if self.is_windows else "bin/pip"))
+        self.torch_plan = None
+        # Kept beside ComfyUI/ rather than inside it so the clone target stays empty on a cold start
+        self.stamps = PhaseStamps(Path(__file__).parent / ".install_stamps")
+        self.catalog = catalog.load_catalog(LIBRARY_PATH)
+        self.download_selection = None
+        self.server_monitor = None
+        self.profile_nodes = profile_nodes
+        self.workflows = [str(Path(w).resolve()) for w in workflows or []]
+        self.profile = profile
+        self.custom_nodes = [
+            ("https://github.com/rgthree/rgthree-comfy.git", "rgthree-comfy"),
+            ("https://github.com/jitcoder/lora-info.git", "lora-info"),
+            ("https://github.com/ltdrdata/ComfyUI-Impact-Pack.git", "ComfyUI-Impact-Pack"),
+            ("https://github.com/yolain/ComfyUI-Easy-Use.git", "ComfyUI-Easy-Use"),
+            ("https://github.com/ltdrdata/ComfyUI-Manager.git", "ComfyUI-Manager"),
+            ("https://github.com/pythongosssss/ComfyUI-Custom-Scripts.git", "ComfyUI-Custom-Scripts"),
+            ("https://github.com/john-mnz/ComfyUI-Inspyrenet-Rembg.git", "ComfyUI-Inspyrenet-Rembg"),
+            ("https://github.com/justUmen/Bjornulf_custom_nodes.git", "Bjornulf_custom_nodes"),
+            ("https://github.com/giriss/comfy-image-saver.git", "comfy-image-saver"),
+            ("https://github.com/ltdrdata/ComfyUI-Impact-Subpack.git", "ComfyUI-Impact-Subpack"),
+            ("https://github.com/ltdrdata/was-node-suite-comfyui.git", "was-node-suite-comfyui"),
+        ]
         
         # Use provided tokens or fall back to defaults
         self.civitai_token = civitai_token or DEFAULT_CIVITAI_TOKEN
@@ -125,31 +169,25 @@ class ComfyUIInstaller:
         self._cleanup()
         sys.exit(0)
     
-    @contextmanager
-    def _working_directory(self, path):
-        """Context manager for changing working directory"""
-        old_cwd = os.getcwd()
-        try:
-            os.chdir(path)
-            yield
-        finally:
-            os.chdir(old_cwd)
-    
     def clear_screen(self):
         """Clear terminal screen"""
         os.system('cls' if self.is_windows else 'clear')
     
-    def run_command(self, cmd, check=True, capture_output=False):
+    def run_command(self, cmd, check=True, capture_output=False, cwd=None):
         """Run a shell command with proper error handling"""
         print(f"\n{Colors.BLUE}>>> Running: {cmd[:100]}{'...' if len(cmd) > 100 else ''}{Colors.END}")
         try:
             if capture_output:
-                result = subprocess.run(cmd, shell=True, check=check, 
+                result = subprocess.run(cmd, shell=True, check=check, cwd=cwd,
                                       capture_output=True, text=True)
                 return result.stdout.strip()
             else:
-                subprocess.run(cmd, shell=True, check=check)
-                return True
+                # With check=False a non-zero exit still reports failure, so callers such as
+                # PhaseStamps.run do not record a failed command as done
+                result = subprocess.run(cmd, shell=True, check=check, cwd=cwd)
+                if result.returncode != 0:
+                    print(f"{Colors.RED}Command exited with status {result.returncode}{Colors.END}")
+                return result.returncode == 0
         except subprocess.CalledProcessError as e:
             print(f"{Colors.RED}Error running command: {e}{Colors.END}")
             if check:
@@ -176,13 +214,18 @@ class ComfyUIInstaller:
         self.print_header("System Dependencies")
         
         if not self.is_windows:
+            packages = "git python3 python3-venv python3-pip wget ffmpeg tmux net-tools lsof curl"
+            # A fresh pod resets the container filesystem, so the stamp only
+            # holds while the tools it installed are still on PATH
+            tools_present = all(shutil.which(tool) for tool in SYSTEM_TOOLS)
+            if self.stamps.is_current("apt", fingerprint(packages, tools_present)):
+                print(f"{Colors.YELLOW}System packages unchanged, skipping apt.{Colors.END}")
+                return
             self.run_command("apt update && apt upgrade -y")
-            self.run_command("apt install -y git python3 python3-venv python3-pip wget ffmpeg tmux net-tools lsof curl")
+            self.run_command(f"apt install -y {packages}")
+            self.stamps.record("apt", fingerprint(packages, all(shutil.which(tool) for tool in SYSTEM_TOOLS)))
         else:
             print("Windows detected - please ensure Python 3.8+ and Git are installed")
-        
-        time.sleep(2)
-        self.clear_screen()
     
     def clone_comfyui(self):
         """Clone ComfyUI repository"""
@@ -192,29 +235,30 @@ class ComfyUIInstaller:
             self.run_command(f"git clone https://github.com/comfyanonymous/ComfyUI.git {self.workspace}")
         else:
             print(f"{Colors.YELLOW}ComfyUI directory already exists, skipping clone.{Colors.END}")
-        
-        time.sleep(2)
-        self.clear_screen()
     
     def setup_virtual_environment(self):
-        """Setup Python virtual environment and dependencies"""
+        """Create the Python virtual environment and upgrade pip"""
         # MUST declare globals first
         global RICH_AVAILABLE, console
         
         self.print_header("Python Environment")
         
+        # Reuse a CUDA-matched system torch when the image ships one
+        self.torch_plan = torch_env.plan_torch_setup()
+        
         # Create virtual environment
         if not self.venv_path.exists():
-            with self._working_directory(self.workspace):
-                self.run_command("python3 -m venv venv")
+            self.run_command(torch_env.venv_command(self.torch_plan), cwd=self.workspace)
+        elif self.torch_plan["reuse_system_torch"]:
+            torch_env.enable_system_site_packages(str(self.venv_path))
         
         # Activate and upgrade pip
-        pip_cmd = str(self.venv_path / ("Scripts/pip" if self.is_windows else "bin/pip"))
-        self.run_command(f'"{pip_cmd}" install --upgrade pip')
+        self.stamps.run("pip_upgrade", venv_fingerprint(self.venv_path),
+                        self.run_command, f'"{self.pip_cmd}" install --upgrade pip')
         
         # Install Rich for progress display if not available
         if not RICH_AVAILABLE:
-            self.run_command(f'"{pip_cmd}" install rich')
+            self.run_command(f'"{self.pip_cmd}" install rich')
             try:
                 from rich.console import Console
                 from rich.progress import Progress, BarColumn, TimeRemainingColumn, TextColumn, TaskID
@@ -222,45 +266,43 @@ class ComfyUIInstaller:
                 console = Console()
             except ImportError:
                 pass
-        
-        # Install PyTorch with CUDA support if available
-        cuda_available = self._check_cuda_availability()
-        self.install_torch(pip_cmd, cuda_available)
-        self.run_command(f'"{pip_cmd}" install onnxruntime-gpu opencv-python')
-        
-        # Install ComfyUI requirements
+    
+    def _torch_fingerprint(self):
+        return fingerprint(self.torch_plan, venv_fingerprint(self.venv_path))
+    
+    def install_python_packages(self):
+        """Install extra runtime packages used by common custom nodes"""
+        packages = "onnxruntime-gpu opencv-python"
+        self.stamps.run("packages", fingerprint(packages, self._torch_fingerprint()),
+                        self.run_command, f'"{self.pip_cmd}" install {packages}')
+    
+    def install_comfyui_requirements(self):
+        """Install ComfyUI requirements"""
         requirements_file = self.workspace / "requirements.txt"
         if requirements_file.exists():
-            self.run_command(f'"{pip_cmd}" install -r "{requirements_file}"')
-        
-        time.sleep(2)
-        self.clear_screen()
-    
-    def _check_cuda_availability(self):
-        """Check if CUDA is available"""
-        try:
-            result = self.run_command('nvidia-smi --query-gpu=driver_version --format=csv,noheader', 
-                                    check=False, capture_output=True)
-            return bool(result)
-        except:
-            return False
+            self.stamps.run("requirements", fingerprint(file_digest(requirements_file), self._torch_fingerprint()),
+                            self.run_command, f'"{self.pip_cmd}" install -r "{requirements_file}"')
     
-    def install_torch(self, pip_cmd, cuda_available):
-        """Install PyTorch packages with proper CUDA support"""
+    def install_torch(self):
+        """Install PyTorch packages for the CUDA version the driver supports"""
         # MUST be the first thing in the function
         global RICH_AVAILABLE, console
 
+        torch_plan = self.torch_plan
+        torch_cmd = torch_env.torch_install_command(self.pip_cmd, torch_plan)
+        if not torch_cmd:
+            system_torch = torch_plan.get("system_torch") or {}
+            print(f"{Colors.GREEN}Reusing system PyTorch {system_torch.get('torch')} "
+                  f"(CUDA {system_torch.get('cuda')}), skipping download{Colors.END}")
+            return
+
         # Now you can use them safely
         if RICH_AVAILABLE:
-            console.print("Installing PyTorch...")
-
-        # Build the extra index URL if CUDA is available
-        pytorch_extra = ""
-        if cuda_available:
-            pytorch_extra = " --index-url https://download.pytorch.org/whl/cu121"
+            console.print(f"Installing PyTorch from {torch_plan.get('index_url')}...")
 
         # Run the pip command
-        self.run_command(f'"{pip_cmd}" install torch torchvision torchaudio{pytorch_extra}')
+        if not self.stamps.run("torch", self._torch_fingerprint(), self.run_command, torch_cmd):
+            print(f"{Colors.YELLOW}PyTorch already installed for this plan, skipping.{Colors.END}")
     
     def create_directory_structure(self):
         """Create required directories"""
@@ -278,9 +320,6 @@ class ComfyUIInstaller:
         
         for directory in directories:
             self.ensure_directory(self.workspace / directory)
-        
-        time.sleep(2)
-        self.clear_screen()
     
     def prepare_download_command(self, url, file_path):
         """Prepare wget command with proper authentication"""
@@ -314,229 +353,151 @@ class ComfyUIInstaller:
         if RICH_AVAILABLE:
             console.rule("[bold cyan]COMFYUI MODEL DOWNLOADS[/bold cyan]")
         
-        downloads = [
+        # Catalog ids (destination under models/) resolved through Library/Library.py
+        selection = [
             # Flux Models
-            ("models/checkpoints/flux1-dev-fp8.safetensors",
-             "https://huggingface.co/Comfy-Org/flux1-dev/resolve/main/flux1-dev-fp8.safetensors?download=true"),
+            "checkpoints/flux1-dev-fp8.safetensors",
 
             # SDXL Checkpoints
-            ("models/checkpoints/SDXL.safetensors",
-             "https://huggingface.co/stabilityai/stable-diffusion-xl-base-1.0/resolve/main/sd_xl_base_1.0.safetensors?download=true"),
-            ("models/checkpoints/SDXL_WildCard.safetensors",
-             "https://civitai.com/api/download/models/345685"),
-            ("models/checkpoints/SDXL_CyberRealisticXL.safetensors",
-             "https://civitai.com/api/download/models/1609607"),
-            ("models/checkpoints/zavychromaxl_v80.safetensors",
-             "https://huggingface.co/misri/zavychromaxl_v80/resolve/main/zavychromaxl_v80.safetensors"),
-            ("models/checkpoints/juggernautXL_version6Rundiffusion.safetensors",
-             "https://huggingface.co/lllyasviel/fav_models/resolve/main/fav/juggernautXL_version6Rundiffusion.safetensors"),
-            ("models/checkpoints/DreamShaperXL.safetensors",
-             "https://civitai.com/api/download/models/351306"),
+            "checkpoints/SDXL.safetensors",
+            "checkpoints/SDXL_WildCard.safetensors",
+            "checkpoints/SDXL_CyberRealisticXL.safetensors",
+            "checkpoints/zavychromaxl_v80.safetensors",
+            "checkpoints/juggernautXL_version6Rundiffusion.safetensors",
+            "checkpoints/DreamShaperXL.safetensors",
          
             # SD 1.5 Models
-            ("models/checkpoints/SD1.5_DreamShaper.safetensors",
-             "https://civitai.com/api/download/models/128713"),
-            ("models/checkpoints/SD1.5_RevAnimated.safetensors",
-             "https://civitai.com/api/download/models/425083"),
-            ("models/checkpoints/SD1.5_Epic_Realism.safetensors", 
-             "https://civitai.com/api/download/models/143906"),
-            ("models/checkpoints/SD1.5_Deliberate.safetensors",
-             "https://huggingface.co/XpucT/Deliberate/resolve/main/Deliberate_v6.safetensors?download=true"),
+            "checkpoints/SD1.5_DreamShaper.safetensors",
+            "checkpoints/SD1.5_ReVAnimated.safetensors",
+            "checkpoints/SD1.5_Epic_Realism.safetensors",
+            "checkpoints/SD1.5_Deliberate.safetensors",
 
             # Pony Models
-            ("models/checkpoints/Pony.safetensors",
-             "https://civitai.com/api/download/models/290640"),
-            ("models/checkpoints/Pony_CyberRealistic.safetensors",
-             "https://civitai.com/api/download/models/2178176"),
-            ("models/checkpoints/Pony_Lucent.safetensors",
-             "https://civitai.com/api/download/models/1971591"),
-            ("models/checkpoints/Pony_DucHaiten_Real.safetensors",
-             "https://civitai.com/api/download/models/695106"),
-            ("models/checkpoints/Pony_Real_Dream.safetensors",
-             "https://civitai.com/api/download/models/2129811"),
-            ("models/checkpoints/Pony_Real_Merge.safetensors",
-             "https://civitai.com/api/download/models/994131"),
-            ("models/checkpoints/Pony_Realism.safetensors",
-             "https://civitai.com/api/download/models/914390"),
+            "checkpoints/Pony.safetensors",
+            "checkpoints/Pony_CyberRealistic.safetensors",
+            "checkpoints/Pony_Lucent.safetensors",
+            "checkpoints/Pony_DucHaiten_Real.safetensors",
+            "checkpoints/Pony_Real_Dream.safetensors",
+            "checkpoints/Pony_Real_Merge.safetensors",
+            "checkpoints/Pony_Realism.safetensors",
 
             # Illustrious Models
-            ("models/checkpoints/Illustrious.safetensors",
-             "https://civitai.com/api/download/models/889818"),
-            ("models/checkpoints/Illustrious_AnIco.safetensors",
-             "https://civitai.com/api/download/models/1641205"),
-            ("models/checkpoints/Illustrious_Illustrij.safetensors",
-             "https://civitai.com/api/download/models/2186168"),
-            ("models/checkpoints/Illustrious_ToonMerge.safetensors",
-             "https://civitai.com/api/download/models/1622588"),
-            ("models/checkpoints/Illustrious_SEMImergeijV6.safetensors",
-             "https://civitai.com/api/download/models/1920758"),
+            "checkpoints/Illustrious.safetensors",
+            "checkpoints/Illustrious_AnIco.safetensors",
+            "checkpoints/Illustrious_Illustrij.safetensors",
+            "checkpoints/Illustrious_ToonMerge.safetensors",
+            "checkpoints/Illustrious_SEMImergeijV6.safetensors",
             
             # Style Models
-            ("models/style_models/Flux_Redux.safetensors",
-             "https://civitai.com/api/download/models/1086258"),
+            "style_models/Flux_Redux.safetensors",
             
             # VAE Models
-            ("models/vae/SDXL_Vae.safetensors", 
-             "https://huggingface.co/stabilityai/sdxl-vae/resolve/main/sdxl_vae.safetensors?download=true"),
-            ("models/vae/ae.safetensors",
-             "https://huggingface.co/Comfy-Org/Lumina_Image_2.0_Repackaged/resolve/main/split_files/vae/ae.safetensors?download=true"),
+            "vae/SDXL_Vae.safetensors",
+            "vae/ae.safetensors",
             
             # CLIP Vision Models
-            ("models/clip_vision/CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors", 
-             "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors"),
-            ("models/clip_vision/CLIP-ViT-bigG-14-laion2B-39B-b160k.safetensors", 
-             "https://huggingface.co/h94/IP-Adapter/resolve/main/sdxl_models/image_encoder/model.safetensors"),
-            ("models/clip_vision/model_l.safetensors",
-             "https://huggingface.co/openai/clip-vit-large-patch14/resolve/main/model.safetensors?download=true"),
-            ("models/clip_vision/clip-vision_vit-h.safetensors",
-             "https://huggingface.co/h94/IP-Adapter/resolve/main/models/image_encoder/model.safetensors"),
-            ("models/clip_vision/clip_vision_h.safetensors",
-             "https://huggingface.co/Comfy-Org/Wan_2.1_ComfyUI_repackaged/resolve/main/split_files/clip_vision/clip_vision_h.safetensors?download=true"),
-            ("models/clip_vision/sigclip_vision_patch14_384.safetensors",
-             "https://huggingface.co/Comfy-Org/sigclip_vision_384/resolve/main/sigclip_vision_patch14_384.safetensors?download=true"),
+            "clip_vision/CLIP-ViT-H-14-laion2B-s32B-b79K.safetensors",
+            "clip_vision/CLIP-ViT-bigG-14-laion2B-39B-b160k.safetensors",
+            "clip_vision/model_l.safetensors",
+            "clip_vision/clip-vision_vit-h.safetensors",
+            "clip_vision/clip_vision_h.safetensors",
+            "clip_vision/sigclip_vision_patch14_384.safetensors",
             
             # CLIP Models
-            ("models/clip/clip_l.safetensors", 
-             "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/clip_l.safetensors?download=true"),
-            ("models/clip/t5xxl_fp16.safetensors", 
-             "https://huggingface.co/comfyanonymous/flux_text_encoders/resolve/main/t5xxl_fp16.safetensors?download=true"),
-            ("models/clip/clip_g.safetensors",
-             "https://huggingface.co/calcuis/sd3.5-large-gguf/resolve/7f72f2a432131bba82ecd1aafb931ac99f0f05f7/clip_g.safetensors?download=true"),
+            "clip/clip_l.safetensors",
+            "clip/t5xxl_fp16.safetensors",
+            "clip/clip_g.safetensors",
             
             # Diffusion Models & Related Files
-            ("models/diffusion_models/Flux_Fill.safetensors",
-             "https://civitai.com/api/download/models/1086292"),
-            ("models/loras/uso-flux1-dit-lora-v1.safetensors",
-             "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/loras/uso-flux1-dit-lora-v1.safetensors"),
-            ("models/model_patches/uso-flux1-projector-v1.safetensors",
-             "https://huggingface.co/Comfy-Org/USO_1.0_Repackaged/resolve/main/split_files/model_patches/uso-flux1-projector-v1.safetensors"),
+            "diffusion_models/Flux_Fill.safetensors",
+            "loras/uso-flux1-dit-lora-v1.safetensors",
+            "model_patches/uso-flux1-projector-v1.safetensors",
             
             # Upscale Models
-            ("models/upscale_models/4x_foolhardy_Remacri.pth", 
-             "https://huggingface.co/FacehugmanIII/4x_foolhardy_Remacri/resolve/main/4x_foolhardy_Remacri.pth?download=true"),
-            ("models/upscale_models/RealESRGAN_x4plus.pth", 
-             "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.1.0/RealESRGAN_x4plus.pth"),
-            ("models/upscale_models/4x-UltraSharp.safetensors", 
-             "https://civitai.com/api/download/models/125843"),
-            ("models/upscale_models/4x_NMKD_Siax_200k.pth",
-             "https://huggingface.co/uwg/upscaler/resolve/main/ESRGAN/4x_NMKD-Siax_200k.pth?download=true"),
-            ("models/upscale_models/RealESRGAN_x4plus_anime_and_illustrations_6B.pth",
-             "https://github.com/xinntao/Real-ESRGAN/releases/download/v0.2.2.4/RealESRGAN_x4plus_anime_6B.pth"),
-            ("models/upscale_models/4x_NMKD-Superscale-SP_178000_G.pth",
-             "https://huggingface.co/gemasai/4x_NMKD-Superscale-SP_178000_G/resolve/main/4x_NMKD-Superscale-SP_178000_G.pth"),
-            ("models/upscale_models/OmniSR_X2_DIV2K.safetensors",
-             "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X2_DIV2K.safetensors"),
-            ("models/upscale_models/OmniSR_X3_DIV2K.safetensors",
-             "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X3_DIV2K.safetensors"),
-            ("models/upscale_models/OmniSR_X4_DIV2K.safetensors",
-             "https://huggingface.co/Acly/Omni-SR/resolve/main/OmniSR_X4_DIV2K.safetensors"),
+            "upscale_models/4x_foolhardy_Remacri.pth",
+            "upscale_models/RealESRGAN_x4plus.pth",
+            "upscale_models/4x-UltraSharp.safetensors",
+            "upscale_models/4x_NMKD_Siax_200k.pth",
+            "upscale_models/RealESRGAN_x4plus_anime_and_illustrations_6B.pth",
+            "upscale_models/4x_NMKD-Superscale-SP_178000_G.pth",
+            "upscale_models/OmniSR_X2_DIV2K.safetensors",
+            "upscale_models/OmniSR_X3_DIV2K.safetensors",
+            "upscale_models/OmniSR_X4_DIV2K.safetensors",
             
             # ControlNet Models
-            ("models/controlnet/FLUX.1-dev-Controlnet-Union.safetensors",
-             "https://huggingface.co/InstantX/FLUX.1-dev-Controlnet-Union/resolve/main/diffusion_pytorch_model.safetensors"),
-            ("models/controlnet/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
-             "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors"),
-            ("models/controlnet/t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
-             "https://huggingface.co/TencentARC/t2i-adapter-lineart-sdxl-1.0/resolve/main/diffusion_pytorch_model.fp16.safetensors?download=true"),
-            ("models/controlnet/control_v11p_sd15_inpaint_fp16.safetensors",
-             "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_v11p_sd15_inpaint_fp16.safetensors"),
-            ("models/controlnet/controlnet-union-sdxl-1.0_promax.safetensors",
-             "https://huggingface.co/xinsir/controlnet-union-sdxl-1.0/resolve/main/diffusion_pytorch_model_promax.safetensors?download=true"),
-            ("models/controlnet/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
-             "https://huggingface.co/comfyanonymous/ControlNet-v1-1_fp16_safetensors/resolve/main/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors?download=true"),
+            "controlnet/FLUX.1-dev-Controlnet-Union.safetensors",
+            "controlnet/control_lora_rank128_v11f1e_sd15_tile_fp16.safetensors",
+            "controlnet/t2i-adapter-lineart-sdxl-1.0_fp16.safetensors",
+            "controlnet/control_v11p_sd15_inpaint_fp16.safetensors",
+            "controlnet/controlnet-union-sdxl-1.0_promax.safetensors",
+            "controlnet/control_lora_rank128_v11f1p_sd15_depth_fp16.safetensors",
             
             # LoRA Models (cleaned URLs - no hardcoded tokens)
-            ("models/loras/PONY_Fernando_Style.safetensors",
-             "https://civitai.com/api/download/models/452367"),
-            ("models/loras/PONY_Majo.safetensors",
-             "https://civitai.com/api/download/models/835055"),
-            ("models/loras/PONY_Western_Comic_Art_Style.safetensors",
-             "https://civitai.com/api/download/models/871611"),
-            ("models/loras/PONY_Incase_unaesthetic_style.safetensors",
-             "https://civitai.com/api/download/models/1128016"),
-            ("models/loras/Pony_Lora_Water_Color_Anime.safetensors",
-             "https://civitai.com/api/download/models/725772"),
-            ("models/loras/Pony_Lora_Water_Color.safetensors",
-             "https://civitai.com/api/download/models/720004"),
-            ("models/loras/SDXL_Pop_Art_Style.safetensors",
-             "https://civitai.com/api/download/models/192584"),
-            ("models/loras/Pony_Lora_Sketch_Illustration.safetensors",
-             "https://civitai.com/api/download/models/882225"),
-            ("models/loras/Illustrious_USNR_Style.safetensors",
-             "https://civitai.com/api/download/models/959419"),
-            ("models/loras/Illustrious_Gennesis.safetensors",
-             "https://civitai.com/api/download/models/1219983"),
-            ("models/loras/Illustrious_Loras_Hassaku_Shiro_Styles.safetensors",
-             "https://civitai.com/api/download/models/1580764"),
-            ("models/loras/Illustrious_Loras_Power_Puff_Mix.safetensors",
-             "https://civitai.com/api/download/models/1456601"),
-            ("models/loras/Illustrious_Loras_Detailer_Tool.safetensors",
-             "https://civitai.com/api/download/models/1191626"),
-            ("models/loras/Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors",
-             "https://civitai.com/api/download/models/1597800"),
-            ("models/loras/Illustrious_loRA_Midjourney_watercolors.safetensors",
-             "https://civitai.com/api/download/models/1510865"),
-            ("models/loras/Illustrious_loRA_Commix_style.safetensors",
-             "https://civitai.com/api/download/models/1227175"),
-            ("models/loras/Illustrious_loRA_detailrej.safetensors",
-             "https://civitai.com/api/download/models/1396529"),
-            ("models/loras/Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors",
-             "https://civitai.com/api/download/models/1144547"),
-                      ("models/loras/Illustrious_Vixon_Style.safetensors",
-             "https://civitai.com/api/download/models/1382407"),
-            ("models/loras/Illustrious_MagicalCircleTentacles.safetensors",
-             "https://civitai.com/api/download/models/1323341"),
-            ("models/loras/Pony_Peoples_Work.safetensors",
-             "https://civitai.com/api/download/models/1036362"),
-            ("models/loras/Stable_Diffusion_Loras_Detailed_Eyes.safetensors",
-             "https://civitai.com/api/download/models/145907"),
-            ("models/loras/Stable_Diffusion_Loras_Midjourney_Mimic.safetensors",
-             "https://civitai.com/api/download/models/283697"),
-            ("models/loras/Stable_Diffusion_Loras_Extremely_Detailed.safetensors",
-             "https://civitai.com/api/download/models/258687"),
-            ("models/loras/Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors",
-             "https://civitai.com/api/download/models/131991"),
-            ("models/loras/Stable_Diffusion_Loras_Detail_Tweaker.safetensors",
-             "https://civitai.com/api/download/models/135867"),
-            ("models/loras/Stable_Diffusion_Loras_Wowifier.safetensors",
-             "https://civitai.com/api/download/models/217866"),
-            ("models/loras/SDXL_loras_2Steps.safetensors",
-             "https://huggingface.co/ByteDance/SDXL-Lightning/resolve/main/sdxl_lightning_2step_lora.safetensors?download=true"),
-            ("models/loras/Hyper-SDXL-8steps-CFG-lora.safetensors",
-             "https://huggingface.co/ByteDance/Hyper-SD/resolve/main/Hyper-SDXL-8steps-CFG-lora.safetensors"),
-            ("models/loras/SDXL_lightning_8_steps.safetensors",
-             "https://civitai.com/api/download/models/391999"),
-            ("models/loras/SDXL_lightning_2_steps.safetensors",
-             "https://civitai.com/api/download/models/391994"),
-            ("models/loras/Illustrious_lora_Add_Super_Details.safetensors",
-             "https://civitai.com/api/download/models/1622964"),
+            "loras/PONY_Fernando_Style.safetensors",
+            "loras/PONY_Majo.safetensors",
+            "loras/PONY_Western_Comic_Art_Style.safetensors",
+            "loras/PONY_Incase_unaesthetic_style.safetensors",
+            "loras/Pony_Lora_Water_Color_Anime.safetensors",
+            "loras/Pony_Lora_Water_Color.safetensors",
+            "loras/SDXL_Pop_Art_Style.safetensors",
+            "loras/Pony_Lora_Sketch_Illustration.safetensors",
+            "loras/Illustrious_USNR_Style.safetensors",
+            "loras/Illustrious_Gennesis.safetensors",
+            "loras/Illustrious_Loras_Hassaku_Shiro_Styles.safetensors",
+            "loras/Illustrious_Loras_Power_Puff_Mix.safetensors",
+            "loras/Illustrious_Loras_Detailer_Tool.safetensors",
+            "loras/Illustrious_loRA_Semi_real_Fantasy_illustrious.safetensors",
+            "loras/Illustrious_loRA_Midjourney_watercolors.safetensors",
+            "loras/Illustrious_loRA_Commix_style.safetensors",
+            "loras/Illustrious_loRA_detailrej.safetensors",
+            "loras/Illustrious_loRA_Vixons_Dappled_Sunlight.safetensors",
+                      "loras/Illustrious_Vixon_Style.safetensors",
+            "loras/Illustrious_MagicalCircleTentacles.safetensors",
+            "loras/Pony_Peoples_Work.safetensors",
+            "loras/Stable_Diffusion_Loras_Detailed_Eyes.safetensors",
+            "loras/Stable_Diffusion_Loras_Midjourney_Mimic.safetensors",
+            "loras/Stable_Diffusion_Loras_Extremely_Detailed.safetensors",
+            "loras/Stable_Diffusion_Loras_Juggernot_Cinematic.safetensors",
+            "loras/Stable_Diffusion_Loras_Detail_Tweaker.safetensors",
+            "loras/Stable_Diffusion_Loras_Wowifier.safetensors",
+            "loras/SDXL_loras_2Steps.safetensors",
+            "loras/Hyper-SDXL-8steps-CFG-lora.safetensors",
+            "loras/SDXL_lightning_8_steps.safetensors",
+            "loras/SDXL_lightning_2_steps.safetensors",
+            "loras/Illustrious_lora_Add_Super_Details.safetensors",
             
             # Flux LoRA Models
-            ("models/loras/Flux_lora_Semirealisticportraitpainting.safetensors",
-             "https://civitai.com/api/download/models/978472"),
-            ("models/loras/Flux_lora_Velvetv2.safetensors",
-             "https://civitai.com/api/download/models/967375"),
-            ("models/loras/Flux_lora_RetroAnimeStyle.safetensors",
-             "https://civitai.com/api/download/models/806265"),
-            ("models/loras/Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors",
-             "https://civitai.com/api/download/models/1227179"),
-            ("models/loras/Flux_lora_VelvetMythicFantasyGothicLines.safetensors",
-             "https://civitai.com/api/download/models/1202162"),
-            ("models/loras/Flux_lora_Mezzotint.safetensors",
-             "https://civitai.com/api/download/models/757030"),
+            "loras/Flux_lora_Semirealisticportraitpainting.safetensors",
+            "loras/Flux_lora_Velvetv2.safetensors",
+            "loras/Flux_lora_RetroAnimeStyle.safetensors",
+            "loras/Flux_lora_VelvetMythicFantasyRealistic_Fantasy.safetensors",
+            "loras/Flux_lora_VelvetMythicFantasyGothicLines.safetensors",
+            "loras/Flux_lora_Mezzotint.safetensors",
 
             # Embeddings
-            ("models/embeddings/Pony_Embedding_Negative_Cyber_Realistic.pt",
-             "https://civitai.com/api/download/models/1690589"),
-            ("models/embeddings/Pony_Embedding_Negative_Stable_Yogi_Pony.pt",
-             "https://civitai.com/api/download/models/772342"),
-            ("models/embeddings/Pony_Embedding_Positive_Stable_Yogi_Pony.pt",
-             "https://civitai.com/api/download/models/2044578"),
+            "embeddings/Pony_Embedding_Negative_Cyber_Realistic.pt",
+            "embeddings/Pony_Embedding_Negative_Stable_Yogi_Pony.pt",
+            "embeddings/Pony_Embedding_Positive_Stable_Yogi_Pony.pt",
         ]
+        if self.profile:
+            # A profile saved from the notebook replaces the built-in selection
+            selection = profiles.catalog_ids(profiles.load_profile(self.profile))
+            print(f"{Colors.CYAN}Profile {self.profile}: {len(selection)} models{Colors.END}")
+        downloads = self.catalog_downloads(selection)
+        
+        if self.workflows:
+            # Only fetch what the selected workflows reference
+            downloads = self.workflow_downloads()
         
         successful_downloads = 0
         failed_downloads = 0
         
+        self.download_selection = (fingerprint(downloads), downloads)
+        if (self.stamps.is_current("downloads", self.download_selection[0])
+                and all((self.workspace / filename).exists() for filename, _ in downloads)):
+            print(f"{Colors.YELLOW}All {len(downloads)} selected models already downloaded, skipping.{Colors.END}")
+            return
+        
         print(f"{Colors.CYAN}Starting downloads for {len(downloads)} models...{Colors.END}")
         
         for filename, url in downloads:
@@ -567,49 +528,91 @@ class ComfyUIInstaller:
         if failed_downloads > 0:
             print(f"{Colors.RED}Failed to start {failed_downloads} downloads{Colors.END}")
     
-    def install_custom_nodes(self):
-        """Install custom nodes"""
+    def catalog_downloads(self, entry_ids):
+        """(filename, url) pairs for catalog ids, relative to the workspace"""
+        downloads = []
+        for entry_id in entry_ids:
+            entry = self.catalog.get(entry_id)
+            if entry is None:
+                print(f"{Colors.YELLOW}Not in the catalog, skipping: {entry_id}{Colors.END}")
+                continue
+            downloads.append((f"{entry.dest_dir}/{entry.filename}", entry.url))
+        return downloads
+    
+    def workflow_downloads(self):
+        """(filename, url) pairs for the models the selected workflows reference"""
+        tasks, unresolved = workflow_plan.plan_downloads(
+            self.workflows, self.catalog, str(self.workspace), skip_existing=False)
+        for ref in unresolved:
+            print(f"{Colors.YELLOW}Not in the catalog, skipping: {ref.folder or 'models'}/{ref.filename} ({ref.node_type}){Colors.END}")
+        return [(os.path.relpath(task["dest_path"], self.workspace), task["url"]) for task in tasks]
+    
+    def link_model_aliases(self):
+        """Expose models the workflows name differently from our catalog through symlinks"""
+        if not self.workflows:
+            return
+        links = model_aliases.link_workflow_aliases(
+            self.workflows, self.catalog, str(self.workspace))
+        for link_path, target in links:
+            print(f"{Colors.GREEN}Alias: {os.path.basename(link_path)} -> {os.path.basename(target)}{Colors.END}")
+    
+    def clone_custom_nodes(self):
+        """Clone or update custom node repositories"""
         self.print_header("Custom Nodes")
         
-        custom_nodes = [
-            ("https://github.com/rgthree/rgthree-comfy.git", "rgthree-comfy"),
-            ("https://github.com/jitcoder/lora-info.git", "lora-info"),
-            ("https://github.com/ltdrdata/ComfyUI-Impact-Pack.git", "ComfyUI-Impact-Pack"),
-            ("https://github.com/yolain/ComfyUI-Easy-Use.git", "ComfyUI-Easy-Use"),
-            ("https://github.com/ltdrdata/ComfyUI-Manager.git", "ComfyUI-Manager"),
-            ("https://github.com/pythongosssss/ComfyUI-Custom-Scripts.git", "ComfyUI-Custom-Scripts"),
-            ("https://github.com/john-mnz/ComfyUI-Inspyrenet-Rembg.git", "ComfyUI-Inspyrenet-Rembg"),
-            ("https://github.com/justUmen/Bjornulf_custom_nodes.git", "Bjornulf_custom_nodes"),
-            ("https://github.com/giriss/comfy-image-saver.git", "comfy-image-saver"),
-            ("https://github.com/ltdrdata/ComfyUI-Impact-Subpack.git", "ComfyUI-Impact-Subpack"),
-            ("https://github.com/ltdrdata/was-node-suite-comfyui.git", "was-node-suite-comfyui"),
-        ]
-        
         custom_nodes_dir = self.workspace / "custom_nodes"
-        pip_cmd = str(self.venv_path / ("Scripts/pip" if self.is_windows else "bin/pip"))
         
-        for repo_url, folder_name in custom_nodes:
+        for repo_url, folder_name in self.custom_nodes:
             folder_path = custom_nodes_dir / folder_name
             
             print(f"\n{Colors.CYAN}Processing: {folder_name}{Colors.END}")
             
             if folder_path.exists():
+                local_head = git_head(folder_path)
+                if local_head and local_head == git_remote_head(folder_path):
+                    print(f"{Colors.YELLOW}Already at {local_head[:8]}, skipping pull.{Colors.END}")
+                    continue
                 print(f"Updating existing repository...")
-                with self._working_directory(folder_path):
-                    self.run_command("git pull")
+                self.run_command("git pull", cwd=folder_path)
             else:
                 print(f"Cloning new repository...")
-                with self._working_directory(custom_nodes_dir):
-                    self.run_command(f"git clone {repo_url}")
-            
-            # Install node-specific requirements
-            requirements_file = folder_path / "requirements.txt"
+                self.run_command(f"git clone {repo_url}", cwd=custom_nodes_dir)
+    
+    def install_custom_node_requirements(self):
+        """Install node-specific requirements once the venv and torch are ready"""
+        custom_nodes_dir = self.workspace / "custom_nodes"
+        
+        for _, folder_name in self.custom_nodes:
+            requirements_file = custom_nodes_dir / folder_name / "requirements.txt"
             if requirements_file.exists():
+                fp = fingerprint(git_head(requirements_file.parent), file_digest(requirements_file),
+                                 self._torch_fingerprint())
+                if self.stamps.is_current(f"node_requirements_{folder_name}", fp):
+                    continue
                 print(f"Installing requirements for {folder_name}...")
-                self.run_command(f'"{pip_cmd}" install -r "{requirements_file}"')
-        
-        time.sleep(2)
-        self.clear_screen()
+                self.stamps.run(f"node_requirements_{folder_name}", fp, self.run_command,
+                                f'"{self.pip_cmd}" install -r "{requirements_file}"', check=False)
+    
+    def enable_workflow_nodes(self):
+        """Park custom node packs the selected workflows do not use"""
+        custom_nodes_dir = str(self.workspace / "custom_nodes")
+        if not self.workflows:
+            node_index.restore_all(custom_nodes_dir)
+            return
+        self.print_header("Workflow Node Selection")
+        python_exe = str(self.venv_path / ("Scripts/python" if self.is_windows else "bin/python"))
+        plan = node_index.enable_for_workflows(str(self.workspace), python_exe, self.workflows)
+        print(f"{Colors.GREEN}Enabled: {', '.join(plan['keep']) or 'none'}{Colors.END}")
+        print(f"{Colors.YELLOW}Parked in custom_nodes/{node_index.DISABLED_DIR}: {', '.join(plan['park']) or 'none'}{Colors.END}")
+        if plan["missing"]:
+            print(f"{Colors.RED}Not installed but referenced: {', '.join(plan['missing'])}{Colors.END}")
+    
+    def compile_python_sources(self):
+        """Byte-compile the venv, ComfyUI and custom nodes so the first launch skips .pyc generation"""
+        self.print_header("Byte Compilation")
+        python_exe = str(self.venv_path / ("Scripts/python" if self.is_windows else "bin/python"))
+        if not bytecompile.byte_compile(str(self.workspace), python_exe, stamps=self.stamps):
+            print(f"{Colors.YELLOW}Sources unchanged since last compile, skipping.{Colors.END}")
     
     def start_comfyui_server(self):
         """Start ComfyUI server"""
@@ -621,11 +624,19 @@ class ComfyUIInstaller:
         print(f"{Colors.CYAN}Starting ComfyUI server...{Colors.END}")
         print(f"Server will be accessible at: {self.find_comfyui_url()}")
         
-        with self._working_directory(self.workspace):
-            subprocess.Popen([python_exe, str(main_script), "--listen"])
-        
-        time.sleep(2)
-        self.clear_screen()
+        if self.profile_nodes:
+            print(f"Profiling custom node imports to {self.workspace / node_profiler.DEFAULT_OUTPUT}")
+        subprocess.Popen(node_profiler.launch_command(python_exe, ["--listen"], profile=self.profile_nodes),
+                         cwd=self.workspace)
+        # Same readiness monitor as the notebook: reports only up/down transitions
+        self.server_monitor = comfy_monitor.ComfyMonitor(on_change=self.report_server_state).start()
+    
+    def report_server_state(self, up):
+        """Print ComfyUI readiness transitions reported by the server monitor"""
+        if up:
+            print(f"{Colors.GREEN}✓ ComfyUI is answering on port {comfy_monitor.DEFAULT_PORT}{Colors.END}")
+        else:
+            print(f"{Colors.YELLOW}ComfyUI is not answering on port {comfy_monitor.DEFAULT_PORT} yet{Colors.END}")
     
     def create_restart_script(self):
         """Create restart script"""
@@ -682,9 +693,12 @@ def main():
     python_exe = venv_path / ("Scripts/python" if is_windows else "bin/python")
     pip_exe = venv_path / ("Scripts/pip" if is_windows else "bin/pip")
     
-    # Update packages
-    print("Updating PyTorch packages...")
-    run_command(f'"{{pip_exe}}" install --upgrade torch torchvision torchaudio')
+    # Update packages (a venv overlaying the image's CUDA-matched torch keeps that build)
+    with open(venv_path / "pyvenv.cfg", encoding="utf-8") as cfg:
+        uses_system_torch = "include-system-site-packages = true" in cfg.read()
+    if not uses_system_torch:
+        print("Updating PyTorch packages...")
+        run_command(f'"{{pip_exe}}" install --upgrade torch torchvision torchaudio')
     
     # Start server
     print("Starting ComfyUI server...")
@@ -793,7 +807,10 @@ if __name__ == "__main__":
         self.print_header("Token Authentication Test")
         
         # Test Civitai token with a small file
-        if self.civitai_token:
+        token_fp = fingerprint(hashlib.sha256(self.civitai_token.encode()).hexdigest()) if self.civitai_token else None
+        if self.stamps.is_current("token_test", token_fp):
+            print(f"{Colors.YELLOW}Civitai token already verified, skipping test.{Colors.END}")
+        elif self.civitai_token:
             test_url = "https://civitai.com/api/download/models/217866"  # Small file
             test_path = self.workspace / "temp" / "token_test.tmp"
             self.ensure_directory(test_path.parent)
@@ -806,6 +823,7 @@ if __name__ == "__main__":
                 if result.returncode == 0 and test_path.exists():
                     print(f"{Colors.GREEN}✓ Civitai token authentication successful{Colors.END}")
                     test_path.unlink()  # Clean up test file
+                    self.stamps.record("token_test", token_fp)
                 else:
                     print(f"{Colors.RED}✗ Civitai token authentication failed{Colors.END}")
                     print(f"Error: {result.stderr}")
@@ -815,8 +833,6 @@ if __name__ == "__main__":
             print(f"{Colors.YELLOW}⚠ No Civitai token configured{Colors.END}")
         
         # Similar tests could be added for GitHub and HuggingFace tokens
-        time.sleep(2)
-        self.clear_screen()
     
     def show_final_summary(self):
         """Show final installation summary"""
@@ -849,21 +865,60 @@ if __name__ == "__main__":
         print(f"  2. Access ComfyUI at {Colors.CYAN}{url}{Colors.END}")
         print(f"  3. Use {Colors.YELLOW}ninja_restart.py{Colors.END} to restart the server")
         
+        if self.profile_nodes:
+            profile = node_profiler.load_profile(self.workspace / node_profiler.DEFAULT_OUTPUT)
+            print(f"\n{Colors.BOLD}Slowest Custom Nodes:{Colors.END}")
+            print(node_profiler.format_report(profile, top=10))
+        
         print(f"\n{Colors.GREEN}Happy creating! 🎨{Colors.END}")
     
     def run_installation(self):
         """Run the complete installation process"""
         try:
-            self.setup_system_dependencies()
-            self.clone_comfyui()
-            self.setup_virtual_environment()
-            self.create_directory_structure()
-            self.test_token_authentication()  # Test tokens before downloading
-            self.download_models()
-            self.install_custom_nodes()
-            self.start_comfyui_server()
-            self.create_restart_script()
+            # Independent phases overlap: torch installs while models download
+            # and custom nodes clone while the venv is built. The pip phases share
+            # one venv, so they run strictly one after another
+            graph = InstallGraph()
+            graph.add("system", self.setup_system_dependencies, label="System dependencies")
+            graph.add("core", self.clone_comfyui, deps=["system"], label="Clone ComfyUI")
+            graph.add("venv", self.setup_virtual_environment, deps=["core"], label="Virtual environment")
+            graph.add("torch", self.install_torch, deps=["venv"], label="PyTorch")
+            graph.add("requirements", self.install_comfyui_requirements, deps=["torch"], label="ComfyUI requirements")
+            graph.add("packages", self.install_python_packages, deps=["requirements"], label="Runtime packages")
+            graph.add("directories", self.create_directory_structure, deps=["core"], label="Directory structure")
+            graph.add("token_test", self.test_token_authentication, deps=["directories"], label="Token test")  # Test tokens before downloading
+            graph.add("downloads", self.download_models, deps=["token_test"], label="Start downloads")
+            graph.add("nodes", self.clone_custom_nodes, deps=["core"], label="Clone custom nodes")
+            graph.add("node_requirements", self.install_custom_node_requirements,
+                      deps=["nodes", "packages"], label="Custom node requirements")
+            graph.add("workflow_nodes", self.enable_workflow_nodes,
+                      deps=["node_requirements"], label="Workflow node selection")
+            # Compile after packs are parked so compileall never walks a directory mid-move
+            graph.add("bytecompile", self.compile_python_sources,
+                      deps=["workflow_nodes"], label="Byte-compile sources")
+            # Model aliases are linked after wait_for_downloads: the downloads task only starts wget
+            graph.add("server", self.start_comfyui_server,
+                      deps=["bytecompile", "directories", "downloads"], label="Start server")
+            graph.add("restart_script", self.create_restart_script, label="Restart script")
+            graph.run()
+            failed = [t.label for t in graph.tasks.values() if t.status != DONE]
+            if failed:
+                raise RuntimeError(f"Install phases did not complete: {', '.join(failed)}")
+            
             self.wait_for_downloads()  # Wait for downloads to complete
+            # Aliases need the finished files; ComfyUI picks new links up on its next folder scan
+            try:
+                self.link_model_aliases()
+            except Exception as e:
+                print(f"{Colors.YELLOW}⚠ Could not link model aliases: {e}{Colors.END}")
+            if self.server_monitor and not self.server_monitor.wait_until(True, SERVER_READY_TIMEOUT):
+                print(f"{Colors.YELLOW}⚠ ComfyUI did not answer within {SERVER_READY_TIMEOUT // 60} minutes; "
+                      f"check the server output{Colors.END}")
+            if self.download_selection:
+                selection_fp, downloads = self.download_selection
+                if all((self.workspace / filename).exists() for filename, _ in downloads):
+                    self.stamps.record("downloads", selection_fp)
+            print(f"\n{Colors.CYAN}{graph.report()}{Colors.END}")
             self.show_final_summary()
             
         except KeyboardInterrupt:
@@ -883,7 +938,10 @@ def main():
     installer = ComfyUIInstaller(
         civitai_token=args.civitai_token,
         github_token=args.github_token,
-        huggingface_token=args.huggingface_token
+        huggingface_token=args.huggingface_token,
+        profile_nodes=args.profile_nodes,
+        workflows=args.workflows,
+        profile=args.profile
     )
     installer.run_installation()
 